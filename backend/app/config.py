@@ -1,14 +1,32 @@
-from pydantic_settings import BaseSettings, SettingsConfigDict
-
-class Settings(BaseSettings):
-    DATABASE_URL: str
-    JWT_SECRET: str
-    JWT_ALGORITHM: str = "HS256"
-    AWS_LAMBDA_FUNCTION: str
-    AWS_REGION: str = "ap-south-1"
-    AZURE_FUNCTION_URL: str = "local"
-    AZURE_FUNCTION_KEY: str = ""
-
-    model_config = SettingsConfigDict(env_file=".env")
-
-settings = Settings()
+from pydantic_settings import BaseSettings, SettingsConfigDict
+
+class Settings(BaseSettings):
+    DATABASE_URL: str
+    JWT_SECRET: str
+    JWT_ALGORITHM: str = "HS256"
+    AWS_LAMBDA_FUNCTION: str
+    AWS_REGION: str = "ap-south-1"
+    AZURE_FUNCTION_URL: str = "local"
+    AZURE_FUNCTION_KEY: str = ""
+    CODE_EXECUTOR: str = "remote"  # remote (Judge0/Piston) or local
+    # Let remote mode fail over to the unsandboxed local executor (development only)
+    EXECUTOR_LOCAL_FALLBACK: bool = False
+    GRADING_FAIL_FAST: str = "off"  # off, compile (syntax check before running) or first_failure
+
+    # Connection pool (PostgreSQL and file-based SQLite)
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: int = 30  # seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = 1800  # seconds before a connection is replaced
+    DB_POOL_PRE_PING: bool = True  # server databases only
+
+    # SQLite pragmas applied to every new connection
+    SQLITE_JOURNAL_MODE: str = "WAL"  # readers no longer block the writer
+    SQLITE_SYNCHRONOUS: str = "NORMAL"  # durable with WAL, fsync only at checkpoints
+    SQLITE_BUSY_TIMEOUT_MS: int = 15000  # wait for the write lock instead of "database is locked"
+    SQLITE_MMAP_SIZE: int = 268435456
+    SQLITE_CACHE_SIZE_KB: int = 65536
+
+    model_config = SettingsConfigDict(env_file=".env")
+
+settings = Settings()
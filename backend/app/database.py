@@ -1,18 +1,98 @@
-from sqlalchemy import create_engine
-from sqlalchemy.orm import sessionmaker, declarative_base
-from app.config import settings
-
-SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
-
-engine = create_engine(SQLALCHEMY_DATABASE_URL)
-
-SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
-
-Base = declarative_base()
-
-def get_db():
-    db = SessionLocal()
-    try:
-        yield db
-    finally:
-        db.close()
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
+from sqlalchemy.orm import sessionmaker, declarative_base
+from app.config import settings
+
+SQLALCHEMY_DATABASE_URL = settings.DATABASE_URL
+
+
+def engine_options(url: str) -> dict:
+    """create_engine keyword arguments for the database profile matching url"""
+    parsed = make_url(url)
+    if parsed.get_backend_name() != "sqlite":
+        return {
+            "pool_size": settings.DB_POOL_SIZE,
+            "max_overflow": settings.DB_MAX_OVERFLOW,
+            "pool_timeout": settings.DB_POOL_TIMEOUT,
+            "pool_recycle": settings.DB_POOL_RECYCLE,
+            "pool_pre_ping": settings.DB_POOL_PRE_PING,
+        }
+
+    options = {
+        "connect_args": {
+            # Sessions move between FastAPI's worker threads
+            "check_same_thread": False,
+            "timeout": settings.SQLITE_BUSY_TIMEOUT_MS / 1000,
+        }
+    }
+    if parsed.database and parsed.database != ":memory:":
+        # In-memory databases keep SQLAlchemy's single-connection pool
+        options.update(
+            pool_size=settings.DB_POOL_SIZE,
+            max_overflow=settings.DB_MAX_OVERFLOW,
+            pool_timeout=settings.DB_POOL_TIMEOUT,
+            pool_recycle=settings.DB_POOL_RECYCLE,
+        )
+    return options
+
+
+def _apply_sqlite_pragmas(dbapi_connection, connection_record):
+    cursor = dbapi_connection.cursor()
+    cursor.execute(f"PRAGMA journal_mode={settings.SQLITE_JOURNAL_MODE}")
+    cursor.execute(f"PRAGMA synchronous={settings.SQLITE_SYNCHRONOUS}")
+    cursor.execute(f"PRAGMA busy_timeout={settings.SQLITE_BUSY_TIMEOUT_MS}")
+    cursor.execute(f"PRAGMA mmap_size={settings.SQLITE_MMAP_SIZE}")
+    cursor.execute(f"PRAGMA cache_size=-{settings.SQLITE_CACHE_SIZE_KB}")
+    cursor.close()
+
+
+def create_db_engine(url: str = SQLALCHEMY_DATABASE_URL) -> Engine:
+    """Engine with the pool and (for SQLite) pragma settings from Settings"""
+    db_engine = create_engine(url, **engine_options(url))
+    if db_engine.dialect.name == "sqlite":
+        event.listen(db_engine, "connect", _apply_sqlite_pragmas)
+    return db_engine
+
+
+# Async drivers for the request path; background jobs and services keep the sync engine
+ASYNC_DRIVERS = {"sqlite": "sqlite+aiosqlite", "postgresql": "postgresql+asyncpg"}
+
+
+def async_database_url(url: str) -> str:
+    """url with its driver replaced by the matching async driver"""
+    parsed = make_url(url)
+    driver = ASYNC_DRIVERS.get(parsed.get_backend_name())
+    if driver is None:
+        raise ValueError(f"No async driver configured for {parsed.get_backend_name()}")
+    return parsed.set(drivername=driver).render_as_string(hide_password=False)
+
+
+def create_async_db_engine(url: str = SQLALCHEMY_DATABASE_URL) -> AsyncEngine:
+    """Async engine with the same pool and pragma settings as create_db_engine"""
+    db_engine = create_async_engine(async_database_url(url), **engine_options(url))
+    if db_engine.dialect.name == "sqlite":
+        event.listen(db_engine.sync_engine, "connect", _apply_sqlite_pragmas)
+    return db_engine
+
+
+engine = create_db_engine()
+async_engine = create_async_db_engine()
+
+SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+# Objects stay readable after commit, as the endpoints build responses from them
+AsyncSessionLocal = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+Base = declarative_base()
+
+def get_db():
+    db = SessionLocal()
+    try:
+        yield db
+    finally:
+        db.close()
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
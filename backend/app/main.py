@@ -1,33 +1,79 @@
-from fastapi import FastAPI
-from app.routers import auth, assignments, submissions, lambda_runner
-from app.database import Base, engine
-from fastapi.middleware.cors import CORSMiddleware
-
-Base.metadata.create_all(bind=engine)
-
-
-app = FastAPI(title="Code Assessment Backend")
-
-app.include_router(auth.router)
-app.include_router(assignments.router)
-app.include_router(submissions.router)
-app.include_router(lambda_runner.router)
-
-@app.get("/")
-def root():
-    return {"message": "Backend is running!"}
-
-
-
-origins = [
-    "http://localhost:5173",
-    "http://127.0.0.1:5173",
-]
-
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=origins,
-    allow_credentials=True,
-    allow_methods=["*"],
-    allow_headers=["*"],
+from contextlib import asynccontextmanager
+
+from fastapi import FastAPI
+from app.routers import auth, assignments, submissions, lambda_runner, judge0_callback, jobs, metrics
+from app.database import async_engine, engine, SessionLocal
+from app.migrations import run_migrations
+from app.models.assignment import Assignment
+from app.services.assignment_cache import assignment_cache
+from app.services.judge0_executor import JUDGE0_CALLBACK_SECRET, JUDGE0_CALLBACK_URL
+from app.services.sql_pool import get_sql_grading_pool
+from fastapi.middleware.cors import CORSMiddleware
+
+run_migrations(engine)
+
+
+def warm_sql_grading_pool():
+    """Start the SQL grading workers with the most recent SQL schemas prebuilt"""
+    pool = get_sql_grading_pool()
+    if pool is None:
+        return
+    db = SessionLocal()
+    try:
+        rows = db.query(Assignment.sql_schema).filter(
+            Assignment.problem_type == "sql",
+            Assignment.sql_schema != None
+        ).order_by(Assignment.id.desc()).limit(20).all()
+    finally:
+        db.close()
+    pool.warm([row.sql_schema for row in rows])
+
+def warm_assignment_cache():
+    """Load the grading bundles of the assignments with the latest submissions"""
+    db = SessionLocal()
+    try:
+        assignment_cache.warm(db)
+    finally:
+        db.close()
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    warm_sql_grading_pool()
+    warm_assignment_cache()
+    yield
+    await async_engine.dispose()
+
+
+app = FastAPI(title="Code Assessment Backend", lifespan=lifespan)
+
+app.include_router(auth.router)
+app.include_router(assignments.router)
+app.include_router(submissions.router)
+app.include_router(lambda_runner.router)
+if JUDGE0_CALLBACK_URL:
+    # Callbacks deliver grading results, so the endpoint never runs unauthenticated
+    if not JUDGE0_CALLBACK_SECRET:
+        raise RuntimeError("JUDGE0_CALLBACK_SECRET must be set when JUDGE0_CALLBACK_URL is")
+    app.include_router(judge0_callback.router)
+app.include_router(jobs.router)
+app.include_router(metrics.router)
+
+@app.get("/")
+def root():
+    return {"message": "Backend is running!"}
+
+
+
+origins = [
+    "http://localhost:5173",
+    "http://127.0.0.1:5173",
+]
+
+app.add_middleware(
+    CORSMiddleware,
+    allow_origins=origins,
+    allow_credentials=True,
+    allow_methods=["*"],
+    allow_headers=["*"],
+    expose_headers=["ETag", "X-Next-Cursor"],
 )
\ No newline at end of file
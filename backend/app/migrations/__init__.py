@@ -0,0 +1,85 @@
+"""
+Versioned schema migrations
+Every module in this package named vNNN_<description>.py is one migration
+with an `upgrade(conn)` function. Pending migrations run in version order,
+each in its own transaction, and are recorded in the schema_migrations
+table, so an existing database is upgraded in place instead of being
+dropped and recreated. The app runs them on startup; from the backend
+directory they can also be run with
+
+    python -m app.migrations          # apply pending migrations
+    python -m app.migrations status   # list applied and pending versions
+
+Migrations must be idempotent (CREATE ... IF NOT EXISTS, checkfirst) because
+several server processes may start at the same time; the loser of the race
+sees the version already recorded and moves on.
+"""
+
+import importlib
+import pkgutil
+import re
+from typing import Callable, List, Tuple
+
+from sqlalchemy import Column, DateTime, Integer, MetaData, String, Table, func, select
+from sqlalchemy.engine import Connection, Engine
+from sqlalchemy.exc import IntegrityError
+
+MIGRATION_MODULE = re.compile(r"^v(\d{3})_\w+$")
+
+_metadata = MetaData()
+schema_migrations = Table(
+    "schema_migrations", _metadata,
+    Column("version", Integer, primary_key=True),
+    Column("name", String, nullable=False),
+    Column("applied_at", DateTime, server_default=func.now()),
+)
+
+
+def discover() -> List[Tuple[int, str, Callable[[Connection], None]]]:
+    """All migrations in this package as (version, name, upgrade), in version order"""
+    migrations = []
+    for module_info in pkgutil.iter_modules(__path__):
+        match = MIGRATION_MODULE.match(module_info.name)
+        if not match:
+            continue
+        module = importlib.import_module(f"{__name__}.{module_info.name}")
+        migrations.append((int(match.group(1)), module_info.name, module.upgrade))
+    migrations.sort()
+    versions = [version for version, _, _ in migrations]
+    if len(versions) != len(set(versions)):
+        raise RuntimeError("Duplicate migration version in app/migrations")
+    return migrations
+
+
+def applied_versions(engine: Engine) -> List[int]:
+    schema_migrations.create(bind=engine, checkfirst=True)
+    with engine.connect() as conn:
+        return [row.version for row in conn.execute(select(schema_migrations.c.version).order_by(schema_migrations.c.version))]
+
+
+def run_migrations(engine: Engine) -> List[str]:
+    """Apply the pending migrations; returns the names of those applied by this call"""
+    applied = set(applied_versions(engine))
+    ran = []
+    for version, name, upgrade in discover():
+        if version in applied:
+            continue
+        try:
+            with engine.begin() as conn:
+                upgrade(conn)
+                conn.execute(schema_migrations.insert().values(version=version, name=name))
+        except IntegrityError:
+            # Another process recorded this version first
+            continue
+        ran.append(name)
+    return ran
+
+
+def create_index(conn: Connection, name: str, table: str, *columns: str):
+    """CREATE INDEX IF NOT EXISTS (SQLite and PostgreSQL)"""
+    conn.exec_driver_sql(f'CREATE INDEX IF NOT EXISTS {name} ON {table} ({", ".join(columns)})')
+
+
+def drop_index(conn: Connection, name: str):
+    """DROP INDEX IF EXISTS (SQLite and PostgreSQL)"""
+    conn.exec_driver_sql(f"DROP INDEX IF EXISTS {name}")
@@ -0,0 +1,12 @@
+import sys
+
+from app.database import engine
+from app.migrations import applied_versions, discover, run_migrations
+
+if len(sys.argv) > 1 and sys.argv[1] == "status":
+    applied = set(applied_versions(engine))
+    for version, name, _ in discover():
+        print(f"{'applied' if version in applied else 'pending'}  {name}")
+else:
+    ran = run_migrations(engine)
+    print("\n".join(f"Applied {name}" for name in ran) or "Database is up to date")
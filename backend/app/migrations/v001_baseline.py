@@ -0,0 +1,109 @@
+"""
+Tables as of the first migration; existing tables are left as they are
+The definitions are a frozen copy of the models at that point, without
+their Python-side defaults. Later schema changes go in their own vNNN
+migration and are never made here; the listing and stats indexes are
+created by v002_query_indexes.
+"""
+
+from sqlalchemy import Boolean, Column, ForeignKey, Integer, MetaData, String, Table, Text
+from sqlalchemy.engine import Connection
+
+metadata = MetaData()
+
+Table(
+    "users", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("name", String),
+    Column("email", String, unique=True, index=True),
+    Column("password", String),
+    Column("role", String),
+    Column("domain", String),
+)
+
+Table(
+    "assignments", metadata,
+    Column("id", Integer, primary_key=True, index=True),
+    Column("title", String, nullable=False),
+    Column("description", Text, nullable=False),
+    Column("domain", String, nullable=False),
+    Column("difficulty", String, nullable=False),
+    Column("problem_type", String),
+    Column("language", String, nullable=True),
+    Column("test_input", Text, nullable=True),
+    Column("expected_output", Text, nullable=True),
+    Column("sql_schema", Text, nullable=True),
+    Column("sql_query", Text, nullable=True),
+)
+
+Table(
+    "submissions", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("assignment_id", Integer, ForeignKey("assignments.id")),
+    Column("user_id", Integer, ForeignKey("users.id")),
+    Column("code", String),
+    Column("status", String),
+    Column("output", String),
+    Column("score", Integer),
+)
+
+Table(
+    "testcases", metadata,
+    Column("id", Integer, primary_key=True),
+    Column("assignment_id", Integer, ForeignKey("assignments.id"), index=True),
+    Column("input", Text, nullable=True),
+    Column("expected_output", Text, nullable=True),
+    Column("sql_query", Text, nullable=True),
+    Column("expected_result", Text, nullable=True),
+    Column("hidden", Boolean),
+)
+
+Table(
+    "testcase_stats", metadata,
+    Column("testcase_id", Integer, ForeignKey("testcases.id"), primary_key=True),
+    Column("assignment_id", Integer, ForeignKey("assignments.id"), index=True),
+    Column("runs", Integer, nullable=False),
+    Column("failures", Integer, nullable=False),
+)
+
+Table(
+    "testcase_datasets", metadata,
+    Column("testcase_id", Integer, ForeignKey("testcases.id"), primary_key=True),
+    Column("name", String, nullable=True),
+    Column("seed_sql", Text, nullable=False),
+)
+
+Table(
+    "sql_limits", metadata,
+    Column("assignment_id", Integer, ForeignKey("assignments.id"), primary_key=True),
+    Column("time_limit_ms", Integer, nullable=True),
+    Column("max_vm_steps", Integer, nullable=True),
+    Column("max_rows", Integer, nullable=True),
+    Column("max_result_bytes", Integer, nullable=True),
+)
+
+Table(
+    "sql_performance", metadata,
+    Column("assignment_id", Integer, ForeignKey("assignments.id"), primary_key=True),
+    Column("seed_sql", Text, nullable=True),
+    Column("runs", Integer, nullable=True),
+)
+
+Table(
+    "sql_dataset_specs", metadata,
+    Column("assignment_id", Integer, ForeignKey("assignments.id"), primary_key=True),
+    Column("spec", Text, nullable=False),
+)
+
+Table(
+    "submission_counters", metadata,
+    Column("assignment_id", Integer, ForeignKey("assignments.id"), primary_key=True),
+    Column("total", Integer, nullable=False),
+    Column("passed", Integer, nullable=False),
+    Column("failed", Integer, nullable=False),
+    Column("submitters", Integer, nullable=False),
+)
+
+
+def upgrade(conn: Connection):
+    metadata.create_all(bind=conn, checkfirst=True)
@@ -0,0 +1,23 @@
+"""
+Indexes for the listing, submit and stats queries
+
+- assignments: listing filters, ending in id for keyset pagination
+- testcases: test cases of an assignment (submit path)
+- submissions: per-assignment stats and "submitted before" lookups
+  (assignment_id, user_id, status), and the per-user completion counts
+  (status, user_id, assignment_id); both cover their queries
+"""
+
+from sqlalchemy.engine import Connection
+
+from app.migrations import create_index, drop_index
+
+
+def upgrade(conn: Connection):
+    create_index(conn, "ix_assignments_domain_difficulty_id", "assignments", "domain", "difficulty", "id")
+    create_index(conn, "ix_assignments_problem_type_language_id", "assignments", "problem_type", "language", "id")
+    create_index(conn, "ix_testcases_assignment_id", "testcases", "assignment_id")
+    create_index(conn, "ix_submissions_assignment_user_status", "submissions", "assignment_id", "user_id", "status")
+    create_index(conn, "ix_submissions_status_user_assignment", "submissions", "status", "user_id", "assignment_id")
+    # Superseded by ix_submissions_assignment_user_status
+    drop_index(conn, "ix_submissions_assignment_user")
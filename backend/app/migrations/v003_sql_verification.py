@@ -0,0 +1,15 @@
+"""
+assignments.sql_verification: grade SQL test cases by running their sql_query
+over the state the submission leaves. Off for existing assignments, whose
+test cases keep comparing the submission's own result.
+"""
+
+from sqlalchemy import inspect
+from sqlalchemy.engine import Connection
+
+
+def upgrade(conn: Connection):
+    # Another process starting at the same time may have added it first
+    if "sql_verification" in {column["name"] for column in inspect(conn).get_columns("assignments")}:
+        return
+    conn.exec_driver_sql("ALTER TABLE assignments ADD COLUMN sql_verification BOOLEAN NOT NULL DEFAULT FALSE")
@@ -0,0 +1,22 @@
+"""
+submission_counters: a row for every assignment, so submissions only ever
+UPDATE their counters. Assignments created before the table existed get
+their row from the submissions made so far.
+"""
+
+from sqlalchemy.engine import Connection
+
+
+def upgrade(conn: Connection):
+    conn.exec_driver_sql("""
+        INSERT INTO submission_counters (assignment_id, total, passed, failed, submitters)
+        SELECT a.id,
+               COUNT(s.id),
+               COALESCE(SUM(CASE WHEN s.status = 'pass' THEN 1 ELSE 0 END), 0),
+               COALESCE(SUM(CASE WHEN s.status = 'fail' THEN 1 ELSE 0 END), 0),
+               COUNT(DISTINCT s.user_id)
+        FROM assignments a
+        LEFT JOIN submissions s ON s.assignment_id = a.id
+        WHERE NOT EXISTS (SELECT 1 FROM submission_counters c WHERE c.assignment_id = a.id)
+        GROUP BY a.id
+    """)
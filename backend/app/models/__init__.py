@@ -1,6 +1,12 @@
-from .user import User
-from .assignment import Assignment
-from .submission import Submission
-from .testcase import TestCase
-
-__all__ = ["User", "Assignment", "Submission", "TestCase"]
+from .user import User
+from .assignment import Assignment
+from .submission import Submission
+from .testcase import TestCase
+from .testcase_stats import TestCaseStats
+from .sql_limits import SQLLimits
+from .testcase_dataset import TestCaseDataset
+from .sql_performance import SQLPerformance
+from .sql_dataset_spec import SQLDatasetSpec
+from .submission_counters import SubmissionCounters
+
+__all__ = ["User", "Assignment", "Submission", "TestCase", "TestCaseStats", "SQLLimits", "TestCaseDataset", "SQLPerformance", "SQLDatasetSpec", "SubmissionCounters"]
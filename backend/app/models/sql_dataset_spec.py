@@ -0,0 +1,9 @@
+from sqlalchemy import Column, Integer, Text, ForeignKey
+from app.database import Base
+
+class SQLDatasetSpec(Base):
+    __tablename__ = "sql_dataset_specs"
+
+    # Generated performance dataset of a SQL assignment (see services/sql_datasets.py)
+    assignment_id = Column(Integer, ForeignKey("assignments.id"), primary_key=True)
+    spec = Column(Text, nullable=False)  # JSON
@@ -0,0 +1,12 @@
+from sqlalchemy import Column, Integer, ForeignKey
+from app.database import Base
+
+class SQLLimits(Base):
+    __tablename__ = "sql_limits"
+
+    # Per-assignment overrides of the SQL grading limits (NULL = server default)
+    assignment_id = Column(Integer, ForeignKey("assignments.id"), primary_key=True)
+    time_limit_ms = Column(Integer, nullable=True)
+    max_vm_steps = Column(Integer, nullable=True)
+    max_rows = Column(Integer, nullable=True)
+    max_result_bytes = Column(Integer, nullable=True)
@@ -0,0 +1,10 @@
+from sqlalchemy import Column, Integer, Text, ForeignKey
+from app.database import Base
+
+class SQLPerformance(Base):
+    __tablename__ = "sql_performance"
+
+    # Efficiency grading of a SQL assignment against its reference query (Assignment.sql_query)
+    assignment_id = Column(Integer, ForeignKey("assignments.id"), primary_key=True)
+    seed_sql = Column(Text, nullable=True)  # scales the dataset up on top of sql_schema
+    runs = Column(Integer, nullable=True)  # timed runs per query (median is reported)
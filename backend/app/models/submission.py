@@ -1,13 +1,19 @@
-from sqlalchemy import Column, Integer, String, ForeignKey
-from app.database import Base
-
-class Submission(Base):
-    __tablename__ = "submissions"
-
-    id = Column(Integer, primary_key=True)
-    assignment_id = Column(Integer, ForeignKey("assignments.id"))
-    user_id = Column(Integer, ForeignKey("users.id"))
-    code = Column(String)
-    status = Column(String)      # pass / fail
-    output = Column(String)
-    score = Column(Integer)
+from sqlalchemy import Column, Index, Integer, String, ForeignKey
+from app.database import Base
+
+class Submission(Base):
+    __tablename__ = "submissions"
+
+    id = Column(Integer, primary_key=True)
+    assignment_id = Column(Integer, ForeignKey("assignments.id"))
+    user_id = Column(Integer, ForeignKey("users.id"))
+    code = Column(String)
+    status = Column(String)      # pass / fail
+    output = Column(String)
+    score = Column(Integer)
+
+    # Stats queries; kept in sync with app/migrations
+    __table_args__ = (
+        Index("ix_submissions_assignment_user_status", "assignment_id", "user_id", "status"),
+        Index("ix_submissions_status_user_assignment", "status", "user_id", "assignment_id"),
+    )
@@ -0,0 +1,12 @@
+from sqlalchemy import Column, Integer, ForeignKey
+from app.database import Base
+
+class SubmissionCounters(Base):
+    __tablename__ = "submission_counters"
+
+    # Maintained with every submission insert (see services/submission_stats.py)
+    assignment_id = Column(Integer, ForeignKey("assignments.id"), primary_key=True)
+    total = Column(Integer, nullable=False, default=0)
+    passed = Column(Integer, nullable=False, default=0)
+    failed = Column(Integer, nullable=False, default=0)
+    submitters = Column(Integer, nullable=False, default=0)  # distinct users
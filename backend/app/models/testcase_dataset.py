@@ -0,0 +1,10 @@
+from sqlalchemy import Column, Integer, String, Text, ForeignKey
+from app.database import Base
+
+class TestCaseDataset(Base):
+    __tablename__ = "testcase_datasets"
+
+    # Seed data applied on top of the assignment's sql_schema for one SQL test case
+    testcase_id = Column(Integer, ForeignKey("testcases.id"), primary_key=True)
+    name = Column(String, nullable=True)
+    seed_sql = Column(Text, nullable=False)
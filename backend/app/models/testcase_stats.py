@@ -0,0 +1,11 @@
+from sqlalchemy import Column, Integer, ForeignKey
+from app.database import Base
+
+class TestCaseStats(Base):
+    __tablename__ = "testcase_stats"
+
+    # Per test case grading history, used to run likely failures first
+    testcase_id = Column(Integer, ForeignKey("testcases.id"), primary_key=True)
+    assignment_id = Column(Integer, ForeignKey("assignments.id"), index=True)
+    runs = Column(Integer, nullable=False, default=0)
+    failures = Column(Integer, nullable=False, default=0)
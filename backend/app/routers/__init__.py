@@ -1,3 +1,3 @@
-from . import auth, assignments, submissions, lambda_runner
-
-__all__ = ["auth", "assignments", "submissions", "lambda_runner"]
+from . import auth, assignments, submissions, lambda_runner, judge0_callback, jobs, metrics
+
+__all__ = ["auth", "assignments", "submissions", "lambda_runner", "judge0_callback", "jobs", "metrics"]
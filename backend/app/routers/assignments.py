@@ -1,197 +1,283 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from app.database import get_db
-from app.models.assignment import Assignment
-from app.models.testcase import TestCase
-from app.models.submission import Submission
-from app.models.user import User
-from app.schemas import AssignmentCreate, SQLSubmission, CodeSubmission
-from app.services.sql_executor import execute_sql_problem
-from app.services.judge0_executor import Judge0Executor
-from app.services.local_executor import LocalCodeExecutor
-from app.services.piston_executor import PistonExecutor
-
-router = APIRouter(prefix="/assignments")
-
-@router.get("/")
-def get_assignments(db: Session = Depends(get_db)):
-    assignments = db.query(Assignment).all()
-    return [
-        {
-            "id": a.id,
-            "title": a.title,
-            "description": a.description,
-            "domain": a.domain,
-            "difficulty": a.difficulty,
-            "problem_type": a.problem_type,
-        }
-        for a in assignments
-    ]
-
-@router.get("/{assignment_id}")
-def get_assignment(assignment_id: int, db: Session = Depends(get_db)):
-    assignment = db.query(Assignment).filter(Assignment.id == assignment_id).first()
-    if not assignment:
-        raise HTTPException(status_code=404, detail="Assignment not found")
-    
-    test_cases = db.query(TestCase).filter(TestCase.assignment_id == assignment_id).all()
-    
-    return {
-        "id": assignment.id,
-        "title": assignment.title,
-        "description": assignment.description,
-        "domain": assignment.domain,
-        "difficulty": assignment.difficulty,
-        "problem_type": assignment.problem_type,
-        "language": assignment.language,
-        "sql_schema": assignment.sql_schema,
-        "test_input": assignment.test_input,
-        "expected_output": assignment.expected_output,
-        "test_cases": [
-            {
-                "id": tc.id,
-                "input": tc.input,
-                "expected_output": tc.expected_output,
-                "sql_query": tc.sql_query,
-                "expected_result": tc.expected_result,
-                "hidden": tc.hidden,
-            }
-            for tc in test_cases
-        ]
-    }
-
-@router.post("/create")
-def create_assignment(data: AssignmentCreate, db: Session = Depends(get_db)):
-    new_assignment = Assignment(
-        title=data.title,
-        description=data.description,
-        domain=data.domain,
-        difficulty=data.difficulty,
-        problem_type=data.problem_type,
-        language=data.language,  # Add language for coding problems
-        test_input=data.test_input,
-        expected_output=data.expected_output,
-        sql_schema=data.sql_schema,
-        sql_query=data.sql_query,
-    )
-
-    db.add(new_assignment)
-    db.commit()
-    db.refresh(new_assignment)
-    
-    # Add test cases if provided
-    if data.test_cases:
-        for tc in data.test_cases:
-            test_case = TestCase(
-                assignment_id=new_assignment.id,
-                input=tc.input,
-                expected_output=tc.expected_output,
-                sql_query=tc.sql_query,
-                expected_result=tc.expected_result,
-                hidden=tc.hidden,
-            )
-            db.add(test_case)
-        db.commit()
-
-    return {"message": "Assignment created successfully", "id": new_assignment.id}
-
-@router.post("/submit-sql")
-def submit_sql(submission: SQLSubmission, db: Session = Depends(get_db)):
-    """Submit and test SQL query"""
-    assignment = db.query(Assignment).filter(Assignment.id == submission.assignment_id).first()
-    
-    if not assignment:
-        raise HTTPException(status_code=404, detail="Assignment not found")
-    
-    if assignment.problem_type != "sql":
-        raise HTTPException(status_code=400, detail="This assignment is not a SQL problem")
-    
-    # Get all test cases for this assignment
-    test_cases = db.query(TestCase).filter(
-        TestCase.assignment_id == submission.assignment_id,
-        TestCase.expected_result != None  # Only SQL test cases with expected results
-    ).all()
-    
-    test_cases_data = [
-        {
-            "expected_result": tc.expected_result,
-        }
-        for tc in test_cases
-    ]
-    
-    # Execute the SQL problem
-    result = execute_sql_problem(
-        schema_sql=assignment.sql_schema,
-        user_query=submission.sql_query,
-        test_cases=test_cases_data
-    )
-    
-    return result
-
-@router.post("/submit-code")
-def submit_code(submission: CodeSubmission, db: Session = Depends(get_db)):
-    """Submit and test code (Python/JavaScript)"""
-    assignment = db.query(Assignment).filter(Assignment.id == submission.assignment_id).first()
-    
-    if not assignment:
-        raise HTTPException(status_code=404, detail="Assignment not found")
-    
-    if assignment.problem_type != "coding":
-        raise HTTPException(status_code=400, detail="This assignment is not a coding problem")
-    
-    if not assignment.language:
-        raise HTTPException(status_code=400, detail="Assignment language not specified")
-    
-    # Get all test cases for this assignment
-    test_cases = db.query(TestCase).filter(
-        TestCase.assignment_id == submission.assignment_id,
-        TestCase.expected_output != None  # Only coding test cases
-    ).all()
-    
-    test_cases_data = [
-        {
-            "input": tc.input or "",
-            "expected_output": tc.expected_output,
-        }
-        for tc in test_cases
-    ]
-    
-    # Execute the coding problem using Judge0 for Python, local for JavaScript
-    if assignment.language.lower() == 'python':
-        # Use Judge0 for Python execution
-        result = Judge0Executor.execute_coding_problem(
-            language='python',
-            user_code=submission.code,
-            test_cases=test_cases_data
-        )
-        return result
-    elif assignment.language.lower() == 'javascript':
-        # Use Piston API for JavaScript execution
-        result = PistonExecutor.execute_coding_problem(
-            user_code=submission.code,
-            test_cases=test_cases_data
-        )
-        return result
-    else:
-        return {"success": False, "error": f"Unsupported language: {assignment.language}"}
-
-@router.get("/{assignment_id}/stats")
-def get_assignment_stats(assignment_id: int, db: Session = Depends(get_db)):
-    total_submissions = db.query(Submission).filter(Submission.assignment_id == assignment_id).count()
-    passed_submissions = db.query(Submission).filter(Submission.assignment_id == assignment_id, Submission.status == "pass").count()
-    failed_submissions = db.query(Submission).filter(Submission.assignment_id == assignment_id, Submission.status == "fail").count()
-    unique_submitters = db.query(Submission.user_id).filter(Submission.assignment_id == assignment_id).distinct().count()
-    total_users = db.query(User).count()
-    remaining = total_users - unique_submitters
-
-    return {
-        "total_submissions": total_submissions,
-        "passed_submissions": passed_submissions,
-        "failed_submissions": failed_submissions,
-        "submitted": unique_submitters,
-        "remaining": remaining
-    }
-
-@router.get("/completion-stats")
-def get_completion_stats(db: Session = Depends(get_db)):
-    return {"completion_stats": []}
+from fastapi import APIRouter, Depends, HTTPException, Header, Query, Request, Response
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+import hashlib
+import json
+import tempfile
+from typing import Optional
+from app.database import SessionLocal, get_async_db
+from app.models.assignment import Assignment
+from app.models.testcase import TestCase
+from app.models.sql_limits import SQLLimits
+from app.models.testcase_dataset import TestCaseDataset
+from app.models.sql_performance import SQLPerformance
+from app.models.sql_dataset_spec import SQLDatasetSpec
+from app.models.submission_counters import SubmissionCounters
+from app.schemas import AssignmentCreate, SQLSubmission, CodeSubmission
+from app.services.assignment_cache import AssignmentBundle, assignment_cache
+from app.services.assignment_import import IMPORT_CHUNK_SIZE, AssignmentImportError, import_assignments
+from app.services.grading import grade_code_submission_async, grade_sql_submission_async
+from app.services.sql_datasets import DatasetSpecError, prebuild_dataset, validate_spec
+from app.services.sql_pool import SQLPoolBusy
+from app.services.submission_stats import assignment_stats, completion_stats
+
+router = APIRouter(prefix="/assignments")
+
+# Columns the listing may return; schemas, test data and solutions are never loaded
+LISTING_FIELDS = ("id", "title", "description", "domain", "difficulty", "problem_type", "language")
+# Page size when only after_id is given; without limit or after_id the listing is not paginated
+ASSIGNMENT_PAGE_SIZE = 100
+ASSIGNMENT_MAX_PAGE_SIZE = 500
+# Import uploads larger than this are spooled to a temporary file
+IMPORT_SPOOL_BYTES = 16 * 1024 * 1024
+
+@router.get("/")
+async def get_assignments(
+    response: Response,
+    domain: Optional[str] = None,
+    difficulty: Optional[str] = None,
+    problem_type: Optional[str] = None,
+    language: Optional[str] = None,
+    after_id: Optional[int] = Query(default=None, description="Return assignments with a larger id (X-Next-Cursor of the previous page)"),
+    limit: Optional[int] = Query(default=None, ge=1, le=ASSIGNMENT_MAX_PAGE_SIZE, description="Page size; pages are only returned when limit or after_id is given"),
+    fields: Optional[str] = Query(default=None, description="Comma-separated subset of the listing fields"),
+    if_none_match: Optional[str] = Header(default=None),
+    db: AsyncSession = Depends(get_async_db)
+):
+    selected = LISTING_FIELDS
+    if fields:
+        selected = tuple(field.strip() for field in fields.split(",") if field.strip())
+        unknown = [field for field in selected if field not in LISTING_FIELDS]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown fields: {', '.join(unknown)} (allowed: {', '.join(LISTING_FIELDS)})")
+        if "id" not in selected:
+            selected = ("id",) + selected
+
+    query = select(*(getattr(Assignment, field) for field in selected))
+    filters = {"domain": domain, "difficulty": difficulty, "problem_type": problem_type, "language": language}
+    for column, value in filters.items():
+        if value is not None:
+            query = query.where(getattr(Assignment, column) == value)
+    if after_id is not None:
+        query = query.where(Assignment.id > after_id)
+    query = query.order_by(Assignment.id)
+    if limit is None and after_id is None:
+        # Unpaginated for clients that do not follow X-Next-Cursor
+        page = [dict(row._mapping) for row in (await db.execute(query)).all()]
+    else:
+        limit = limit or ASSIGNMENT_PAGE_SIZE
+        # One extra row tells whether there is a next page
+        rows = (await db.execute(query.limit(limit + 1))).all()
+        page = [dict(row._mapping) for row in rows[:limit]]
+        if len(rows) > limit:
+            response.headers["X-Next-Cursor"] = str(page[-1]["id"])
+
+    # The ETag covers the page content, so any create or edit changes it
+    etag = 'W/"' + hashlib.sha256(json.dumps([page, response.headers.get("X-Next-Cursor")], default=str).encode("utf-8")).hexdigest()[:32] + '"'
+    response.headers["ETag"] = etag
+    response.headers["Cache-Control"] = "no-cache"
+    if if_none_match and etag in (tag.strip() for tag in if_none_match.split(",")):
+        return Response(status_code=304, headers=dict(response.headers))
+    return page
+
+# Declared before /{assignment_id}, which would otherwise match this path
+@router.get("/completion-stats")
+async def get_completion_stats(db: AsyncSession = Depends(get_async_db)):
+    return await db.run_sync(completion_stats)
+
+@router.get("/{assignment_id}")
+async def get_assignment(assignment_id: int, db: AsyncSession = Depends(get_async_db)):
+    assignment = await db.get(Assignment, assignment_id)
+    if not assignment:
+        raise HTTPException(status_code=404, detail="Assignment not found")
+    
+    test_cases = (await db.execute(select(TestCase).where(TestCase.assignment_id == assignment_id))).scalars().all()
+    
+    return {
+        "id": assignment.id,
+        "title": assignment.title,
+        "description": assignment.description,
+        "domain": assignment.domain,
+        "difficulty": assignment.difficulty,
+        "problem_type": assignment.problem_type,
+        "language": assignment.language,
+        "sql_schema": assignment.sql_schema,
+        "test_input": assignment.test_input,
+        "expected_output": assignment.expected_output,
+        "test_cases": [
+            {
+                "id": tc.id,
+                "input": tc.input,
+                "expected_output": tc.expected_output,
+                "sql_query": tc.sql_query,
+                "expected_result": tc.expected_result,
+                "hidden": tc.hidden,
+            }
+            for tc in test_cases
+        ]
+    }
+
+@router.post("/create")
+async def create_assignment(data: AssignmentCreate, db: AsyncSession = Depends(get_async_db)):
+    dataset = data.sql_performance.dataset if data.sql_performance else None
+    if dataset:
+        try:
+            # Runs the schema script; keep it off the event loop
+            await run_in_threadpool(validate_spec, dataset, data.sql_schema or "")
+        except DatasetSpecError as e:
+            raise HTTPException(status_code=400, detail=f"Invalid dataset spec: {e}")
+
+    new_assignment = Assignment(
+        title=data.title,
+        description=data.description,
+        domain=data.domain,
+        difficulty=data.difficulty,
+        problem_type=data.problem_type,
+        language=data.language,  # Add language for coding problems
+        test_input=data.test_input,
+        expected_output=data.expected_output,
+        sql_schema=data.sql_schema,
+        sql_query=data.sql_query,
+        sql_verification=data.sql_verification,
+    )
+
+    db.add(new_assignment)
+    await db.flush()
+    # Submissions only ever update this row (see services/submission_stats.py)
+    db.add(SubmissionCounters(assignment_id=new_assignment.id))
+    await db.commit()
+    
+    if data.sql_limits:
+        db.add(SQLLimits(assignment_id=new_assignment.id, **data.sql_limits.model_dump()))
+        await db.commit()
+    
+    if data.sql_performance:
+        db.add(SQLPerformance(assignment_id=new_assignment.id, **data.sql_performance.model_dump(exclude={"dataset"})))
+        if dataset:
+            db.add(SQLDatasetSpec(assignment_id=new_assignment.id, spec=json.dumps(dataset)))
+        await db.commit()
+        if dataset:
+            # Millions of rows take a while; build now rather than on the first submission
+            prebuild_dataset(new_assignment.sql_schema, dataset)
+    
+    # Add test cases if provided
+    if data.test_cases:
+        for tc in data.test_cases:
+            test_case = TestCase(
+                assignment_id=new_assignment.id,
+                input=tc.input,
+                expected_output=tc.expected_output,
+                sql_query=tc.sql_query,
+                expected_result=tc.expected_result,
+                hidden=tc.hidden,
+            )
+            db.add(test_case)
+            if tc.seed_sql:
+                await db.flush()
+                db.add(TestCaseDataset(testcase_id=test_case.id, name=tc.dataset_name, seed_sql=tc.seed_sql))
+        await db.commit()
+
+    assignment_cache.invalidate(new_assignment.id)
+    return {"message": "Assignment created successfully", "id": new_assignment.id}
+
+@router.post("/import")
+async def import_assignment_bank(
+    request: Request,
+    dry_run: bool = False,
+    chunk_size: int = Query(default=IMPORT_CHUNK_SIZE, ge=1, le=5000)
+):
+    """
+    Bulk import: the request body is JSON Lines (one /assignments/create body
+    per line) or a zip of .jsonl files. Returns the import report.
+    """
+    upload = tempfile.SpooledTemporaryFile(max_size=IMPORT_SPOOL_BYTES)
+    async for chunk in request.stream():
+        upload.write(chunk)
+    upload.seek(0)
+
+    def run_import():
+        db = SessionLocal()
+        try:
+            return import_assignments(db, upload, chunk_size=chunk_size, dry_run=dry_run)
+        finally:
+            db.close()
+            upload.close()
+
+    # Parsing and validation are CPU-bound; keep them off the event loop
+    try:
+        return await run_in_threadpool(run_import)
+    except AssignmentImportError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def check_sql_problem(assignment: Optional[AssignmentBundle]):
+    """Return a SQL assignment's bundle and test cases, raising HTTP errors for invalid requests"""
+    if not assignment:
+        raise HTTPException(status_code=404, detail="Assignment not found")
+    
+    if assignment.problem_type != "sql":
+        raise HTTPException(status_code=400, detail="This assignment is not a SQL problem")
+    
+    return assignment, assignment.sql_test_cases
+
+def check_code_problem(assignment: Optional[AssignmentBundle]):
+    """Return a coding assignment's bundle and test cases, raising HTTP errors for invalid requests"""
+    if not assignment:
+        raise HTTPException(status_code=404, detail="Assignment not found")
+    
+    if assignment.problem_type != "coding":
+        raise HTTPException(status_code=400, detail="This assignment is not a coding problem")
+    
+    if not assignment.language:
+        raise HTTPException(status_code=400, detail="Assignment language not specified")
+    
+    return assignment, assignment.code_test_cases
+
+def load_sql_problem(assignment_id: int, db: Session):
+    """Load a SQL assignment and its grading data, raising HTTP errors for invalid requests"""
+    return check_sql_problem(assignment_cache.get(assignment_id, db))
+
+def load_code_problem(assignment_id: int, db: Session):
+    """Load a coding assignment and its grading data, raising HTTP errors for invalid requests"""
+    return check_code_problem(assignment_cache.get(assignment_id, db))
+
+async def load_bundle_async(assignment_id: int, db: AsyncSession) -> Optional[AssignmentBundle]:
+    """The assignment's bundle from the cache; misses are loaded through the async session"""
+    return await db.run_sync(lambda session: assignment_cache.get(assignment_id, session))
+
+@router.post("/submit-sql")
+async def submit_sql(submission: SQLSubmission, db: AsyncSession = Depends(get_async_db)):
+    """Submit and test SQL query"""
+    assignment, test_cases_data = check_sql_problem(await load_bundle_async(submission.assignment_id, db))
+    
+    # Execute the SQL problem
+    try:
+        result = await grade_sql_submission_async(
+            schema_sql=assignment.sql_schema,
+            user_query=submission.sql_query,
+            test_cases=test_cases_data,
+            limits=assignment.sql_limits,
+            performance=assignment.sql_performance
+        )
+    except SQLPoolBusy:
+        raise HTTPException(status_code=503, detail="SQL grading is busy, please retry")
+    
+    return result
+
+@router.post("/submit-code")
+async def submit_code(submission: CodeSubmission, db: AsyncSession = Depends(get_async_db)):
+    """Submit and test code (Python/JavaScript)"""
+    assignment, test_cases_data = check_code_problem(await load_bundle_async(submission.assignment_id, db))
+    
+    return await grade_code_submission_async(
+        language=assignment.language,
+        user_code=submission.code,
+        test_cases=test_cases_data,
+        fail_fast=submission.fail_fast,
+        assignment_id=assignment.id
+    )
+
+@router.get("/{assignment_id}/stats")
+async def get_assignment_stats(assignment_id: int, db: AsyncSession = Depends(get_async_db)):
+    return await db.run_sync(assignment_stats, assignment_id)
@@ -1,43 +1,45 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
-from app.database import get_db
-from app.models.user import User
-from app.utils.password import hash_password, verify_password
-from app.utils.jwt_handler import create_access_token
-from app.schemas import UserCreate, LoginRequest
-
-router = APIRouter(prefix="/auth")
-
-@router.post("/register")
-def register(user: UserCreate, db: Session = Depends(get_db)):
-    existing = db.query(User).filter(User.email == user.email).first()
-    if existing:
-        raise HTTPException(status_code=400, detail="Email already registered")
-
-    new_user = User(
-        name=user.name,
-        email=user.email,
-        password=hash_password(user.password),
-        role=user.role,
-        domain=user.domain
-    )
-
-    db.add(new_user)
-    db.commit()
-    db.refresh(new_user)
-
-    return {"message": "User registered successfully"}
-
-@router.post("/login")
-def login(data: LoginRequest, db: Session = Depends(get_db)):
-    user = db.query(User).filter(User.email == data.email).first()
-
-    if not user or not verify_password(data.password, user.password):
-        raise HTTPException(status_code=401, detail="Invalid credentials")
-
-    token = create_access_token({"user_id": user.id, "role": user.role})
-
-    return {
-        "access_token": token,
-        "role": user.role
-    }
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.concurrency import run_in_threadpool
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_async_db
+from app.models.user import User
+from app.utils.password import hash_password, verify_password
+from app.utils.jwt_handler import create_access_token
+from app.schemas import UserCreate, LoginRequest
+
+router = APIRouter(prefix="/auth")
+
+@router.post("/register")
+async def register(user: UserCreate, db: AsyncSession = Depends(get_async_db)):
+    existing = (await db.execute(select(User).where(User.email == user.email))).scalars().first()
+    if existing:
+        raise HTTPException(status_code=400, detail="Email already registered")
+
+    new_user = User(
+        name=user.name,
+        email=user.email,
+        # Password hashing is CPU-bound; keep it off the event loop
+        password=await run_in_threadpool(hash_password, user.password),
+        role=user.role,
+        domain=user.domain
+    )
+
+    db.add(new_user)
+    await db.commit()
+
+    return {"message": "User registered successfully"}
+
+@router.post("/login")
+async def login(data: LoginRequest, db: AsyncSession = Depends(get_async_db)):
+    user = (await db.execute(select(User).where(User.email == data.email))).scalars().first()
+
+    if not user or not await run_in_threadpool(verify_password, data.password, user.password):
+        raise HTTPException(status_code=401, detail="Invalid credentials")
+
+    token = create_access_token({"user_id": user.id, "role": user.role})
+
+    return {
+        "access_token": token,
+        "role": user.role
+    }
@@ -0,0 +1,93 @@
+import asyncio
+import json
+from fastapi import APIRouter, Depends, HTTPException, Header
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+from typing import Optional
+from app.database import get_db
+from app.routers.assignments import load_code_problem, load_sql_problem
+from app.schemas import SQLSubmission, CodeSubmission
+from app.services.grading import grade_code_submission, grade_sql_submission
+from app.services.grading_jobs import GradingQueueFull, grading_jobs
+
+router = APIRouter(prefix="/jobs", tags=["Jobs"])
+
+# How often the event stream checks a job for new events
+EVENT_POLL_INTERVAL = 0.1
+
+@router.post("/submit-code", status_code=202)
+def submit_code_job(submission: CodeSubmission, db: Session = Depends(get_db)):
+    """Queue a coding submission for grading and return its job id"""
+    assignment, test_cases_data = load_code_problem(submission.assignment_id, db)
+
+    try:
+        job = grading_jobs.submit(
+            "code",
+            assignment.id,
+            grade_code_submission,
+            language=assignment.language,
+            user_code=submission.code,
+            test_cases=test_cases_data,
+            fail_fast=submission.fail_fast,
+            assignment_id=assignment.id
+        )
+    except GradingQueueFull:
+        raise HTTPException(status_code=503, detail="Grading is busy, please retry")
+    return {"job_id": job.id, "status": job.status}
+
+@router.post("/submit-sql", status_code=202)
+def submit_sql_job(submission: SQLSubmission, db: Session = Depends(get_db)):
+    """Queue a SQL submission for grading and return its job id"""
+    assignment, test_cases_data = load_sql_problem(submission.assignment_id, db)
+
+    try:
+        job = grading_jobs.submit(
+            "sql",
+            assignment.id,
+            grade_sql_submission,
+            schema_sql=assignment.sql_schema,
+            user_query=submission.sql_query,
+            test_cases=test_cases_data,
+            limits=assignment.sql_limits,
+            performance=assignment.sql_performance
+        )
+    except GradingQueueFull:
+        raise HTTPException(status_code=503, detail="Grading is busy, please retry")
+    return {"job_id": job.id, "status": job.status}
+
+@router.get("/{job_id}")
+async def get_job(job_id: str):
+    job = grading_jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+    return job.to_dict()
+
+@router.get("/{job_id}/events")
+async def stream_job_events(job_id: str, last_event_id: Optional[str] = Header(default=None)):
+    """
+    Server-Sent Events stream of a job: "status", "test_result" (one per
+    test as it completes), then "result" or "error". Reconnecting clients
+    resume after the Last-Event-ID header.
+    """
+    job = grading_jobs.get(job_id)
+    if not job:
+        raise HTTPException(status_code=404, detail="Job not found")
+
+    start = int(last_event_id) + 1 if last_event_id and last_event_id.isdigit() else 0
+
+    async def event_stream():
+        index = start
+        while True:
+            done = job.done
+            for event in job.events_since(index):
+                yield f"id: {index}\nevent: {event['event']}\ndata: {json.dumps(event['data'], default=str)}\n\n"
+                index += 1
+            if done:
+                break
+            await asyncio.sleep(EVENT_POLL_INTERVAL)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
@@ -0,0 +1,28 @@
+import hmac
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException
+from fastapi.security import HTTPBasic, HTTPBasicCredentials
+from app.services.judge0_callbacks import judge0_callbacks
+from app.services.judge0_executor import JUDGE0_CALLBACK_SECRET, JUDGE0_CALLBACK_USER
+
+# Mounted by main.py only when JUDGE0_CALLBACK_URL (and so JUDGE0_CALLBACK_SECRET) is set
+router = APIRouter(prefix="/judge0", tags=["Judge0"])
+basic_auth = HTTPBasic(auto_error=False)
+
+@router.put("/callback")
+def judge0_callback(submission: dict, credentials: Optional[HTTPBasicCredentials] = Depends(basic_auth)):
+    """Receive a finished submission from Judge0 and wake the waiting executor"""
+    if credentials is None:
+        raise HTTPException(status_code=401, detail="Missing callback credentials", headers={"WWW-Authenticate": "Basic"})
+    valid_user = hmac.compare_digest(credentials.username.encode("utf-8"), JUDGE0_CALLBACK_USER.encode("utf-8"))
+    valid_secret = hmac.compare_digest(credentials.password.encode("utf-8"), JUDGE0_CALLBACK_SECRET.encode("utf-8"))
+    if not (valid_user and valid_secret and JUDGE0_CALLBACK_SECRET):
+        raise HTTPException(status_code=403, detail="Invalid callback secret")
+
+    token = submission.get("token")
+    if not token:
+        raise HTTPException(status_code=400, detail="Missing submission token")
+
+    judge0_callbacks.deliver(token, submission)
+    return {"message": "Callback received"}
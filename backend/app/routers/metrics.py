@@ -0,0 +1,33 @@
+from fastapi import APIRouter
+from app.services.assignment_cache import assignment_cache
+from app.services.execution_cache import execution_cache
+from app.services.executor_router import executor_router
+from app.services.sql_datasets import dataset_files
+from app.services.sql_templates import schema_templates
+
+router = APIRouter(prefix="/metrics", tags=["Metrics"])
+
+@router.get("/execution-cache")
+def get_execution_cache_stats():
+    """Hit/miss counters and size of the execution result cache"""
+    return execution_cache.stats()
+
+@router.get("/assignment-cache")
+def get_assignment_cache_stats():
+    """Hit/miss counters and size of the assignment bundle cache"""
+    return assignment_cache.stats()
+
+@router.get("/sql-templates")
+def get_sql_template_stats():
+    """Size and hit counters of the SQL schema template cache"""
+    return schema_templates.stats()
+
+@router.get("/sql-datasets")
+def get_sql_datasets():
+    """Generated SQL dataset files and their sizes"""
+    return dataset_files()
+
+@router.get("/executors")
+def get_executor_health():
+    """Latency percentiles, error rate, quota and circuit state per execution backend"""
+    return executor_router.health_snapshot()
@@ -1,24 +1,26 @@
-from fastapi import APIRouter, Depends
-from sqlalchemy.orm import Session
-from app.database import get_db
-from app.services.lambda_service import run_code
-from app.models.submission import Submission
-
-router = APIRouter(prefix="/submissions", tags=["Submissions"])
-
-@router.post("/run")
-def run_submission(payload: dict, db: Session = Depends(get_db)):
-    result = run_code(payload)
-
-    submission = Submission(
-        assignment_id=payload["assignment_id"],
-        user_id=payload["user_id"],
-        code=payload["code"],
-        status="pass" if result["passed"] else "fail",
-        output=str(result["results"]),
-        score=100 if result["passed"] else 0
-    )
-    db.add(submission)
-    db.commit()
-
-    return {"result": result}
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from app.database import get_async_db
+from app.services.grading import run_blocking
+from app.services.lambda_service import run_code
+from app.models.submission import Submission
+from app.services.submission_stats import record_submission
+
+router = APIRouter(prefix="/submissions", tags=["Submissions"])
+
+@router.post("/run")
+async def run_submission(payload: dict, db: AsyncSession = Depends(get_async_db)):
+    result = await run_blocking(run_code, payload)
+
+    submission = Submission(
+        assignment_id=payload["assignment_id"],
+        user_id=payload["user_id"],
+        code=payload["code"],
+        status="pass" if result["passed"] else "fail",
+        output=str(result["results"]),
+        score=100 if result["passed"] else 0
+    )
+    await db.run_sync(record_submission, submission)
+    await db.commit()
+
+    return {"result": result}
@@ -1,46 +1,65 @@
-from pydantic import BaseModel
-from typing import Optional, List
-
-class UserCreate(BaseModel):
-    name: str
-    email: str
-    password: str
-    role: str
-    domain: str
-
-class LoginRequest(BaseModel):
-    email: str
-    password: str
-
-class TestCaseInput(BaseModel):
-    """For SQL or Coding test case"""
-    input: Optional[str] = None  # For coding problems
-    expected_output: Optional[str] = None  # For coding problems
-    sql_query: Optional[str] = None  # For SQL problems
-    expected_result: Optional[str] = None  # For SQL problems (JSON string)
-    hidden: bool = False
-
-class AssignmentCreate(BaseModel):
-    title: str
-    description: str
-    domain: str
-    difficulty: str
-    problem_type: str = "coding"  # "coding" or "sql"
-    
-    # For coding problems
-    language: Optional[str] = None  # python or javascript
-    test_input: Optional[str] = None
-    expected_output: Optional[str] = None
-    
-    # For SQL problems
-    sql_schema: Optional[str] = None
-    sql_query: Optional[str] = None
-    test_cases: Optional[List[TestCaseInput]] = None
-
-class SQLSubmission(BaseModel):
-    assignment_id: int
-    sql_query: str
-
-class CodeSubmission(BaseModel):
-    assignment_id: int
-    code: str
+from pydantic import BaseModel
+from typing import Any, Dict, Optional, List, Literal
+
+class UserCreate(BaseModel):
+    name: str
+    email: str
+    password: str
+    role: str
+    domain: str
+
+class LoginRequest(BaseModel):
+    email: str
+    password: str
+
+class TestCaseInput(BaseModel):
+    """For SQL or Coding test case"""
+    input: Optional[str] = None  # For coding problems
+    expected_output: Optional[str] = None  # For coding problems
+    sql_query: Optional[str] = None  # For SQL problems
+    expected_result: Optional[str] = None  # For SQL problems (JSON string)
+    seed_sql: Optional[str] = None  # For SQL problems: dataset variant applied on top of sql_schema
+    dataset_name: Optional[str] = None  # Label of the seed_sql dataset in results
+    hidden: bool = False
+
+class SQLLimitsInput(BaseModel):
+    """Per-assignment SQL grading limits; unset fields use the server defaults"""
+    time_limit_ms: Optional[int] = None
+    max_vm_steps: Optional[int] = None
+    max_rows: Optional[int] = None
+    max_result_bytes: Optional[int] = None
+
+class SQLPerformanceInput(BaseModel):
+    """Grade query efficiency against the reference sql_query on a scaled-up dataset"""
+    seed_sql: Optional[str] = None  # applied on top of sql_schema to scale the data up
+    dataset: Optional[Dict[str, Any]] = None  # or a generated dataset spec (services/sql_datasets.py)
+    runs: Optional[int] = None
+
+class AssignmentCreate(BaseModel):
+    title: str
+    description: str
+    domain: str
+    difficulty: str
+    problem_type: str = "coding"  # "coding" or "sql"
+    
+    # For coding problems
+    language: Optional[str] = None  # python or javascript
+    test_input: Optional[str] = None
+    expected_output: Optional[str] = None
+    
+    # For SQL problems
+    sql_schema: Optional[str] = None
+    sql_query: Optional[str] = None
+    sql_verification: bool = False  # test case sql_query verifies the state left by the submission
+    sql_limits: Optional[SQLLimitsInput] = None
+    sql_performance: Optional[SQLPerformanceInput] = None
+    test_cases: Optional[List[TestCaseInput]] = None
+
+class SQLSubmission(BaseModel):
+    assignment_id: int
+    sql_query: str
+
+class CodeSubmission(BaseModel):
+    assignment_id: int
+    code: str
+    fail_fast: Optional[Literal["off", "compile", "first_failure"]] = None  # default GRADING_FAIL_FAST
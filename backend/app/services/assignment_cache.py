@@ -0,0 +1,207 @@
+"""
+In-process cache of assignment grading bundles
+A bundle is everything the submit endpoints need to grade an assignment:
+the assignment fields, its coding and SQL test cases (SQL expected results
+already parsed from JSON), and the SQL limits and performance settings.
+Assignments do not change during an exam, so a bundle is loaded once and
+served from memory. Endpoints that create or edit an assignment call
+invalidate(), which bumps the assignment's version so a load that raced
+with the edit is not stored. Entries also expire after
+ASSIGNMENT_CACHE_TTL seconds, which bounds staleness when several server
+processes share the database.
+"""
+
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.models.assignment import Assignment
+from app.models.sql_dataset_spec import SQLDatasetSpec
+from app.models.sql_limits import SQLLimits
+from app.models.sql_performance import SQLPerformance
+from app.models.submission import Submission
+from app.models.testcase import TestCase
+from app.models.testcase_dataset import TestCaseDataset
+
+ASSIGNMENT_CACHE_ENABLED = os.getenv("ASSIGNMENT_CACHE_ENABLED", "true").lower() == "true"
+ASSIGNMENT_CACHE_MAX_ENTRIES = int(os.getenv("ASSIGNMENT_CACHE_MAX_ENTRIES", "1000"))
+ASSIGNMENT_CACHE_TTL = float(os.getenv("ASSIGNMENT_CACHE_TTL", "300"))
+# Assignments with the most recent submissions loaded at startup
+ASSIGNMENT_CACHE_WARM = int(os.getenv("ASSIGNMENT_CACHE_WARM", "50"))
+
+
+class AssignmentBundle:
+    """Read-only grading data of one assignment"""
+
+    def __init__(self, assignment: Assignment, code_test_cases: List[Dict[str, Any]], sql_test_cases: List[Dict[str, Any]], sql_limits: Dict[str, int], sql_performance: Optional[Dict[str, Any]], version: int):
+        self.id = assignment.id
+        self.problem_type = assignment.problem_type
+        self.language = assignment.language
+        self.sql_schema = assignment.sql_schema
+        self.sql_query = assignment.sql_query
+        self.sql_verification = assignment.sql_verification
+        self.code_test_cases = code_test_cases
+        self.sql_test_cases = sql_test_cases
+        self.sql_limits = sql_limits
+        self.sql_performance = sql_performance
+        self.version = version
+
+
+def _sql_limits(assignment_id: int, db: Session) -> Dict[str, int]:
+    """The assignment's SQL limit overrides (only the fields that are set)"""
+    limits = db.query(SQLLimits).filter(SQLLimits.assignment_id == assignment_id).first()
+    if not limits:
+        return {}
+    fields = ("time_limit_ms", "max_vm_steps", "max_rows", "max_result_bytes")
+    return {field: getattr(limits, field) for field in fields if getattr(limits, field) is not None}
+
+
+def _sql_performance(assignment: Assignment, db: Session) -> Optional[Dict[str, Any]]:
+    """Efficiency grading settings, or None when the assignment does not use it"""
+    performance = db.query(SQLPerformance).filter(SQLPerformance.assignment_id == assignment.id).first()
+    if not performance or not assignment.sql_query:
+        return None
+    dataset = db.query(SQLDatasetSpec).filter(SQLDatasetSpec.assignment_id == assignment.id).first()
+    return {
+        "reference_query": assignment.sql_query,
+        "seed_sql": performance.seed_sql,
+        "dataset": json.loads(dataset.spec) if dataset else None,
+        "runs": performance.runs
+    }
+
+
+def _sql_test_case(tc: TestCase, dataset: Optional[TestCaseDataset], verification: bool) -> Dict[str, Any]:
+    test_case = {
+        "expected_result": tc.expected_result,
+    }
+    if verification and tc.sql_query:
+        test_case["verification_query"] = tc.sql_query
+    try:
+        test_case["expected_value"] = json.loads(tc.expected_result)
+    except (TypeError, ValueError):
+        # Left to the grader, which reports the invalid JSON per test case
+        pass
+    if dataset:
+        test_case["seed_sql"] = dataset.seed_sql
+        test_case["dataset"] = dataset.name or f"dataset {tc.id}"
+    return test_case
+
+
+def load_bundle(assignment_id: int, db: Session, version: int = 0) -> Optional[AssignmentBundle]:
+    """Read an assignment's grading data from the database (None if it does not exist)"""
+    assignment = db.query(Assignment).filter(Assignment.id == assignment_id).first()
+    if not assignment:
+        return None
+
+    test_cases = db.query(TestCase).filter(TestCase.assignment_id == assignment_id).all()
+    code_test_cases = [
+        {
+            "id": tc.id,
+            "input": tc.input or "",
+            "expected_output": tc.expected_output,
+        }
+        for tc in test_cases
+        if tc.expected_output is not None  # Only coding test cases
+    ]
+
+    sql_test_cases = []
+    sql_limits = {}
+    sql_performance = None
+    if assignment.problem_type == "sql":
+        sql_cases = [tc for tc in test_cases if tc.expected_result is not None]
+        datasets = {
+            dataset.testcase_id: dataset
+            for dataset in db.query(TestCaseDataset).filter(TestCaseDataset.testcase_id.in_([tc.id for tc in sql_cases]))
+        }
+        sql_test_cases = [_sql_test_case(tc, datasets.get(tc.id), assignment.sql_verification) for tc in sql_cases]
+        sql_limits = _sql_limits(assignment_id, db)
+        sql_performance = _sql_performance(assignment, db)
+
+    return AssignmentBundle(assignment, code_test_cases, sql_test_cases, sql_limits, sql_performance, version)
+
+
+class AssignmentCache:
+    """Thread-safe LRU of assignment bundles with per-assignment versions"""
+
+    def __init__(self, max_entries: int = ASSIGNMENT_CACHE_MAX_ENTRIES, ttl: float = ASSIGNMENT_CACHE_TTL, enabled: bool = ASSIGNMENT_CACHE_ENABLED):
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.enabled = enabled
+        self._entries: "OrderedDict[int, tuple]" = OrderedDict()  # assignment_id -> (bundle, expires_at)
+        self._versions: Dict[int, int] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.invalidations = 0
+
+    def get(self, assignment_id: int, db: Session) -> Optional[AssignmentBundle]:
+        """Return the cached bundle, loading it through db on a miss"""
+        if not self.enabled:
+            return load_bundle(assignment_id, db)
+
+        with self._lock:
+            entry = self._entries.get(assignment_id)
+            if entry is not None and entry[1] > time.monotonic():
+                self._entries.move_to_end(assignment_id)
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+            version = self._versions.get(assignment_id, 0)
+
+        bundle = load_bundle(assignment_id, db, version)
+        if bundle is None:
+            return None
+
+        with self._lock:
+            # An edit during the load made this bundle stale; serve it once but do not keep it
+            if self._versions.get(assignment_id, 0) == version:
+                self._entries[assignment_id] = (bundle, time.monotonic() + self.ttl)
+                self._entries.move_to_end(assignment_id)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+        return bundle
+
+    def invalidate(self, assignment_id: int):
+        """Drop an assignment's bundle; call after creating or editing it"""
+        with self._lock:
+            self._versions[assignment_id] = self._versions.get(assignment_id, 0) + 1
+            self._entries.pop(assignment_id, None)
+            self.invalidations += 1
+
+    def warm(self, db: Session, limit: int = ASSIGNMENT_CACHE_WARM) -> int:
+        """Load the assignments with the most recent submissions"""
+        if not self.enabled or limit <= 0:
+            return 0
+        rows = db.query(Submission.assignment_id).filter(
+            Submission.assignment_id != None
+        ).group_by(Submission.assignment_id).order_by(func.max(Submission.id).desc()).limit(limit).all()
+        for row in rows:
+            self.get(row.assignment_id, db)
+        return len(rows)
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "invalidations": self.invalidations,
+            }
+
+    def clear(self):
+        with self._lock:
+            for assignment_id in self._entries:
+                self._versions[assignment_id] = self._versions.get(assignment_id, 0) + 1
+            self._entries.clear()
+
+
+assignment_cache = AssignmentCache()
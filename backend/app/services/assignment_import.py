@@ -0,0 +1,266 @@
+"""
+Bulk import of assignments and their test cases
+The input is JSON Lines, one AssignmentCreate object per line (the body of
+POST /assignments/create), or a zip of .jsonl files. Records are parsed and
+validated one at a time, so a question bank of any size is never held in
+memory; invalid records are reported with their file and line and skipped.
+Valid records are written in chunks of IMPORT_CHUNK_SIZE assignments, each
+chunk in one transaction with a handful of multi-row INSERTs (assignments,
+test cases, test case datasets, SQL limits and performance settings,
+submission counters) instead of a commit per row.
+"""
+
+import json
+import os
+import zipfile
+from typing import IO, Any, Dict, Iterator, List, Optional, Tuple
+
+from pydantic import ValidationError
+from sqlalchemy import insert
+from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.orm import Session
+
+from app.models.assignment import Assignment
+from app.models.sql_dataset_spec import SQLDatasetSpec
+from app.models.sql_limits import SQLLimits
+from app.models.sql_performance import SQLPerformance
+from app.models.submission_counters import SubmissionCounters
+from app.models.testcase import TestCase
+from app.models.testcase_dataset import TestCaseDataset
+from app.schemas import AssignmentCreate
+from app.services.assignment_cache import assignment_cache
+from app.services.sql_datasets import DatasetSpecError, prebuild_dataset, validate_spec
+
+IMPORT_CHUNK_SIZE = int(os.getenv("IMPORT_CHUNK_SIZE", "200"))
+# Invalid records listed in the report; the rest are only counted
+IMPORT_MAX_REPORTED_ERRORS = int(os.getenv("IMPORT_MAX_REPORTED_ERRORS", "100"))
+
+PROBLEM_TYPES = ("coding", "sql")
+ZIP_MAGIC = b"PK\x03\x04"
+
+
+class AssignmentImportError(ValueError):
+    """The import file itself is unreadable (not an invalid record)"""
+
+
+def _iter_lines(stream: IO[bytes], source: str) -> Iterator[Tuple[str, int, Any]]:
+    """(source, line number, parsed JSON or the ValueError) for every non-blank line"""
+    for line_no, raw in enumerate(stream, start=1):
+        line = raw.strip()
+        if not line:
+            continue
+        try:
+            yield source, line_no, json.loads(line)
+        except ValueError as e:
+            yield source, line_no, ValueError(f"Invalid JSON: {e}")
+
+
+def iter_records(stream: IO[bytes], filename: str = "upload.jsonl") -> Iterator[Tuple[str, int, Any]]:
+    """
+    Records of a JSON Lines file or a zip of them, read lazily from a
+    seekable binary stream
+
+    Raises:
+        AssignmentImportError: a corrupt zip, or one without .jsonl files
+    """
+    head = stream.read(len(ZIP_MAGIC))
+    stream.seek(0)
+    if head != ZIP_MAGIC:
+        yield from _iter_lines(stream, filename)
+        return
+
+    try:
+        archive = zipfile.ZipFile(stream)
+    except zipfile.BadZipFile as e:
+        raise AssignmentImportError(f"Invalid zip file: {e}")
+    with archive:
+        members = sorted(name for name in archive.namelist() if name.endswith(".jsonl") and not name.startswith("__MACOSX/"))
+        if not members:
+            raise AssignmentImportError("The zip file contains no .jsonl files")
+        for name in members:
+            with archive.open(name) as member:
+                yield from _iter_lines(member, name)
+
+
+def validate_record(record: Any) -> AssignmentCreate:
+    """
+    Parse one record and check what create_assignment would otherwise store
+    broken: the problem type, the fields each type needs, expected results
+    that are not JSON, and dataset specs
+
+    Raises:
+        ValueError: with a message describing the first problem found
+    """
+    if isinstance(record, ValueError):
+        raise record
+    try:
+        data = AssignmentCreate.model_validate(record)
+    except ValidationError as e:
+        raise ValueError("; ".join(f"{'.'.join(str(part) for part in error['loc']) or 'record'}: {error['msg']}" for error in e.errors()))
+
+    if data.problem_type not in PROBLEM_TYPES:
+        raise ValueError(f"problem_type must be one of {', '.join(PROBLEM_TYPES)}")
+    if data.problem_type == "coding" and not data.language:
+        raise ValueError("language is required for coding problems")
+    if data.problem_type == "sql":
+        if not data.sql_schema:
+            raise ValueError("sql_schema is required for SQL problems")
+        for index, tc in enumerate(data.test_cases or []):
+            if tc.expected_result is None:
+                continue
+            try:
+                json.loads(tc.expected_result)
+            except ValueError as e:
+                raise ValueError(f"test_cases.{index}.expected_result is not valid JSON: {e}")
+    dataset = data.sql_performance.dataset if data.sql_performance else None
+    if dataset:
+        try:
+            validate_spec(dataset, data.sql_schema or "")
+        except DatasetSpecError as e:
+            raise ValueError(f"Invalid dataset spec: {e}")
+    return data
+
+
+def _assignment_row(data: AssignmentCreate) -> Dict[str, Any]:
+    return {
+        "title": data.title,
+        "description": data.description,
+        "domain": data.domain,
+        "difficulty": data.difficulty,
+        "problem_type": data.problem_type,
+        "language": data.language,
+        "test_input": data.test_input,
+        "expected_output": data.expected_output,
+        "sql_schema": data.sql_schema,
+        "sql_query": data.sql_query,
+        "sql_verification": data.sql_verification,
+    }
+
+
+def insert_chunk(db: Session, chunk: List[AssignmentCreate]) -> Tuple[List[int], int]:
+    """
+    Insert a chunk of validated assignments with multi-row INSERTs; the caller
+    commits. Returns the new assignment ids (in chunk order) and the number of
+    test cases inserted.
+    """
+    assignment_ids = list(db.scalars(
+        insert(Assignment).returning(Assignment.id, sort_by_parameter_order=True),
+        [_assignment_row(data) for data in chunk]
+    ))
+
+    test_case_rows = []
+    seeds = []  # (index in test_case_rows, TestCaseInput) of the test cases with a dataset
+    limit_rows = []
+    performance_rows = []
+    spec_rows = []
+    counter_rows = [{"assignment_id": assignment_id} for assignment_id in assignment_ids]
+    for assignment_id, data in zip(assignment_ids, chunk):
+        for tc in data.test_cases or []:
+            if tc.seed_sql:
+                seeds.append((len(test_case_rows), tc))
+            test_case_rows.append({
+                "assignment_id": assignment_id,
+                "input": tc.input,
+                "expected_output": tc.expected_output,
+                "sql_query": tc.sql_query,
+                "expected_result": tc.expected_result,
+                "hidden": tc.hidden,
+            })
+        if data.sql_limits:
+            limit_rows.append({"assignment_id": assignment_id, **data.sql_limits.model_dump()})
+        if data.sql_performance:
+            performance_rows.append({"assignment_id": assignment_id, **data.sql_performance.model_dump(exclude={"dataset"})})
+            if data.sql_performance.dataset:
+                spec_rows.append({"assignment_id": assignment_id, "spec": json.dumps(data.sql_performance.dataset)})
+
+    if test_case_rows:
+        if seeds:
+            # Dataset rows reference their test case, so these ids are needed
+            test_case_ids = list(db.scalars(insert(TestCase).returning(TestCase.id, sort_by_parameter_order=True), test_case_rows))
+            db.execute(insert(TestCaseDataset), [
+                {"testcase_id": test_case_ids[index], "name": tc.dataset_name, "seed_sql": tc.seed_sql}
+                for index, tc in seeds
+            ])
+        else:
+            db.execute(insert(TestCase), test_case_rows)
+    for model, rows in ((SQLLimits, limit_rows), (SQLPerformance, performance_rows), (SQLDatasetSpec, spec_rows), (SubmissionCounters, counter_rows)):
+        if rows:
+            db.execute(insert(model), rows)
+
+    return assignment_ids, len(test_case_rows)
+
+
+def import_assignments(db: Session, stream: IO[bytes], filename: str = "upload.jsonl", chunk_size: int = IMPORT_CHUNK_SIZE, dry_run: bool = False) -> Dict[str, Any]:
+    """
+    Validate and import every record of a JSON Lines or zip stream
+
+    Returns a report: imported/invalid/failed counts, the new assignment ids,
+    the number of test cases, and the errors as {"source", "line", "error"}
+    (a chunk whose transaction failed is reported once, at its first line).
+    With dry_run nothing is written.
+
+    Raises:
+        AssignmentImportError: the stream is not a readable JSONL or zip file
+    """
+    chunk_size = max(1, chunk_size)
+    report: Dict[str, Any] = {
+        "imported": 0, "invalid": 0, "failed": 0, "test_cases": 0,
+        "chunks": 0, "dry_run": dry_run, "assignment_ids": [], "errors": [],
+    }
+
+    def add_error(source: str, line: int, message: str):
+        if len(report["errors"]) < IMPORT_MAX_REPORTED_ERRORS:
+            report["errors"].append({"source": source, "line": line, "error": message})
+
+    chunk: List[AssignmentCreate] = []
+    chunk_start: Optional[Tuple[str, int]] = None
+
+    def flush():
+        if not chunk:
+            return
+        if dry_run:
+            report["imported"] += len(chunk)
+            report["test_cases"] += sum(len(data.test_cases or []) for data in chunk)
+            chunk.clear()
+            return
+        try:
+            assignment_ids, test_cases = insert_chunk(db, chunk)
+            db.commit()
+        except SQLAlchemyError as e:
+            db.rollback()
+            report["failed"] += len(chunk)
+            add_error(chunk_start[0], chunk_start[1], f"Chunk of {len(chunk)} assignments not imported: {str(e).splitlines()[0]}")
+            chunk.clear()
+            return
+
+        report["chunks"] += 1
+        report["imported"] += len(assignment_ids)
+        report["test_cases"] += test_cases
+        report["assignment_ids"].extend(assignment_ids)
+        for assignment_id, data in zip(assignment_ids, chunk):
+            assignment_cache.invalidate(assignment_id)
+            if data.sql_performance and data.sql_performance.dataset:
+                prebuild_dataset(data.sql_schema, data.sql_performance.dataset)
+        chunk.clear()
+
+    for source, line_no, record in iter_records(stream, filename):
+        try:
+            data = validate_record(record)
+        except ValueError as e:
+            report["invalid"] += 1
+            add_error(source, line_no, str(e))
+            continue
+        if not chunk:
+            chunk_start = (source, line_no)
+        chunk.append(data)
+        if len(chunk) >= chunk_size:
+            flush()
+    flush()
+    return report
+
+
+def import_file(db: Session, path: str, **options) -> Dict[str, Any]:
+    """import_assignments for a file on disk"""
+    with open(path, "rb") as stream:
+        return import_assignments(db, stream, os.path.basename(path), **options)
+
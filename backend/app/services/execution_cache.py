@@ -0,0 +1,204 @@
+"""
+Content-addressed cache of code execution results
+Runs are keyed by (backend, language, runtime version, hash(code),
+hash(stdin), limits), so resubmitted starter code and identical solutions
+reuse the earlier result instead of executing again. Entries are evicted
+LRU-first once the entry or byte budget is exceeded and expire after a TTL.
+Concurrent identical runs are deduplicated: the first caller executes and
+the others wait for its result (single flight).
+"""
+
+import copy
+import hashlib
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, List, Optional
+
+EXECUTION_CACHE_ENABLED = os.getenv("EXECUTION_CACHE_ENABLED", "true").lower() == "true"
+EXECUTION_CACHE_MAX_ENTRIES = int(os.getenv("EXECUTION_CACHE_MAX_ENTRIES", "10000"))
+EXECUTION_CACHE_MAX_BYTES = int(os.getenv("EXECUTION_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+EXECUTION_CACHE_TTL = float(os.getenv("EXECUTION_CACHE_TTL", "3600"))
+
+
+def _digest(text: str) -> str:
+    return hashlib.sha256((text or "").encode("utf-8")).hexdigest()
+
+
+def execution_key(backend: str, language: str, version: str, code: str, stdin: str, limits: Any) -> str:
+    """Cache key for one program run"""
+    return "|".join([
+        backend,
+        language.lower(),
+        str(version),
+        _digest(code),
+        _digest(stdin),
+        json.dumps(limits, sort_keys=True),
+    ])
+
+
+def is_program_outcome(result: Dict[str, Any], transient_errors: tuple) -> bool:
+    """
+    True when a result reflects the program itself rather than a failure to
+    run it (API errors, timeouts, crashed workers), which must not be cached.
+    """
+    return result.get('success') or not str(result.get('error') or '').startswith(transient_errors)
+
+
+class ExecutionCache:
+    """Thread-safe LRU + TTL cache with single-flight execution"""
+
+    def __init__(self, max_entries: int = EXECUTION_CACHE_MAX_ENTRIES, max_bytes: int = EXECUTION_CACHE_MAX_BYTES, ttl: float = EXECUTION_CACHE_TTL, enabled: bool = EXECUTION_CACHE_ENABLED):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.enabled = enabled
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()  # key -> (result, expires_at, size)
+        self._in_flight: Dict[str, Future] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.shared = 0  # callers that joined an identical in-flight run
+        self.evictions = 0
+
+    def _lookup(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return a fresh cached result (caller holds the lock)"""
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        result, expires_at, size = entry
+        if expires_at < time.monotonic():
+            del self._entries[key]
+            self._bytes -= size
+            return None
+        self._entries.move_to_end(key)
+        return result
+
+    def _store(self, key: str, result: Dict[str, Any]):
+        """Insert a result and evict down to the budgets (caller holds the lock)"""
+        size = len(json.dumps(result, default=str))
+        if size > self.max_bytes:
+            return
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self._bytes -= old[2]
+        self._entries[key] = (copy.deepcopy(result), time.monotonic() + self.ttl, size)
+        self._bytes += size
+        while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+            _, (_, _, evicted_size) = self._entries.popitem(last=False)
+            self._bytes -= evicted_size
+            self.evictions += 1
+
+    def _single_flight(self, key: str, execute: Callable[[], Any]) -> Any:
+        """Run `execute()` once for all concurrent callers using the same key"""
+        with self._lock:
+            future = self._in_flight.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._in_flight[key] = future
+            else:
+                self.shared += 1
+
+        if not owner:
+            return copy.deepcopy(future.result())
+
+        try:
+            result = execute()
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                del self._in_flight[key]
+
+    def get_or_execute(self, key: str, execute: Callable[[], Dict[str, Any]], cacheable: Callable[[Dict[str, Any]], bool]) -> Dict[str, Any]:
+        """
+        Return the cached result for `key`, or run `execute()` once for all
+        concurrent callers asking for the same key. Only results accepted by
+        `cacheable` (program outcomes, not transport failures) are stored.
+        """
+        if not self.enabled:
+            return execute()
+
+        with self._lock:
+            cached = self._lookup(key)
+            if cached is not None:
+                self.hits += 1
+                return copy.deepcopy(cached)
+            self.misses += 1
+
+        def run() -> Dict[str, Any]:
+            result = execute()
+            if cacheable(result):
+                with self._lock:
+                    self._store(key, result)
+            return result
+
+        return copy.deepcopy(self._single_flight(key, run))
+
+    def get_or_execute_many(self, keys: List[str], execute_many: Callable[[List[int]], List[Dict[str, Any]]], cacheable: Callable[[Dict[str, Any]], bool]) -> List[Dict[str, Any]]:
+        """
+        Batch variant of get_or_execute: cached entries are served directly and
+        `execute_many(indexes)` runs only the misses, deduplicated as one unit.
+        """
+        if not self.enabled:
+            return execute_many(list(range(len(keys))))
+
+        results: List[Optional[Dict[str, Any]]] = [None] * len(keys)
+        with self._lock:
+            for idx, key in enumerate(keys):
+                cached = self._lookup(key)
+                if cached is not None:
+                    self.hits += 1
+                    results[idx] = copy.deepcopy(cached)
+            missing = [idx for idx, result in enumerate(results) if result is None]
+            self.misses += len(missing)
+        if not missing:
+            return results
+
+        def run() -> List[Dict[str, Any]]:
+            fresh = execute_many(missing)
+            with self._lock:
+                for idx, result in zip(missing, fresh):
+                    if cacheable(result):
+                        self._store(keys[idx], result)
+            return fresh
+
+        batch_key = "batch|" + _digest("\n".join(keys[idx] for idx in missing))
+        for idx, result in zip(missing, copy.deepcopy(self._single_flight(batch_key, run))):
+            results[idx] = result
+        return results
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "ttl": self.ttl,
+                "hits": self.hits,
+                "misses": self.misses,
+                "shared_in_flight": self.shared,
+                "evictions": self.evictions,
+                "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+                "in_flight": len(self._in_flight),
+            }
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+
+execution_cache = ExecutionCache()
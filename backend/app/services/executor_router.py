@@ -0,0 +1,307 @@
+"""
+Health-aware routing of coding submissions across Judge0, Piston and local execution
+Each backend's latency percentiles, error rate and quota state are tracked
+from real gradings. A submission goes to the healthiest capable backend
+(in configured preference order) and automatically fails over to the next
+one when a backend cannot run it (API errors, rate limits, open circuit).
+With hedging enabled, a second backend is started when the first one is
+slower than its own p95 latency, and the first usable result wins.
+The local executor runs code unsandboxed on the API host, so in remote mode
+it is only used when EXECUTOR_LOCAL_FALLBACK is enabled.
+"""
+
+import os
+import shutil
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.config import settings
+from app.services.http_transport import get_transport
+from app.services.judge0_executor import Judge0Executor
+from app.services.local_executor import LocalCodeExecutor
+from app.services.piston_executor import PistonExecutor
+
+# Backend order per language; the router reorders by health within this list
+DEFAULT_ORDER = {
+    "remote": {"python": ["judge0"], "javascript": ["piston", "judge0"]},
+    "local": {"python": ["local"], "javascript": ["local"]},
+}
+EXECUTOR_ORDER_OVERRIDES = {
+    "python": os.getenv("EXECUTOR_ORDER_PYTHON", ""),
+    "javascript": os.getenv("EXECUTOR_ORDER_JAVASCRIPT", ""),
+}
+
+EXECUTOR_HEALTH_WINDOW = int(os.getenv("EXECUTOR_HEALTH_WINDOW", "200"))
+# Outcomes older than this are ignored, so a degraded backend gets retried
+EXECUTOR_HEALTH_MAX_AGE = float(os.getenv("EXECUTOR_HEALTH_MAX_AGE", "300"))
+EXECUTOR_MAX_ERROR_RATE = float(os.getenv("EXECUTOR_MAX_ERROR_RATE", "0.5"))
+EXECUTOR_QUOTA_COOLDOWN = float(os.getenv("EXECUTOR_QUOTA_COOLDOWN", "60"))
+EXECUTOR_HEDGE = os.getenv("EXECUTOR_HEDGE", "true").lower() == "true"
+EXECUTOR_HEDGE_MIN_DELAY = float(os.getenv("EXECUTOR_HEDGE_MIN_DELAY", "2.0"))
+EXECUTOR_HEDGE_MIN_SAMPLES = int(os.getenv("EXECUTOR_HEDGE_MIN_SAMPLES", "20"))
+
+# Errors meaning the backend could not run the submission at all
+UNAVAILABLE_ERRORS = {
+    "judge0": ("Judge0 API error", "No token received", "Failed to get result", "Execution timeout after",
+               "API timeout", "Execution error", "Judge0 rejected"),
+    "piston": ("Piston API error", "API timeout", "Execution error"),
+    "local": ("Execution error", "Harness exited"),
+}
+
+
+class BackendHealth:
+    """Rolling window of grading outcomes for one backend"""
+
+    def __init__(self, window: int = EXECUTOR_HEALTH_WINDOW):
+        self._samples: "deque[Tuple[float, float, bool]]" = deque(maxlen=window)  # (recorded_at, latency, ok)
+        self.quota_exhausted_until = 0.0
+        self._lock = threading.Lock()
+
+    def record(self, latency: float, ok: bool, quota_exhausted: bool = False):
+        with self._lock:
+            self._samples.append((time.monotonic(), latency, ok))
+            if quota_exhausted:
+                self.quota_exhausted_until = time.monotonic() + EXECUTOR_QUOTA_COOLDOWN
+
+    @property
+    def quota_exhausted(self) -> bool:
+        return time.monotonic() < self.quota_exhausted_until
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            cutoff = time.monotonic() - EXECUTOR_HEALTH_MAX_AGE
+            samples = [(latency, ok) for recorded_at, latency, ok in self._samples if recorded_at >= cutoff]
+        latencies = sorted(latency for latency, ok in samples if ok)
+
+        def percentile(p: float) -> Optional[float]:
+            if not latencies:
+                return None
+            return round(latencies[min(len(latencies) - 1, int(p * len(latencies)))], 4)
+
+        errors = sum(1 for _, ok in samples if not ok)
+        return {
+            "samples": len(samples),
+            "successful_samples": len(latencies),
+            "error_rate": round(errors / len(samples), 4) if samples else 0.0,
+            "p50": percentile(0.50),
+            "p95": percentile(0.95),
+            "p99": percentile(0.99),
+            "quota_exhausted": self.quota_exhausted,
+        }
+
+
+class _ResultStream:
+    """
+    Forward each test result to on_result once. The first backend to stream
+    a result owns the stream: results of a racing (hedged) attempt are not
+    streamed, so callers never see two backends' results mixed, and nothing
+    is forwarded once the stream is closed.
+    """
+
+    def __init__(self, on_result: Optional[Callable[[Dict[str, Any]], None]], unavailable: Callable[[str, Optional[str]], bool]):
+        self.on_result = on_result
+        self.unavailable = unavailable
+        self.owner: Optional[str] = None
+        self._sent = set()
+        self._closed = False
+        self._lock = threading.Lock()
+
+    def claim(self, backend: str) -> bool:
+        """Whether backend's result may be returned without contradicting streamed results"""
+        if not self.on_result:
+            return True
+        with self._lock:
+            if self.owner is None:
+                self.owner = backend
+            return self.owner == backend
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+
+    def forward(self, backend: str, result: Dict[str, Any], final: bool = False):
+        if not self.on_result:
+            return
+        # Backend failures are not streamed live: another backend may still grade that test
+        if not final and self.unavailable(backend, result.get('error')):
+            return
+        with self._lock:
+            if self._closed or result.get('test_id') in self._sent:
+                return
+            if not final:
+                if self.owner is None:
+                    self.owner = backend
+                elif self.owner != backend:
+                    return
+            self._sent.add(result.get('test_id'))
+        self.on_result(result)
+
+
+class ExecutorRouter:
+    """Registry of execution backends with health-based routing and failover"""
+
+    def __init__(self):
+        self.health = {name: BackendHealth() for name in UNAVAILABLE_ERRORS}
+        self._attempts = ThreadPoolExecutor(max_workers=int(os.getenv("EXECUTOR_ROUTER_THREADS", "32")), thread_name_prefix="executor")
+
+    # Backends
+
+    @staticmethod
+    def _capable(name: str, language: str) -> bool:
+        if name == "judge0":
+            return language in ("python", "javascript")
+        if name == "piston":
+            return language == "javascript"
+        if name == "local":
+            return shutil.which("node" if language == "javascript" else "python") is not None
+        return False
+
+    @staticmethod
+    def _run(name: str, language: str, user_code: str, test_cases: List[Dict[str, str]], on_result) -> Dict[str, Any]:
+        if name == "judge0":
+            return Judge0Executor.execute_coding_problem(language=language, user_code=user_code, test_cases=test_cases, on_result=on_result)
+        if name == "piston":
+            return PistonExecutor.execute_coding_problem(user_code=user_code, test_cases=test_cases, on_result=on_result)
+        return LocalCodeExecutor.execute_coding_problem(language=language, user_code=user_code, test_cases=test_cases, on_result=on_result)
+
+    @staticmethod
+    def _unavailable(name: str, error: Optional[str]) -> bool:
+        return str(error or '').startswith(UNAVAILABLE_ERRORS[name])
+
+    def _available(self, name: str) -> bool:
+        if self.health[name].quota_exhausted:
+            return False
+        if name in ("judge0", "piston") and get_transport(name).breaker.state == "open":
+            return False
+        return True
+
+    def candidates(self, language: str) -> List[str]:
+        """Capable backends for a language, healthiest first within the configured order"""
+        override = EXECUTOR_ORDER_OVERRIDES.get(language)
+        if override:
+            order = [name.strip() for name in override.split(",") if name.strip() in UNAVAILABLE_ERRORS]
+        else:
+            order = DEFAULT_ORDER.get(settings.CODE_EXECUTOR, DEFAULT_ORDER["remote"]).get(language, [])
+        if settings.CODE_EXECUTOR != "local" and not settings.EXECUTOR_LOCAL_FALLBACK:
+            # Also applies to overrides: untrusted code never runs on this host by accident
+            order = [name for name in order if name != "local"]
+        capable = [name for name in order if self._capable(name, language)]
+
+        def rank(name: str):
+            stats = self.health[name].snapshot()
+            degraded = not self._available(name) or stats["error_rate"] > EXECUTOR_MAX_ERROR_RATE
+            # Keep configured order among healthy backends; unhealthy ones go last
+            return (degraded, capable.index(name))
+
+        return sorted(capable, key=rank)
+
+    def _hedge_delay(self, name: str) -> Optional[float]:
+        stats = self.health[name].snapshot()
+        if stats["successful_samples"] < EXECUTOR_HEDGE_MIN_SAMPLES or stats["p95"] is None:
+            return None
+        return max(EXECUTOR_HEDGE_MIN_DELAY, stats["p95"])
+
+    # Grading
+
+    def _attempt(self, name: str, language: str, user_code: str, test_cases: List[Dict[str, str]], stream: _ResultStream) -> Tuple[Dict[str, Any], bool]:
+        """Grade on one backend and record its health; returns (result, usable)"""
+        start = time.monotonic()
+        try:
+            result = self._run(name, language, user_code, test_cases, lambda r: stream.forward(name, r))
+        except Exception as e:
+            result = {
+                'success': False,
+                'total_tests': len(test_cases),
+                'passed_tests': 0,
+                'results': [],
+                'code_error': f"Execution error: {str(e)}"
+            }
+        errors = [r.get('error') for r in result.get('results', [])]
+        if not result.get('results'):
+            errors.append(result.get('code_error'))
+        failures = [error for error in errors if self._unavailable(name, error)]
+        quota_exhausted = any(" 429" in error for error in failures)
+        usable = not failures
+        self.health[name].record(time.monotonic() - start, usable, quota_exhausted)
+        return result, usable
+
+    def grade(self, language: str, user_code: str, test_cases: List[Dict[str, str]], on_result: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        """
+        Grade a coding submission on the best available backend
+
+        Returns:
+            Same shape as Judge0Executor.execute_coding_problem, or
+            {'success': False, 'error': str} when no backend supports the language
+        """
+        language_key = language.lower()
+        remaining = self.candidates(language_key)
+        if not remaining:
+            return {"success": False, "error": f"Unsupported language: {language}"}
+
+        stream = _ResultStream(on_result, self._unavailable)
+        pending = {}
+        last = None
+        held = None  # usable result of an attempt that lost the stream to a still-running one
+
+        def launch():
+            name = remaining.pop(0)
+            future = self._attempts.submit(self._attempt, name, language_key, user_code, test_cases, stream)
+            pending[future] = name
+
+        def finish(name: str, result: Dict[str, Any]) -> Dict[str, Any]:
+            for test_result in result.get('results', []):
+                stream.forward(name, test_result, final=True)
+            # Attempts still running are abandoned: drop queued ones, silence the rest
+            stream.close()
+            for future in pending:
+                future.cancel()
+            return result
+
+        launch()
+        hedged = False
+        while pending:
+            hedge_after = None
+            if EXECUTOR_HEDGE and remaining and not hedged and len(pending) == 1:
+                hedge_after = self._hedge_delay(next(iter(pending.values())))
+
+            done, _ = wait(list(pending), timeout=hedge_after, return_when=FIRST_COMPLETED)
+            if not done:
+                # Slow tail: race the next backend against the current one
+                hedged = True
+                launch()
+                continue
+
+            for future in done:
+                name = pending.pop(future)
+                result, usable = future.result()
+                if usable and stream.claim(name):
+                    return finish(name, result)
+                if usable:
+                    held = (name, result)
+                else:
+                    last = (name, result)
+
+            if held and not any(stream.claim(name) for name in pending.values()):
+                # The attempt that streamed results failed; the held result is the best left
+                return finish(*held)
+            if not pending and remaining:
+                launch()
+
+        return finish(*(held or last))
+
+    def health_snapshot(self) -> Dict[str, Any]:
+        snapshot = {}
+        for name, health in self.health.items():
+            stats = health.snapshot()
+            if name in ("judge0", "piston"):
+                stats["circuit"] = get_transport(name).breaker.state
+            stats["available"] = self._available(name)
+            snapshot[name] = stats
+        snapshot["routes"] = {language: self.candidates(language) for language in ("python", "javascript")}
+        return snapshot
+
+
+executor_router = ExecutorRouter()
@@ -0,0 +1,285 @@
+"""
+Grading entry points shared by the submit endpoints and background grading
+jobs. The executors block (HTTP calls, SQL worker processes), so the async
+submit endpoints call the *_async variants, which run them on a dedicated
+bounded thread limiter instead of the event loop.
+"""
+import os
+import shutil
+import subprocess
+import traceback
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional
+
+import anyio
+
+from sqlalchemy.exc import IntegrityError
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.testcase_stats import TestCaseStats
+from app.services.executor_router import executor_router
+from app.services.sql_executor import execute_sql_problem
+from app.services.sql_pool import get_sql_grading_pool
+
+# Test cases per fail-fast wave grow by this factor (1, 2, 4, ...)
+GRADING_WAVE_GROWTH = int(os.getenv("GRADING_WAVE_GROWTH", "2"))
+
+# Blocking gradings the async endpoints run at once; further requests wait on the event loop
+GRADING_CONCURRENCY = int(os.getenv("GRADING_CONCURRENCY", "64"))
+
+# Parses (without running) a program read from stdin the way Node's CommonJS loader wraps it
+JS_SYNTAX_CHECK = (
+    "const vm = require('vm'); let source = '';"
+    "process.stdin.on('data', chunk => source += chunk).on('end', () => {"
+    " try { new vm.Script('(function (exports, require, module, __filename, __dirname) {' + source + '\\n})', {filename: 'main.js'}); }"
+    " catch (e) { process.stdout.write(String(e.stack || e)); process.exitCode = 1; } });"
+)
+JS_SYNTAX_CHECK_TIMEOUT = 10
+
+
+def syntax_error(language: str, user_code: str) -> Optional[str]:
+    """
+    The submission's compile/syntax error, found by parsing it without running
+    it: compile() for Python, vm.Script for JavaScript. None when it parses,
+    or when it cannot be checked here (no node binary)
+    """
+    if language == "python":
+        try:
+            compile(user_code, "main.py", "exec")
+        except (SyntaxError, ValueError) as e:
+            return "".join(traceback.format_exception_only(type(e), e))
+        except (RecursionError, MemoryError):
+            # Too deeply nested to parse here; the executor will report it
+            return None
+        return None
+    if language == "javascript" and shutil.which("node"):
+        try:
+            check = subprocess.run(["node", "-e", JS_SYNTAX_CHECK], input=user_code, capture_output=True, text=True, encoding="utf-8", timeout=JS_SYNTAX_CHECK_TIMEOUT)
+        except (OSError, subprocess.TimeoutExpired):
+            return None
+        if check.returncode != 0 and check.stdout.startswith("main.js"):
+            return check.stdout
+    return None
+
+
+def order_by_failure_rate(assignment_id: int, test_cases: List[Dict[str, Any]]) -> List[int]:
+    """
+    Indexes of `test_cases` ordered by historical failure rate, most likely
+    to fail first. Rates are smoothed so unseen test cases rank in the middle;
+    ties keep the stored order.
+    """
+    ids = [tc.get('id') for tc in test_cases if tc.get('id') is not None]
+    if not ids:
+        return list(range(len(test_cases)))
+
+    db = SessionLocal()
+    try:
+        stats = {
+            row.testcase_id: (row.failures + 1) / (row.runs + 2)
+            for row in db.query(TestCaseStats).filter(TestCaseStats.testcase_id.in_(ids))
+        }
+    finally:
+        db.close()
+
+    return sorted(range(len(test_cases)), key=lambda idx: -stats.get(test_cases[idx].get('id'), 0.5))
+
+
+def record_test_outcomes(assignment_id: int, test_cases: List[Dict[str, Any]], results: List[Dict[str, Any]]):
+    """Add graded (not skipped) test results to the per test case history"""
+    passed, failed = [], []
+    for test_case, result in zip(test_cases, results):
+        if test_case.get('id') is None or result.get('skipped'):
+            continue
+        (passed if result['passed'] else failed).append(test_case['id'])
+    if not passed and not failed:
+        return
+
+    db = SessionLocal()
+    try:
+        existing = {
+            row.testcase_id for row in
+            db.query(TestCaseStats.testcase_id).filter(TestCaseStats.testcase_id.in_(passed + failed))
+        }
+        missing = [tc_id for tc_id in passed + failed if tc_id not in existing]
+        if missing:
+            db.add_all([TestCaseStats(testcase_id=tc_id, assignment_id=assignment_id, runs=0, failures=0) for tc_id in missing])
+            try:
+                db.commit()
+            except IntegrityError:
+                # Created concurrently by another grading run
+                db.rollback()
+
+        if passed:
+            db.query(TestCaseStats).filter(TestCaseStats.testcase_id.in_(passed)).update(
+                {TestCaseStats.runs: TestCaseStats.runs + 1}, synchronize_session=False)
+        if failed:
+            db.query(TestCaseStats).filter(TestCaseStats.testcase_id.in_(failed)).update(
+                {TestCaseStats.runs: TestCaseStats.runs + 1, TestCaseStats.failures: TestCaseStats.failures + 1},
+                synchronize_session=False)
+        db.commit()
+    finally:
+        db.close()
+
+
+def _waves(count: int, fail_fast: str) -> List[int]:
+    """Sizes of the groups of test cases run one after another"""
+    if fail_fast == "first_failure":
+        sizes, size = [], 1
+        while count > 0:
+            sizes.append(min(size, count))
+            count -= size
+            size *= GRADING_WAVE_GROWTH
+        return sizes
+    return [count]
+
+
+def grade_code_submission(language: str, user_code: str, test_cases: List[Dict[str, Any]], on_result: Optional[Callable[[Dict[str, Any]], None]] = None, fail_fast: Optional[str] = None, assignment_id: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Run a coding submission against its test cases on the healthiest executor
+    (Judge0, Piston or local), failing over when a backend is unavailable
+
+    With fail-fast enabled ("compile" or "first_failure") the code is parsed
+    first and a syntax error is reported for every test case, marked
+    'skipped': True, without running any. "first_failure" then runs the tests
+    in exponentially growing waves and stops after the wave containing the
+    first failed test (or an executor-reported compile error). When
+    `assignment_id` is also given, those waves run the tests in order of
+    historical failure rate and record their outcomes; the other modes run
+    every test, so they neither read nor write the history.
+
+    Args:
+        language: Assignment language ('python' or 'javascript')
+        user_code: User's submitted code
+        test_cases: List of test cases with 'input', 'expected_output' and optionally 'id'
+        on_result: Called with each test result as soon as it is known
+        fail_fast: 'off', 'compile' or 'first_failure' (default GRADING_FAIL_FAST)
+        assignment_id: Assignment whose test case history orders and records "first_failure" runs
+
+    Returns:
+        Same shape as Judge0Executor.execute_coding_problem (results in the
+        original test case order), or {'success': False, 'error': str} for
+        unsupported languages
+    """
+    fail_fast = fail_fast or settings.GRADING_FAIL_FAST
+    use_history = assignment_id is not None and fail_fast == "first_failure"
+    if use_history:
+        order = order_by_failure_rate(assignment_id, test_cases)
+    else:
+        order = list(range(len(test_cases)))
+
+    results: List[Optional[Dict[str, Any]]] = [None] * len(test_cases)
+    stop_error = syntax_error(language.lower(), user_code) if fail_fast != "off" else None
+    position = 0
+    for size in _waves(len(test_cases), fail_fast) if stop_error is None else []:
+        wave = order[position:position + size]
+        position += size
+
+        def forward(result: Dict[str, Any], wave=wave):
+            # Map the wave-local test id back to the test case's position
+            result = dict(result, test_id=wave[result['test_id'] - 1] + 1)
+            results[result['test_id'] - 1] = result
+            if on_result:
+                on_result(result)
+
+        outcome = executor_router.grade(language, user_code, [test_cases[idx] for idx in wave], on_result=forward)
+        if 'results' not in outcome:
+            return outcome
+        # Fill in anything the executor did not report through on_result
+        for result in outcome['results']:
+            idx = wave[result['test_id'] - 1]
+            if results[idx] is None:
+                forward(result)
+
+        wave_results = [results[idx] for idx in wave]
+        # Judge0 status 6 / Piston compile stage; a runtime SyntaxError (JSON.parse, eval) is an ordinary failure
+        compile_errors = [r['error'] for r in wave_results if r.get('compile_error')]
+        if fail_fast != "off" and compile_errors:
+            stop_error = compile_errors[0]
+            break
+        if fail_fast == "first_failure" and not all(r['passed'] for r in wave_results):
+            break
+
+    # Report the test cases that were never run
+    for idx in order[position:]:
+        results[idx] = {
+            'test_id': idx + 1,
+            'input': test_cases[idx].get('input', ''),
+            'expected_output': test_cases[idx].get('expected_output', '').strip(),
+            'actual_output': '',
+            'passed': False,
+            'error': stop_error,
+            'compile_error': stop_error is not None,
+            'skipped': True
+        }
+        if on_result:
+            on_result(results[idx])
+
+    if use_history and stop_error is None:
+        record_test_outcomes(assignment_id, test_cases, results)
+
+    passed_count = sum(1 for r in results if r['passed'])
+    first = results[0] if results else None
+    code_error = stop_error or (first['error'] if first and not first.get('skipped') else None)
+    return {
+        'success': passed_count == len(test_cases),
+        'total_tests': len(test_cases),
+        'passed_tests': passed_count,
+        'results': results,
+        'code_error': code_error
+    }
+
+
+def grade_sql_submission(schema_sql: str, user_query: str, test_cases: List[Dict[str, Any]], on_result: Optional[Callable[[Dict[str, Any]], None]] = None, limits: Optional[Dict[str, int]] = None, performance: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Grade a SQL submission in the SQL grading process pool (inline when the
+    pool is disabled). Same arguments and result as execute_sql_problem.
+
+    Raises:
+        SQLPoolBusy: the grading queue stayed full
+    """
+    pool = get_sql_grading_pool()
+    if pool is None:
+        return execute_sql_problem(schema_sql, user_query, test_cases, on_result=on_result, limits=limits, performance=performance)
+
+    result = pool.grade(schema_sql, user_query, test_cases, limits=limits, performance=performance)
+    # Results cannot be streamed out of the worker process; report them once grading is done
+    if on_result:
+        for test_result in result['results']:
+            on_result(test_result)
+    return result
+
+
+_grading_limiter: Optional[anyio.CapacityLimiter] = None
+
+
+def _limiter() -> anyio.CapacityLimiter:
+    # Created on first use, inside the running event loop
+    global _grading_limiter
+    if _grading_limiter is None:
+        _grading_limiter = anyio.CapacityLimiter(GRADING_CONCURRENCY)
+    return _grading_limiter
+
+
+async def run_blocking(func: Callable[..., Any], *args, **kwargs) -> Any:
+    """
+    Run a blocking grading call in a worker thread, at most
+    GRADING_CONCURRENCY at a time, so gradings neither block the event loop
+    nor exhaust the thread pool that serves the other endpoints
+    """
+    return await anyio.to_thread.run_sync(partial(func, *args, **kwargs), limiter=_limiter())
+
+
+async def grade_code_submission_async(language: str, user_code: str, test_cases: List[Dict[str, Any]], fail_fast: Optional[str] = None, assignment_id: Optional[int] = None) -> Dict[str, Any]:
+    """grade_code_submission for async endpoints"""
+    return await run_blocking(grade_code_submission, language, user_code, test_cases, fail_fast=fail_fast, assignment_id=assignment_id)
+
+
+async def grade_sql_submission_async(schema_sql: str, user_query: str, test_cases: List[Dict[str, Any]], limits: Optional[Dict[str, int]] = None, performance: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    grade_sql_submission for async endpoints
+
+    Raises:
+        SQLPoolBusy: the grading queue stayed full
+    """
+    return await run_blocking(grade_sql_submission, schema_sql, user_query, test_cases, limits=limits, performance=performance)
@@ -0,0 +1,137 @@
+"""
+Background grading jobs
+Submissions are queued on a worker pool so the HTTP request returns a job
+id immediately. Each job records an append-only event log (status changes
+and individual test results) that clients read via GET /jobs/{id} or the
+/jobs/{id}/events stream. At most GRADING_WORKERS + GRADING_JOB_QUEUE jobs
+are queued or running at once; further submissions are refused.
+"""
+
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, List, Optional
+
+GRADING_WORKERS = int(os.getenv("GRADING_WORKERS", "16"))
+# Jobs that may wait for a worker
+GRADING_JOB_QUEUE = int(os.getenv("GRADING_JOB_QUEUE", str(4 * GRADING_WORKERS)))
+# Finished jobs are forgotten after this many seconds
+GRADING_JOB_RETENTION = int(os.getenv("GRADING_JOB_RETENTION", "3600"))
+
+
+class GradingQueueFull(Exception):
+    """Raised when GRADING_WORKERS + GRADING_JOB_QUEUE jobs are already queued or running"""
+
+
+class GradingJob:
+    """State and event log of a single grading run"""
+
+    def __init__(self, kind: str, assignment_id: int):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.assignment_id = assignment_id
+        self.status = "queued"  # queued / running / completed / failed
+        self.result: Optional[Dict[str, Any]] = None
+        self.error: Optional[str] = None
+        self.created_at = time.time()
+        self.finished_at: Optional[float] = None
+        self.events: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    @property
+    def done(self) -> bool:
+        return self.status in ("completed", "failed")
+
+    def publish(self, event: str, data: Any):
+        with self._lock:
+            self.events.append({"event": event, "data": data})
+
+    def set_status(self, status: str):
+        self.status = status
+        if self.done:
+            self.finished_at = time.time()
+        self.publish("status", {"status": status})
+
+    def events_since(self, index: int) -> List[Dict[str, Any]]:
+        with self._lock:
+            return self.events[index:]
+
+    def to_dict(self) -> Dict[str, Any]:
+        with self._lock:
+            test_results = [e["data"] for e in self.events if e["event"] == "test_result"]
+        return {
+            "job_id": self.id,
+            "kind": self.kind,
+            "assignment_id": self.assignment_id,
+            "status": self.status,
+            "test_results": test_results,
+            "result": self.result,
+            "error": self.error,
+        }
+
+
+class GradingJobManager:
+    """Runs grading functions on a thread pool and keeps their jobs addressable by id"""
+
+    def __init__(self, workers: int = GRADING_WORKERS, retention: int = GRADING_JOB_RETENTION, queue_size: int = GRADING_JOB_QUEUE):
+        self.retention = retention
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="grading")
+        # The executor's own queue is unbounded
+        self._slots = threading.BoundedSemaphore(workers + queue_size)
+        self._jobs: Dict[str, GradingJob] = {}
+        self._lock = threading.Lock()
+
+    def submit(self, kind: str, assignment_id: int, grade: Callable[..., Dict[str, Any]], **kwargs) -> GradingJob:
+        """
+        Queue `grade(**kwargs, on_result=...)` and return its job
+
+        `grade` must accept an on_result callback; every test result it reports
+        is published as a "test_result" event.
+
+        Raises:
+            GradingQueueFull: too many jobs are queued or running
+        """
+        if not self._slots.acquire(blocking=False):
+            raise GradingQueueFull("Grading queue is full")
+        job = GradingJob(kind, assignment_id)
+        job.publish("status", {"status": job.status})
+        with self._lock:
+            self._prune()
+            self._jobs[job.id] = job
+        try:
+            self._executor.submit(self._run, job, grade, kwargs)
+        except Exception:
+            self._slots.release()
+            raise
+        return job
+
+    def get(self, job_id: str) -> Optional[GradingJob]:
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _run(self, job: GradingJob, grade: Callable[..., Dict[str, Any]], kwargs: Dict[str, Any]):
+        job.set_status("running")
+        try:
+            job.result = grade(**kwargs, on_result=lambda result: job.publish("test_result", result))
+            job.publish("result", job.result)
+            job.set_status("completed")
+        except Exception as e:
+            job.error = f"Grading failed: {str(e)}"
+            job.publish("error", {"error": job.error})
+            job.set_status("failed")
+        finally:
+            self._slots.release()
+
+    def _prune(self):
+        cutoff = time.time() - self.retention
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.finished_at is not None and job.finished_at < cutoff
+        ]
+        for job_id in expired:
+            del self._jobs[job_id]
+
+
+grading_jobs = GradingJobManager()
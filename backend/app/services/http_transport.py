@@ -0,0 +1,170 @@
+"""
+Shared HTTP transport for the remote executors (Judge0, Piston)
+One pooled requests.Session per backend keeps TCP/TLS connections alive
+between submits and polls. Idempotent requests are retried with jittered
+exponential backoff on connection errors, timeouts, 429 and 5xx; a POST is
+only retried when it never reached the backend (connect-phase errors), so a
+submission is not created twice. A per-backend circuit breaker fails fast
+while a backend keeps failing.
+"""
+
+import os
+import random
+import threading
+import time
+from typing import Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.exceptions import ConnectTimeoutError
+
+HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "32"))
+HTTP_MAX_RETRIES = int(os.getenv("HTTP_MAX_RETRIES", "2"))
+HTTP_RETRY_BACKOFF = float(os.getenv("HTTP_RETRY_BACKOFF", "0.2"))
+HTTP_RETRY_BACKOFF_MAX = float(os.getenv("HTTP_RETRY_BACKOFF_MAX", "2.0"))
+HTTP_BREAKER_THRESHOLD = int(os.getenv("HTTP_BREAKER_THRESHOLD", "5"))
+HTTP_BREAKER_RESET = float(os.getenv("HTTP_BREAKER_RESET", "30"))
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+IDEMPOTENT_METHODS = {"GET", "HEAD", "OPTIONS", "PUT", "DELETE"}
+
+
+class CircuitOpenError(Exception):
+    """Raised instead of sending a request while a backend's circuit is open"""
+
+
+class CircuitBreaker:
+    """
+    Opens after `failure_threshold` consecutive failures; after `reset_timeout`
+    seconds a single trial request is let through (half-open) and its outcome
+    closes or re-opens the circuit.
+    """
+
+    def __init__(self, failure_threshold: int = HTTP_BREAKER_THRESHOLD, reset_timeout: float = HTTP_BREAKER_RESET):
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        with self._lock:
+            if self.opened_at is None:
+                return "closed"
+            if time.monotonic() - self.opened_at >= self.reset_timeout:
+                return "half-open"
+            return "open"
+
+    def allow_request(self) -> bool:
+        with self._lock:
+            if self.opened_at is None:
+                return True
+            if time.monotonic() - self.opened_at < self.reset_timeout or self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+            return True
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self._trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            if self._trial_in_flight or self.failures >= self.failure_threshold:
+                self.opened_at = time.monotonic()
+            self._trial_in_flight = False
+
+
+def _not_sent(error: requests.RequestException) -> bool:
+    """Whether the request failed before reaching the backend (DNS, refused or timed-out connect)"""
+    if isinstance(error, requests.ConnectTimeout):
+        return True
+    reason = getattr(error.args[0], "reason", None) if error.args else None
+    # urllib3's NewConnectionError / NameResolutionError subclass ConnectTimeoutError
+    return isinstance(reason, ConnectTimeoutError)
+
+
+class PooledTransport:
+    """Keep-alive session with retries and a circuit breaker for one backend"""
+
+    def __init__(self, name: str, pool_size: int = HTTP_POOL_SIZE, max_retries: int = HTTP_MAX_RETRIES):
+        self.name = name
+        self.max_retries = max_retries
+        self.breaker = CircuitBreaker()
+        self.session = requests.Session()
+        # Retries are handled below so that they also feed the circuit breaker
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+
+    def _backoff(self, attempt: int, response: Optional[requests.Response] = None) -> float:
+        retry_after = response.headers.get("Retry-After") if response is not None else None
+        if retry_after and retry_after.isdigit():
+            return min(float(retry_after), HTTP_RETRY_BACKOFF_MAX)
+        # Full jitter: uniform between 0 and the exponential cap
+        return random.uniform(0, min(HTTP_RETRY_BACKOFF * (2 ** attempt), HTTP_RETRY_BACKOFF_MAX))
+
+    def request(self, method: str, url: str, **kwargs) -> requests.Response:
+        """
+        Send a request through the pooled session
+
+        Raises:
+            CircuitOpenError: the backend's circuit is open
+            requests.RequestException: the last attempt failed at the transport level
+        """
+        if not self.breaker.allow_request():
+            raise CircuitOpenError(f"{self.name} is unavailable (circuit open)")
+
+        failed = True
+        try:
+            response = self._send(method, url, **kwargs)
+            failed = response.status_code in RETRY_STATUSES
+            return response
+        finally:
+            # Any exception (e.g. ChunkedEncodingError) counts, so a half-open trial always ends
+            if failed:
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_success()
+
+    def _send(self, method: str, url: str, **kwargs) -> requests.Response:
+        idempotent = method.upper() in IDEMPOTENT_METHODS
+        attempt = 0
+        while True:
+            try:
+                response = self.session.request(method, url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as e:
+                if attempt >= self.max_retries or not (idempotent or _not_sent(e)):
+                    raise
+                time.sleep(self._backoff(attempt))
+                attempt += 1
+                continue
+
+            if idempotent and response.status_code in RETRY_STATUSES and attempt < self.max_retries:
+                time.sleep(self._backoff(attempt, response))
+                attempt += 1
+                continue
+            return response
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        return self.request("GET", url, **kwargs)
+
+    def post(self, url: str, **kwargs) -> requests.Response:
+        return self.request("POST", url, **kwargs)
+
+
+_transports: Dict[str, PooledTransport] = {}
+_transports_lock = threading.Lock()
+
+
+def get_transport(name: str) -> PooledTransport:
+    """Return the process-wide transport for a backend, creating it on first use"""
+    with _transports_lock:
+        if name not in _transports:
+            _transports[name] = PooledTransport(name)
+        return _transports[name]
@@ -0,0 +1,250 @@
+/*
+ * Batch harness for LocalCodeExecutor.execute_batch (JavaScript)
+ *
+ * Reads {"code": str, "inputs": [str, ...], "timeout_ms": int} from stdin,
+ * compiles the program once and runs it once per input, writing one JSON
+ * line per run to stdout:
+ *
+ *   {"success": bool, "output": str, "error": str|null, "execution_time": float}
+ *
+ * Isolation: every run gets a brand new vm context, so globals, prototypes
+ * and top-level bindings never leak between runs. `require('fs')` is
+ * replaced so fs.readFileSync(0) / '/dev/stdin' return the run's input,
+ * process.stdin is a fresh stream over that input, and console/process
+ * output is captured per run. Node's module cache is shared, so state kept
+ * inside required core modules is NOT reset between runs.
+ */
+'use strict';
+
+const fs = require('fs');
+const util = require('util');
+const vm = require('vm');
+const { Readable } = require('stream');
+
+class ExitSignal {
+    constructor(code) {
+        this.code = code;
+    }
+}
+
+let currentRun = null;
+
+function writeResult(result) {
+    fs.writeSync(1, JSON.stringify(result) + '\n');
+}
+
+function createSandbox(run) {
+    const write = (chunk) => {
+        run.output += String(chunk);
+        return true;
+    };
+    const log = (...args) => {
+        run.output += util.format(...args) + '\n';
+    };
+
+    const sandboxFs = Object.assign(Object.create(fs), {
+        readFileSync(file, options) {
+            if (file === 0 || file === '/dev/stdin') {
+                const encoding = typeof options === 'string' ? options : options && options.encoding;
+                return encoding ? run.input : Buffer.from(run.input);
+            }
+            return fs.readFileSync(file, options);
+        },
+        writeSync(fd, data, ...rest) {
+            if (fd === 1 || fd === 2) {
+                write(data);
+                return String(data).length;
+            }
+            return fs.writeSync(fd, data, ...rest);
+        },
+    });
+
+    // Track timers so a run is only finished once its async work is done
+    const track = (create, clear) => (callback, ...args) => {
+        const handle = create(() => {
+            run.timers.delete(handle);
+            callback();
+        }, ...args);
+        run.timers.set(handle, clear);
+        return handle;
+    };
+    const untrack = (clear) => (handle) => {
+        run.timers.delete(handle);
+        clear(handle);
+    };
+
+    const sandboxProcess = {
+        argv: ['node', 'main.js'],
+        env: {},
+        platform: process.platform,
+        version: process.version,
+        versions: process.versions,
+        hrtime: process.hrtime,
+        memoryUsage: process.memoryUsage,
+        nextTick: process.nextTick,
+        stdout: { write },
+        stderr: { write },
+        exit(code) {
+            throw new ExitSignal(code === undefined ? 0 : code);
+        },
+        get stdin() {
+            if (!run.stdin) {
+                run.stdin = Readable.from([run.input]);
+                run.stdin.on('close', () => {
+                    run.stdinClosed = true;
+                });
+            }
+            return run.stdin;
+        },
+    };
+
+    const sandboxModule = { exports: {} };
+    return {
+        console: { log, info: log, warn: log, error: log, debug: log },
+        require: (name) => (name === 'fs' || name === 'node:fs' ? sandboxFs : require(name)),
+        process: sandboxProcess,
+        module: sandboxModule,
+        exports: sandboxModule.exports,
+        __filename: 'main.js',
+        __dirname: '.',
+        Buffer,
+        URL,
+        URLSearchParams,
+        TextEncoder,
+        TextDecoder,
+        queueMicrotask,
+        setImmediate,
+        clearImmediate,
+        setTimeout: track(setTimeout, clearTimeout),
+        clearTimeout: untrack(clearTimeout),
+        setInterval: track(setInterval, clearInterval),
+        clearInterval: untrack(clearInterval),
+    };
+}
+
+function failRun(run, error) {
+    if (error instanceof ExitSignal) {
+        run.exitCode = error.code;
+        run.exited = true;
+    } else if (run.exitCode === 0) {
+        run.exitCode = 1;
+        run.error += (error && error.message !== undefined ? error.message : String(error)) + '\n';
+    }
+}
+
+function stdinSettled(run) {
+    const stdin = run.stdin;
+    if (!stdin || run.stdinClosed) {
+        return true;
+    }
+    // Nobody is consuming the stream, so it will never close on its own
+    return !stdin.readableFlowing && stdin.listenerCount('data') + stdin.listenerCount('readable') === 0;
+}
+
+async function settle(run, deadline) {
+    // Let promises, stdin readers and pending timers finish, up to the deadline
+    while (Date.now() < deadline) {
+        await new Promise((resolve) => setImmediate(resolve));
+        if (run.exited || run.exitCode !== 0) {
+            return true;
+        }
+        if (stdinSettled(run) && run.timers.size === 0) {
+            return true;
+        }
+        await new Promise((resolve) => setTimeout(resolve, 1));
+    }
+    return false;
+}
+
+function clearTimers(run) {
+    for (const [handle, clear] of run.timers) {
+        clear(handle);
+    }
+    run.timers.clear();
+}
+
+async function runCase(script, input, timeoutMs) {
+    const run = {
+        input,
+        output: '',
+        error: '',
+        exitCode: 0,
+        exited: false,
+        timers: new Map(),
+        stdin: null,
+        stdinClosed: false,
+    };
+    currentRun = run;
+
+    const start = process.hrtime.bigint();
+    const deadline = Date.now() + timeoutMs;
+    let timedOut = false;
+    try {
+        script.runInContext(vm.createContext(createSandbox(run)), { timeout: timeoutMs });
+    } catch (error) {
+        if (error && error.code === 'ERR_SCRIPT_EXECUTION_TIMEOUT') {
+            timedOut = true;
+        } else {
+            failRun(run, error);
+        }
+    }
+
+    if (!timedOut && !run.exited && run.exitCode === 0) {
+        timedOut = !(await settle(run, deadline));
+    }
+    clearTimers(run);
+    if (run.stdin) {
+        run.stdin.destroy();
+    }
+    currentRun = null;
+
+    const executionTime = Number(process.hrtime.bigint() - start) / 1e9;
+    if (timedOut) {
+        return {
+            success: false,
+            output: '',
+            error: `Execution timeout (>${timeoutMs / 1000}s)`,
+            execution_time: timeoutMs / 1000,
+        };
+    }
+    return {
+        success: run.exitCode === 0,
+        output: run.output,
+        error: run.exitCode === 0 ? null : run.error,
+        execution_time: executionTime,
+    };
+}
+
+process.on('uncaughtException', (error) => {
+    if (currentRun) {
+        failRun(currentRun, error);
+        clearTimers(currentRun);
+    }
+});
+process.on('unhandledRejection', (error) => {
+    if (currentRun) {
+        failRun(currentRun, error);
+    }
+});
+
+async function main() {
+    const payload = JSON.parse(fs.readFileSync(0, 'utf-8'));
+    const timeoutMs = payload.timeout_ms || 30000;
+
+    let script;
+    try {
+        script = new vm.Script(payload.code, { filename: 'main.js' });
+    } catch (error) {
+        // Compile errors affect every run the same way
+        for (const _ of payload.inputs) {
+            writeResult({ success: false, output: '', error: `${error.name}: ${error.message}\n`, execution_time: 0 });
+        }
+        return;
+    }
+
+    for (const input of payload.inputs) {
+        writeResult(await runCase(script, input || '', timeoutMs));
+    }
+}
+
+main().then(() => process.exit(0));
@@ -0,0 +1,59 @@
+"""
+Hand-off between the Judge0 callback endpoint and waiting executors
+Judge0 PUTs each finished submission to our callback_url; the router stores
+it here and wakes any thread waiting on that token. Callbacks can arrive
+before the executor starts waiting (the token is only known once the create
+request returns), so unclaimed results are kept for a while.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Iterable
+
+# Unclaimed callbacks are dropped after this many seconds or beyond this many entries
+CALLBACK_TTL = 300
+MAX_UNCLAIMED_CALLBACKS = 10000
+
+
+class Judge0CallbackRegistry:
+    """Thread-safe mailbox of finished Judge0 submissions keyed by token"""
+
+    def __init__(self, ttl: float = CALLBACK_TTL, max_unclaimed: int = MAX_UNCLAIMED_CALLBACKS):
+        self.ttl = ttl
+        self.max_unclaimed = max_unclaimed
+        self._delivered: "OrderedDict[str, tuple]" = OrderedDict()
+        self._cond = threading.Condition()
+
+    def deliver(self, token: str, submission: Dict[str, Any]):
+        """Store a finished submission and wake waiters"""
+        with self._cond:
+            self._delivered[token] = (submission, time.monotonic())
+            self._delivered.move_to_end(token)
+            self._prune()
+            self._cond.notify_all()
+
+    def collect(self, tokens: Iterable[str], timeout: float) -> Dict[str, Dict[str, Any]]:
+        """
+        Wait up to `timeout` seconds until at least one of `tokens` has been
+        delivered, then remove and return every delivered one (may be empty).
+        """
+        tokens = list(tokens)
+        with self._cond:
+            self._cond.wait_for(lambda: any(token in self._delivered for token in tokens), timeout)
+            return {
+                token: self._delivered.pop(token)[0]
+                for token in tokens
+                if token in self._delivered
+            }
+
+    def _prune(self):
+        cutoff = time.monotonic() - self.ttl
+        while self._delivered:
+            token, (_, delivered_at) = next(iter(self._delivered.items()))
+            if delivered_at >= cutoff and len(self._delivered) <= self.max_unclaimed:
+                break
+            del self._delivered[token]
+
+
+judge0_callbacks = Judge0CallbackRegistry()
@@ -1,265 +1,525 @@
-"""
-Judge0 API executor for Python code execution
-Uses Judge0 online code execution service
-"""
-import requests
-import json
-import time
-import base64
-from typing import Dict, Any, List
-from dotenv import load_dotenv
-import os
-
-load_dotenv()
-
-# Judge0 API configuration
-JUDGE0_API_URL = "https://judge0-ce.p.rapidapi.com"
-JUDGE0_API_KEY = os.getenv("JUDGE0_API_KEY", "cec1a92bf7msh6d43f6fb94cd469p1ea054jsn8aefd4dc6066")
-JUDGE0_HOST = "judge0-ce.p.rapidapi.com"
-
-# Language IDs in Judge0
-LANGUAGE_IDS = {
-    "python": 71,  # Python 3
-    "javascript": 63,  # Node.js
-}
-
-class Judge0Executor:
-    """Execute code using Judge0 API"""
-
-    @staticmethod
-    def execute_code(language: str, code: str, stdin: str = "", timeout: int = 30) -> Dict[str, Any]:
-        """
-        Execute code using Judge0 API
-
-        Args:
-            language: 'python' or 'javascript'
-            code: Source code to execute
-            stdin: Input to pass to the program
-            timeout: Execution timeout in seconds
-
-        Returns:
-            {
-                'success': bool,
-                'output': str,
-                'error': str or None,
-                'execution_time': float
-            }
-        """
-        try:
-            language_id = LANGUAGE_IDS.get(language.lower())
-            if not language_id:
-                return {
-                    'success': False,
-                    'output': '',
-                    'error': f"Unsupported language: {language}",
-                    'execution_time': 0
-                }
-
-            # Submit code for execution
-            submit_url = f"{JUDGE0_API_URL}/submissions"
-            headers = {
-                "content-type": "application/json",
-                "X-RapidAPI-Key": JUDGE0_API_KEY,
-                "X-RapidAPI-Host": JUDGE0_HOST
-            }
-
-            payload = {
-                "language_id": language_id,
-                "source_code": code,
-                "stdin": stdin,
-                "expected_output": None,
-                "cpu_time_limit": min(timeout, 20),  # Max 20 seconds for CPU time
-                "cpu_extra_time": 2,
-                "wall_time_limit": min(timeout + 5, 30),  # Max 30 seconds for wall time
-                "memory_limit": 128000,  # 128MB
-                "stack_limit": 64000,    # 64MB
-                "max_file_size": 1024     # 1KB
-            }
-
-            # Submit the code
-            response = requests.post(submit_url, json=payload, headers=headers, timeout=10)
-            if response.status_code != 201:
-                return {
-                    'success': False,
-                    'output': '',
-                    'error': f"Judge0 API error: {response.status_code} - {response.text}",
-                    'execution_time': 0
-                }
-
-            token = response.json().get('token')
-            if not token:
-                return {
-                    'success': False,
-                    'output': '',
-                    'error': "No token received from Judge0",
-                    'execution_time': 0
-                }
-
-            # Poll for results
-            result_url = f"{JUDGE0_API_URL}/submissions/{token}?base64_encoded=true&fields=*"
-            max_attempts = 30  # Maximum polling attempts
-            attempt = 0
-
-            while attempt < max_attempts:
-                time.sleep(1)  # Wait 1 second between polls
-
-                result_response = requests.get(result_url, headers={
-                    "X-RapidAPI-Key": JUDGE0_API_KEY,
-                    "X-RapidAPI-Host": JUDGE0_HOST
-                }, timeout=10)
-
-                if result_response.status_code != 200:
-                    return {
-                        'success': False,
-                        'output': '',
-                        'error': f"Failed to get result: {result_response.status_code}",
-                        'execution_time': 0
-                    }
-
-                result = result_response.json()
-                status_id = result.get('status', {}).get('id')
-
-                # Status codes: 1=pending, 2=processing, 3=accepted, 4=wrong answer, 5=time limit, 6=compilation error, etc.
-                if status_id == 3:  # Accepted
-                    stdout = result.get('stdout', '')
-                    if stdout:
-                        stdout = base64.b64decode(stdout).decode('utf-8').strip()
-                    return {
-                        'success': True,
-                        'output': stdout,
-                        'error': None,
-                        'execution_time': result.get('time', 0)
-                    }
-                elif status_id in [4, 5, 6, 7, 8, 9, 10, 11, 12, 13]:  # Various error states
-                    stderr = result.get('stderr', '')
-                    compile_output = result.get('compile_output', '')
-                    stdout = result.get('stdout', '')
-
-                    if stderr:
-                        stderr = base64.b64decode(stderr).decode('utf-8')
-                    if compile_output:
-                        compile_output = base64.b64decode(compile_output).decode('utf-8')
-                    if stdout:
-                        stdout = base64.b64decode(stdout).decode('utf-8').strip()
-
-                    error_msg = stderr or compile_output or result.get('status', {}).get('description', 'Unknown error')
-                    return {
-                        'success': False,
-                        'output': stdout,
-                        'error': error_msg,
-                        'execution_time': result.get('time', 0)
-                    }
-                elif status_id in [1, 2]:  # Still processing
-                    attempt += 1
-                    continue
-                else:
-                    return {
-                        'success': False,
-                        'output': '',
-                        'error': f"Unknown status: {status_id}",
-                        'execution_time': 0
-                    }
-
-            # Timeout
-            return {
-                'success': False,
-                'output': '',
-                'error': f"Execution timeout after {max_attempts} attempts",
-                'execution_time': timeout
-            }
-
-        except requests.Timeout:
-            return {
-                'success': False,
-                'output': '',
-                'error': f"API timeout (>{timeout}s)",
-                'execution_time': timeout
-            }
-        except Exception as e:
-            return {
-                'success': False,
-                'output': '',
-                'error': f"Execution error: {str(e)}",
-                'execution_time': 0
-            }
-
-    @staticmethod
-    def execute_coding_problem(language: str, user_code: str, test_cases: List[Dict[str, str]]) -> Dict[str, Any]:
-        """
-        Execute a coding problem and validate against test cases using Judge0
-
-        Args:
-            language: 'python' or 'javascript'
-            user_code: User's submitted code
-            test_cases: List of test cases with 'input' and 'expected_output'
-
-        Returns:
-            {
-                'success': bool,
-                'total_tests': int,
-                'passed_tests': int,
-                'results': [
-                    {
-                        'test_id': int,
-                        'input': str,
-                        'expected_output': str,
-                        'actual_output': str,
-                        'passed': bool,
-                        'error': str or None
-                    }
-                ],
-                'code_error': str or None
-            }
-        """
-        results = []
-        passed_count = 0
-        code_error = None
-
-        for idx, test_case in enumerate(test_cases):
-            test_input = test_case.get('input', '')
-            expected_output = test_case.get('expected_output', '').strip()
-
-            # Execute code with test input using Judge0
-            exec_result = Judge0Executor.execute_code(
-                language=language,
-                code=user_code,
-                stdin=test_input,
-                timeout=30
-            )
-
-            if not exec_result['success'] and exec_result['error']:
-                # Code has syntax/runtime error
-                if idx == 0:  # Only set error once
-                    code_error = exec_result['error']
-                results.append({
-                    'test_id': idx + 1,
-                    'input': test_input,
-                    'expected_output': expected_output,
-                    'actual_output': '',
-                    'passed': False,
-                    'error': exec_result['error']
-                })
-            else:
-                # Compare output
-                actual_output = exec_result['output'].strip()
-                passed = actual_output == expected_output
-
-                results.append({
-                    'test_id': idx + 1,
-                    'input': test_input,
-                    'expected_output': expected_output,
-                    'actual_output': actual_output,
-                    'passed': passed,
-                    'error': None
-                })
-
-                if passed:
-                    passed_count += 1
-
-        return {
-            'success': passed_count == len(test_cases),
-            'total_tests': len(test_cases),
-            'passed_tests': passed_count,
-            'results': results,
-            'code_error': code_error
-        }
+"""
+Judge0 API executor for Python code execution
+Uses Judge0 online code execution service
+"""
+import requests
+import json
+import time
+import base64
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Callable, Dict, Any, Iterator, List, Optional
+from urllib.parse import quote, urlsplit, urlunsplit
+from dotenv import load_dotenv
+import os
+
+from app.services.execution_cache import execution_cache, execution_key, is_program_outcome
+from app.services.http_transport import get_transport
+from app.services.judge0_callbacks import judge0_callbacks
+
+load_dotenv()
+
+# Judge0 API configuration
+JUDGE0_API_URL = os.getenv("JUDGE0_API_URL", "https://judge0-ce.p.rapidapi.com")
+JUDGE0_API_KEY = os.getenv("JUDGE0_API_KEY", "cec1a92bf7msh6d43f6fb94cd469p1ea054jsn8aefd4dc6066")
+JUDGE0_HOST = "judge0-ce.p.rapidapi.com"
+
+# Pooled keep-alive session shared by all Judge0 requests
+_transport = get_transport("judge0")
+
+# Test case fan-out: per submission, and across all submissions in this process
+JUDGE0_MAX_PARALLEL_TESTS = int(os.getenv("JUDGE0_MAX_PARALLEL_TESTS", "8"))
+JUDGE0_MAX_CONCURRENT_RUNS = int(os.getenv("JUDGE0_MAX_CONCURRENT_RUNS", "32"))
+_global_run_slots = threading.BoundedSemaphore(JUDGE0_MAX_CONCURRENT_RUNS)
+# Held while a batch takes its slots one by one, so two batches never each hold part of what they need
+_batch_slots_lock = threading.Lock()
+
+# Batch submissions (POST/GET /submissions/batch) instead of one request per test case
+JUDGE0_USE_BATCH = os.getenv("JUDGE0_USE_BATCH", "true").lower() == "true"
+JUDGE0_BATCH_SIZE = int(os.getenv("JUDGE0_BATCH_SIZE", "20"))
+
+# Result polling: short first waits that grow geometrically, up to a total deadline
+JUDGE0_POLL_INITIAL_DELAY = float(os.getenv("JUDGE0_POLL_INITIAL_DELAY", "0.1"))
+JUDGE0_POLL_MAX_DELAY = float(os.getenv("JUDGE0_POLL_MAX_DELAY", "2.0"))
+JUDGE0_POLL_BACKOFF = float(os.getenv("JUDGE0_POLL_BACKOFF", "1.5"))
+JUDGE0_POLL_TIMEOUT = float(os.getenv("JUDGE0_POLL_TIMEOUT", "30"))
+
+# Callback mode: public base URL of this backend, Judge0 PUTs results to {url}/judge0/callback
+# with the secret as HTTP Basic credentials (required when the URL is set)
+JUDGE0_CALLBACK_URL = os.getenv("JUDGE0_CALLBACK_URL", "")
+JUDGE0_CALLBACK_SECRET = os.getenv("JUDGE0_CALLBACK_SECRET", "")
+JUDGE0_CALLBACK_USER = "judge0"
+
+# Errors that describe a failure to run the code (never cached)
+TRANSIENT_ERRORS = (
+    "Judge0 API error", "No token received", "Failed to get result", "Execution timeout",
+    "API timeout", "Execution error", "Unknown status", "Judge0 rejected", "Unsupported language",
+    "Time Limit Exceeded", "Internal Error",
+)
+
+# Language IDs in Judge0
+LANGUAGE_IDS = {
+    "python": 71,  # Python 3
+    "javascript": 63,  # Node.js
+}
+
+
+def _poll_delays(timeout: float):
+    """Yield wait intervals with exponential backoff until `timeout` seconds have passed"""
+    deadline = time.monotonic() + timeout
+    delay = JUDGE0_POLL_INITIAL_DELAY
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return
+        yield min(delay, remaining)
+        delay = min(delay * JUDGE0_POLL_BACKOFF, JUDGE0_POLL_MAX_DELAY)
+
+
+class Judge0Executor:
+    """Execute code using Judge0 API"""
+
+    @staticmethod
+    def _headers(json_body: bool = False) -> Dict[str, str]:
+        headers = {
+            "X-RapidAPI-Key": JUDGE0_API_KEY,
+            "X-RapidAPI-Host": JUDGE0_HOST
+        }
+        if json_body:
+            headers["content-type"] = "application/json"
+        return headers
+
+    @staticmethod
+    def _build_payload(language_id: int, code: str, stdin: str, timeout: int) -> Dict[str, Any]:
+        payload = {
+            "language_id": language_id,
+            "source_code": code,
+            "stdin": stdin,
+            "expected_output": None,
+            "cpu_time_limit": min(timeout, 20),  # Max 20 seconds for CPU time
+            "cpu_extra_time": 2,
+            "wall_time_limit": min(timeout + 5, 30),  # Max 30 seconds for wall time
+            "memory_limit": 128000,  # 128MB
+            "stack_limit": 64000,    # 64MB
+            "max_file_size": 1024     # 1KB
+        }
+        callback_url = Judge0Executor._callback_url()
+        if callback_url:
+            payload["callback_url"] = callback_url
+        return payload
+
+    @staticmethod
+    def _callback_url() -> Optional[str]:
+        if not JUDGE0_CALLBACK_URL:
+            return None
+        # Judge0 sends URL credentials as an Authorization header, so the secret stays out of access logs
+        parts = urlsplit(JUDGE0_CALLBACK_URL.rstrip('/'))
+        netloc = f"{JUDGE0_CALLBACK_USER}:{quote(JUDGE0_CALLBACK_SECRET, safe='')}@{parts.netloc.rpartition('@')[2]}"
+        return urlunsplit(parts._replace(netloc=netloc, path=f"{parts.path}/judge0/callback"))
+
+    @staticmethod
+    def _error_result(error: str, execution_time: float = 0) -> Dict[str, Any]:
+        return {
+            'success': False,
+            'output': '',
+            'error': error,
+            'execution_time': execution_time
+        }
+
+    @staticmethod
+    def _parse_result(result: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """
+        Convert a Judge0 submission (base64 encoded) to our result shape.
+        Returns None while the submission is still queued or processing.
+        """
+        status_id = result.get('status', {}).get('id')
+
+        # Status codes: 1=pending, 2=processing, 3=accepted, 4=wrong answer, 5=time limit, 6=compilation error, etc.
+        if status_id == 3:  # Accepted
+            stdout = result.get('stdout', '')
+            if stdout:
+                stdout = base64.b64decode(stdout).decode('utf-8').strip()
+            return {
+                'success': True,
+                'output': stdout,
+                'error': None,
+                'execution_time': result.get('time', 0)
+            }
+        elif status_id in [4, 5, 6, 7, 8, 9, 10, 11, 12, 13]:  # Various error states
+            stderr = result.get('stderr', '')
+            compile_output = result.get('compile_output', '')
+            stdout = result.get('stdout', '')
+
+            if stderr:
+                stderr = base64.b64decode(stderr).decode('utf-8')
+            if compile_output:
+                compile_output = base64.b64decode(compile_output).decode('utf-8')
+            if stdout:
+                stdout = base64.b64decode(stdout).decode('utf-8').strip()
+
+            error_msg = stderr or compile_output or result.get('status', {}).get('description', 'Unknown error')
+            return {
+                'success': False,
+                'output': stdout,
+                'error': error_msg,
+                'compile_error': status_id == 6,  # Compilation Error
+                'execution_time': result.get('time', 0)
+            }
+        elif status_id in [1, 2]:  # Still processing
+            return None
+        else:
+            return Judge0Executor._error_result(f"Unknown status: {status_id}")
+
+    @staticmethod
+    def _cache_key(language: str, code: str, stdin: str, timeout: int) -> str:
+        # The Judge0 language id pins the runtime version
+        return execution_key("judge0", language, LANGUAGE_IDS.get(language.lower()), code, stdin, {"timeout": timeout})
+
+    @staticmethod
+    def _is_cacheable(result: Dict[str, Any]) -> bool:
+        return is_program_outcome(result, TRANSIENT_ERRORS)
+
+    @staticmethod
+    def execute_code(language: str, code: str, stdin: str = "", timeout: int = 30) -> Dict[str, Any]:
+        """
+        Execute code using Judge0 API, reusing cached results for identical runs
+        (see execution_cache.py)
+
+        Returns:
+            Same shape as _execute_code_uncached
+        """
+        return execution_cache.get_or_execute(
+            Judge0Executor._cache_key(language, code, stdin, timeout),
+            lambda: Judge0Executor._execute_code_uncached(language, code, stdin, timeout),
+            cacheable=Judge0Executor._is_cacheable
+        )
+
+    @staticmethod
+    def _execute_code_uncached(language: str, code: str, stdin: str = "", timeout: int = 30) -> Dict[str, Any]:
+        """
+        Execute code using Judge0 API
+
+        Args:
+            language: 'python' or 'javascript'
+            code: Source code to execute
+            stdin: Input to pass to the program
+            timeout: Execution timeout in seconds
+
+        Returns:
+            {
+                'success': bool,
+                'output': str,
+                'error': str or None,
+                'execution_time': float
+            }
+        """
+        try:
+            language_id = LANGUAGE_IDS.get(language.lower())
+            if not language_id:
+                return Judge0Executor._error_result(f"Unsupported language: {language}")
+
+            # Submit the code
+            submit_url = f"{JUDGE0_API_URL}/submissions"
+            payload = Judge0Executor._build_payload(language_id, code, stdin, timeout)
+            response = _transport.post(submit_url, json=payload, headers=Judge0Executor._headers(json_body=True), timeout=10)
+            if response.status_code != 201:
+                return Judge0Executor._error_result(f"Judge0 API error: {response.status_code} - {response.text}")
+
+            token = response.json().get('token')
+            if not token:
+                return Judge0Executor._error_result("No token received from Judge0")
+
+            # Wait for the callback (if enabled) and poll as a fallback
+            result_url = f"{JUDGE0_API_URL}/submissions/{token}?base64_encoded=true&fields=*"
+
+            for delay in _poll_delays(JUDGE0_POLL_TIMEOUT):
+                if JUDGE0_CALLBACK_URL:
+                    delivered = judge0_callbacks.collect([token], delay)
+                    parsed = Judge0Executor._parse_result(delivered[token]) if delivered else None
+                    if parsed is not None:
+                        return parsed
+                else:
+                    time.sleep(delay)
+
+                result_response = _transport.get(result_url, headers=Judge0Executor._headers(), timeout=10)
+
+                if result_response.status_code != 200:
+                    return Judge0Executor._error_result(f"Failed to get result: {result_response.status_code}")
+
+                parsed = Judge0Executor._parse_result(result_response.json())
+                if parsed is not None:
+                    return parsed
+
+            # Timeout
+            return Judge0Executor._error_result(f"Execution timeout after {JUDGE0_POLL_TIMEOUT:g}s", timeout)
+
+        except requests.Timeout:
+            return Judge0Executor._error_result(f"API timeout (>{timeout}s)", timeout)
+        except Exception as e:
+            return Judge0Executor._error_result(f"Execution error: {str(e)}")
+
+    @staticmethod
+    def execute_batch(language: str, code: str, stdins: List[str], timeout: int = 30) -> List[Dict[str, Any]]:
+        """
+        Execute the same code against many inputs using Judge0 batch endpoints;
+        only inputs without a cached result are sent to Judge0
+
+        Returns:
+            Same shape as _execute_batch_uncached
+        """
+        return execution_cache.get_or_execute_many(
+            [Judge0Executor._cache_key(language, code, stdin, timeout) for stdin in stdins],
+            lambda missing: Judge0Executor._execute_batch_uncached(language, code, [stdins[idx] for idx in missing], timeout),
+            cacheable=Judge0Executor._is_cacheable
+        )
+
+    @staticmethod
+    def _execute_batch_uncached(language: str, code: str, stdins: List[str], timeout: int = 30) -> List[Dict[str, Any]]:
+        """
+        Execute the same code against many inputs using Judge0 batch endpoints
+
+        All runs are created with POST /submissions/batch and polled together
+        with GET /submissions/batch, in chunks of JUDGE0_BATCH_SIZE (Judge0's
+        default maximum is 20 submissions per batch request).
+
+        Args:
+            language: 'python' or 'javascript'
+            code: Source code to execute
+            stdins: Input for each run
+            timeout: Execution timeout in seconds (per run)
+
+        Returns:
+            One result per input, in input order, shaped like execute_code
+        """
+        language_id = LANGUAGE_IDS.get(language.lower())
+        if not language_id:
+            return [Judge0Executor._error_result(f"Unsupported language: {language}") for _ in stdins]
+
+        results: List[Optional[Dict[str, Any]]] = [None] * len(stdins)
+        tokens: Dict[int, str] = {}  # input index -> Judge0 token
+
+        try:
+            # Create all submissions, one batch request per chunk
+            for start in range(0, len(stdins), JUDGE0_BATCH_SIZE):
+                chunk = range(start, min(start + JUDGE0_BATCH_SIZE, len(stdins)))
+                response = _transport.post(
+                    f"{JUDGE0_API_URL}/submissions/batch",
+                    json={"submissions": [
+                        Judge0Executor._build_payload(language_id, code, stdins[idx], timeout) for idx in chunk
+                    ]},
+                    headers=Judge0Executor._headers(json_body=True),
+                    timeout=10
+                )
+                if response.status_code != 201:
+                    for idx in chunk:
+                        results[idx] = Judge0Executor._error_result(f"Judge0 API error: {response.status_code} - {response.text}")
+                    continue
+
+                for idx, created in zip(chunk, response.json()):
+                    token = created.get('token')
+                    if token:
+                        tokens[idx] = token
+                    else:
+                        results[idx] = Judge0Executor._error_result(f"Judge0 rejected submission: {created}")
+
+            # Wait for callbacks (if enabled) and poll pending tokens, one batch GET per chunk
+            for delay in _poll_delays(JUDGE0_POLL_TIMEOUT):
+                if not tokens:
+                    break
+                if JUDGE0_CALLBACK_URL:
+                    delivered = judge0_callbacks.collect(tokens.values(), delay)
+                    for idx, token in list(tokens.items()):
+                        parsed = Judge0Executor._parse_result(delivered[token]) if token in delivered else None
+                        if parsed is not None:
+                            results[idx] = parsed
+                            del tokens[idx]
+                    if delivered:
+                        continue
+                else:
+                    time.sleep(delay)
+
+                pending = list(tokens.items())
+                for start in range(0, len(pending), JUDGE0_BATCH_SIZE):
+                    chunk = pending[start:start + JUDGE0_BATCH_SIZE]
+                    response = _transport.get(
+                        f"{JUDGE0_API_URL}/submissions/batch",
+                        params={
+                            "tokens": ",".join(token for _, token in chunk),
+                            "base64_encoded": "true",
+                            "fields": "token,stdout,stderr,compile_output,status,time"
+                        },
+                        headers=Judge0Executor._headers(),
+                        timeout=10
+                    )
+                    if response.status_code != 200:
+                        for idx, _ in chunk:
+                            results[idx] = Judge0Executor._error_result(f"Failed to get result: {response.status_code}")
+                            del tokens[idx]
+                        continue
+
+                    for (idx, _), submission in zip(chunk, response.json().get('submissions', [])):
+                        parsed = Judge0Executor._parse_result(submission or {})
+                        if parsed is not None:
+                            results[idx] = parsed
+                            del tokens[idx]
+
+            for idx in tokens:
+                results[idx] = Judge0Executor._error_result(f"Execution timeout after {JUDGE0_POLL_TIMEOUT:g}s", timeout)
+
+        except requests.Timeout:
+            for idx, result in enumerate(results):
+                if result is None:
+                    results[idx] = Judge0Executor._error_result(f"API timeout (>{timeout}s)", timeout)
+        except Exception as e:
+            for idx, result in enumerate(results):
+                if result is None:
+                    results[idx] = Judge0Executor._error_result(f"Execution error: {str(e)}")
+
+        return results
+
+    @staticmethod
+    def _execute_with_slot(language: str, code: str, stdin: str) -> Dict[str, Any]:
+        """Run execute_code while holding one of the process-wide Judge0 slots"""
+        with _global_run_slots:
+            return Judge0Executor.execute_code(
+                language=language,
+                code=code,
+                stdin=stdin,
+                timeout=30
+            )
+
+    @staticmethod
+    @contextmanager
+    def _run_slots(count: int):
+        """Hold `count` (at most JUDGE0_MAX_CONCURRENT_RUNS) of the process-wide Judge0 slots"""
+        with _batch_slots_lock:
+            for _ in range(count):
+                _global_run_slots.acquire()
+        try:
+            yield
+        finally:
+            for _ in range(count):
+                _global_run_slots.release()
+
+    @staticmethod
+    def _iter_exec_results(language: str, user_code: str, test_cases: List[Dict[str, str]], max_parallel: Optional[int], use_batch: bool) -> Iterator[Dict[str, Any]]:
+        """Yield execute_code results in test order, each as soon as it is available"""
+        if use_batch and len(test_cases) > 1:
+            # One slot per test case; groups also respect the per-submission cap and Judge0's batch size
+            stdins = [test_case.get('input', '') for test_case in test_cases]
+            group_size = min(max_parallel or JUDGE0_MAX_PARALLEL_TESTS, JUDGE0_MAX_CONCURRENT_RUNS, JUDGE0_BATCH_SIZE)
+            for start in range(0, len(stdins), group_size):
+                group = stdins[start:start + group_size]
+                with Judge0Executor._run_slots(len(group)):
+                    exec_results = Judge0Executor.execute_batch(
+                        language=language,
+                        code=user_code,
+                        stdins=group,
+                        timeout=30
+                    )
+                yield from exec_results
+            return
+
+        # Execute code with every test input using Judge0; map() keeps test order
+        workers = max(1, min(len(test_cases), max_parallel or JUDGE0_MAX_PARALLEL_TESTS))
+        with ThreadPoolExecutor(max_workers=workers) as pool:
+            yield from pool.map(
+                lambda test_case: Judge0Executor._execute_with_slot(language, user_code, test_case.get('input', '')),
+                test_cases
+            )
+
+    @staticmethod
+    def execute_coding_problem(language: str, user_code: str, test_cases: List[Dict[str, str]], max_parallel: Optional[int] = None, use_batch: Optional[bool] = None, on_result: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        """
+        Execute a coding problem and validate against test cases using Judge0
+
+        Test cases run at most `max_parallel` at a time for this submission
+        (default JUDGE0_MAX_PARALLEL_TESTS) and at most
+        JUDGE0_MAX_CONCURRENT_RUNS across the whole process. With batching
+        enabled (default JUDGE0_USE_BATCH) they go through execute_batch in
+        groups of that size (and at most JUDGE0_BATCH_SIZE), each test case
+        holding one of the process-wide slots; otherwise they are dispatched
+        concurrently.
+
+        Args:
+            language: 'python' or 'javascript'
+            user_code: User's submitted code
+            test_cases: List of test cases with 'input' and 'expected_output'
+            max_parallel: Per-submission concurrency cap
+            use_batch: Override JUDGE0_USE_BATCH
+            on_result: Called with each test result as soon as it is known
+
+        Returns:
+            {
+                'success': bool,
+                'total_tests': int,
+                'passed_tests': int,
+                'results': [
+                    {
+                        'test_id': int,
+                        'input': str,
+                        'expected_output': str,
+                        'actual_output': str,
+                        'passed': bool,
+                        'error': str or None,
+                        'compile_error': bool  # Judge0 status 6 (Compilation Error)
+                    }
+                ],
+                'code_error': str or None
+            }
+        """
+        results = []
+        passed_count = 0
+        code_error = None
+
+        if use_batch is None:
+            use_batch = JUDGE0_USE_BATCH
+
+        exec_results = Judge0Executor._iter_exec_results(language, user_code, test_cases, max_parallel, use_batch)
+
+        for idx, (test_case, exec_result) in enumerate(zip(test_cases, exec_results)):
+            test_input = test_case.get('input', '')
+            expected_output = test_case.get('expected_output', '').strip()
+
+            if not exec_result['success'] and exec_result['error']:
+                # Code has syntax/runtime error
+                if idx == 0:  # Only set error once
+                    code_error = exec_result['error']
+                results.append({
+                    'test_id': idx + 1,
+                    'input': test_input,
+                    'expected_output': expected_output,
+                    'actual_output': '',
+                    'passed': False,
+                    'error': exec_result['error'],
+                    'compile_error': exec_result.get('compile_error', False)
+                })
+            else:
+                # Compare output
+                actual_output = exec_result['output'].strip()
+                passed = actual_output == expected_output
+
+                results.append({
+                    'test_id': idx + 1,
+                    'input': test_input,
+                    'expected_output': expected_output,
+                    'actual_output': actual_output,
+                    'passed': passed,
+                    'error': None,
+                    'compile_error': False
+                })
+
+                if passed:
+                    passed_count += 1
+
+            if on_result:
+                on_result(results[-1])
+
+        return {
+            'success': passed_count == len(test_cases),
+            'total_tests': len(test_cases),
+            'passed_tests': passed_count,
+            'results': results,
+            'code_error': code_error
+        }
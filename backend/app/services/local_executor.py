@@ -1,130 +1,398 @@
-"""
-Local code executor for development (without Azure Functions)
-Can be used with AZURE_FUNCTION_URL=local environment variable
-"""
-
-import subprocess
-import tempfile
-import os
-import time
-from typing import Dict, Any
-
-
-class LocalCodeExecutor:
-    """Execute Python and JavaScript code locally for testing"""
-    
-    @staticmethod
-    def execute_python(code: str, user_input: str = "", timeout: int = 30) -> Dict[str, Any]:
-        """Execute Python code locally"""
-        try:
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as f:
-                f.write(code)
-                temp_file = f.name
-            
-            try:
-                start_time = time.time()
-                result = subprocess.run(
-                    ['python', temp_file],
-                    input=user_input if user_input else None,
-                    capture_output=True,
-                    timeout=timeout,
-                    text=True
-                )
-                execution_time = time.time() - start_time
-                
-                output = result.stdout
-                error = result.stderr if result.returncode != 0 else None
-                
-                return {
-                    "success": result.returncode == 0,
-                    "output": output,
-                    "error": error,
-                    "execution_time": execution_time
-                }
-            finally:
-                if os.path.exists(temp_file):
-                    os.unlink(temp_file)
-        
-        except subprocess.TimeoutExpired:
-            return {
-                "success": False,
-                "output": "",
-                "error": f"Execution timeout (>{timeout}s)",
-                "execution_time": timeout
-            }
-        except Exception as e:
-            return {
-                "success": False,
-                "output": "",
-                "error": str(e),
-                "execution_time": 0
-            }
-    
-    @staticmethod
-    def execute_javascript(code: str, user_input: str = "", timeout: int = 30) -> Dict[str, Any]:
-        """Execute JavaScript code locally with Node.js"""
-        try:
-            # Wrap code to handle stdin
-            wrapped_code = f"""
-let output = '';
-const originalLog = console.log;
-console.log = function(...args) {{
-    output += args.join(' ') + '\\n';
-}};
-
-const originalError = console.error;
-console.error = function(...args) {{
-    output += args.join(' ') + '\\n';
-}};
-
-try {{
-    {code}
-    process.stdout.write(output);
-}} catch(error) {{
-    process.stderr.write(error.message + '\\n');
-    process.exit(1);
-}}
-"""
-            
-            with tempfile.NamedTemporaryFile(mode='w', suffix='.js', delete=False) as f:
-                f.write(wrapped_code)
-                temp_file = f.name
-            
-            try:
-                start_time = time.time()
-                result = subprocess.run(
-                    ['node', temp_file],
-                    input=user_input if user_input else None,
-                    capture_output=True,
-                    timeout=timeout,
-                    text=True
-                )
-                execution_time = time.time() - start_time
-                
-                output = result.stdout
-                error = result.stderr if result.returncode != 0 else None
-                
-                return {
-                    "success": result.returncode == 0,
-                    "output": output,
-                    "error": error,
-                    "execution_time": execution_time
-                }
-            finally:
-                if os.path.exists(temp_file):
-                    os.unlink(temp_file)
-        
-        except subprocess.TimeoutExpired:
-            return {
-                "success": False,
-                "output": "",
-                "error": f"Execution timeout (>{timeout}s)",
-                "execution_time": timeout
-            }
-        except Exception as e:
-            return {
-                "success": False,
-                "output": "",
-                "error": str(e),
-                "execution_time": 0
-            }
+"""
+Local code executor for development (without Azure Functions)
+Can be used with AZURE_FUNCTION_URL=local environment variable
+Python runs on a pool of warm worker processes (see python_worker_pool.py)
+unless LOCAL_PYTHON_POOL_SIZE=0, in which case every run spawns a new interpreter
+
+Batch mode (execute_batch / execute_coding_problem) runs a program against
+all test inputs inside one child process instead of one process per test:
+- Python: a python_worker.py process; each input runs in a fresh __main__
+  namespace with modules imported by the program dropped between runs
+- JavaScript: js_harness.js; each input runs in a fresh vm context with
+  its own stdin, console and process.stdout capture
+Each input keeps its own timeout. A run that times out or crashes the
+child is reported as failed and the remaining inputs continue in a new
+child process, so one bad input cannot take down the others.
+"""
+
+import functools
+import json
+import queue
+import subprocess
+import tempfile
+import threading
+import os
+import time
+from typing import Callable, Dict, Any, List, Optional
+
+from app.services.execution_cache import execution_cache, execution_key, is_program_outcome
+from app.services.python_worker_pool import get_python_worker_pool, PythonWorkerPool
+
+JS_HARNESS = os.path.join(os.path.dirname(os.path.abspath(__file__)), "js_harness.js")
+
+# Errors that describe a failure to run the code (never cached)
+TRANSIENT_ERRORS = ("Execution timeout", "Execution error", "Harness exited", "Unsupported language")
+
+RUNTIME_COMMANDS = {"python": "python", "javascript": "node"}
+
+
+@functools.lru_cache(maxsize=None)
+def _runtime_version(language: str) -> str:
+    """Version of the local interpreter, part of the result cache key"""
+    try:
+        completed = subprocess.run([RUNTIME_COMMANDS[language], '--version'], capture_output=True, text=True, timeout=10)
+        return (completed.stdout or completed.stderr).strip()
+    except Exception:
+        return "unknown"
+
+
+class LocalCodeExecutor:
+    """Execute Python and JavaScript code locally for testing"""
+    
+    @staticmethod
+    def _cache_key(language: str, code: str, user_input: str, timeout: int) -> str:
+        return execution_key("local", language, _runtime_version(language), code, user_input, {"timeout": timeout})
+
+    @staticmethod
+    def _is_cacheable(result: Dict[str, Any]) -> bool:
+        return is_program_outcome(result, TRANSIENT_ERRORS)
+
+    @staticmethod
+    def execute_python(code: str, user_input: str = "", timeout: int = 30) -> Dict[str, Any]:
+        """Execute Python code locally (identical runs are served from the result cache)"""
+        return execution_cache.get_or_execute(
+            LocalCodeExecutor._cache_key('python', code, user_input, timeout),
+            lambda: LocalCodeExecutor._run_python(code, user_input, timeout),
+            cacheable=LocalCodeExecutor._is_cacheable
+        )
+
+    @staticmethod
+    def _run_python(code: str, user_input: str = "", timeout: int = 30) -> Dict[str, Any]:
+        """Execute Python code on the worker pool, or in a fresh interpreter if it is disabled"""
+        pool = get_python_worker_pool()
+        if pool is not None:
+            return pool.execute(code, user_input, timeout)
+        return LocalCodeExecutor._execute_python_subprocess(code, user_input, timeout)
+
+    @staticmethod
+    def _execute_python_subprocess(code: str, user_input: str = "", timeout: int = 30) -> Dict[str, Any]:
+        """Execute Python code in a fresh interpreter (no worker pool)"""
+        try:
+            with tempfile.NamedTemporaryFile(mode='w', suffix='.py', delete=False) as f:
+                f.write(code)
+                temp_file = f.name
+            
+            try:
+                start_time = time.time()
+                result = subprocess.run(
+                    ['python', temp_file],
+                    input=user_input if user_input else None,
+                    capture_output=True,
+                    timeout=timeout,
+                    text=True
+                )
+                execution_time = time.time() - start_time
+                
+                output = result.stdout
+                error = result.stderr if result.returncode != 0 else None
+                
+                return {
+                    "success": result.returncode == 0,
+                    "output": output,
+                    "error": error,
+                    "execution_time": execution_time
+                }
+            finally:
+                if os.path.exists(temp_file):
+                    os.unlink(temp_file)
+        
+        except subprocess.TimeoutExpired:
+            return {
+                "success": False,
+                "output": "",
+                "error": f"Execution timeout (>{timeout}s)",
+                "execution_time": timeout
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "output": "",
+                "error": f"Execution error: {str(e)}",
+                "execution_time": 0
+            }
+    
+    @staticmethod
+    def execute_javascript(code: str, user_input: str = "", timeout: int = 30) -> Dict[str, Any]:
+        """Execute JavaScript code locally (identical runs are served from the result cache)"""
+        return execution_cache.get_or_execute(
+            LocalCodeExecutor._cache_key('javascript', code, user_input, timeout),
+            lambda: LocalCodeExecutor._run_javascript(code, user_input, timeout),
+            cacheable=LocalCodeExecutor._is_cacheable
+        )
+
+    @staticmethod
+    def _run_javascript(code: str, user_input: str = "", timeout: int = 30) -> Dict[str, Any]:
+        """Execute JavaScript code locally with Node.js"""
+        try:
+            # Wrap code to handle stdin
+            wrapped_code = f"""
+let output = '';
+const originalLog = console.log;
+console.log = function(...args) {{
+    output += args.join(' ') + '\\n';
+}};
+
+const originalError = console.error;
+console.error = function(...args) {{
+    output += args.join(' ') + '\\n';
+}};
+
+try {{
+    {code}
+    process.stdout.write(output);
+}} catch(error) {{
+    process.stderr.write(error.message + '\\n');
+    process.exit(1);
+}}
+"""
+            
+            with tempfile.NamedTemporaryFile(mode='w', suffix='.js', delete=False) as f:
+                f.write(wrapped_code)
+                temp_file = f.name
+            
+            try:
+                start_time = time.time()
+                result = subprocess.run(
+                    ['node', temp_file],
+                    input=user_input if user_input else None,
+                    capture_output=True,
+                    timeout=timeout,
+                    text=True
+                )
+                execution_time = time.time() - start_time
+                
+                output = result.stdout
+                error = result.stderr if result.returncode != 0 else None
+                
+                return {
+                    "success": result.returncode == 0,
+                    "output": output,
+                    "error": error,
+                    "execution_time": execution_time
+                }
+            finally:
+                if os.path.exists(temp_file):
+                    os.unlink(temp_file)
+        
+        except subprocess.TimeoutExpired:
+            return {
+                "success": False,
+                "output": "",
+                "error": f"Execution timeout (>{timeout}s)",
+                "execution_time": timeout
+            }
+        except Exception as e:
+            return {
+                "success": False,
+                "output": "",
+                "error": f"Execution error: {str(e)}",
+                "execution_time": 0
+            }
+
+    @staticmethod
+    def execute_batch(language: str, code: str, inputs: List[str], timeout: int = 30) -> List[Dict[str, Any]]:
+        """
+        Run a program once per input inside a single child process
+
+        Args:
+            language: 'python' or 'javascript'
+            code: Source code to execute
+            inputs: stdin for each run
+            timeout: Per-run timeout in seconds
+
+        Returns:
+            One result per input, in input order, shaped like execute_python
+        """
+        language = language.lower()
+        if language not in RUNTIME_COMMANDS:
+            return LocalCodeExecutor._run_batch(language, code, inputs, timeout)
+
+        # Only inputs without a cached result are sent to the child process
+        return execution_cache.get_or_execute_many(
+            [LocalCodeExecutor._cache_key(language, code, stdin, timeout) for stdin in inputs],
+            lambda missing: LocalCodeExecutor._run_batch(language, code, [inputs[idx] for idx in missing], timeout),
+            cacheable=LocalCodeExecutor._is_cacheable
+        )
+
+    @staticmethod
+    def _run_batch(language: str, code: str, inputs: List[str], timeout: int = 30) -> List[Dict[str, Any]]:
+        """Run a batch on the worker pool (Python) or js_harness.js (JavaScript)"""
+        if language == 'python':
+            pool = get_python_worker_pool()
+            if pool is not None:
+                return pool.execute_batch(code, inputs, timeout)
+            # No shared pool: one worker for this batch, not replaced once it is done
+            pool = PythonWorkerPool(size=1, replace=False)
+            try:
+                return pool.execute_batch(code, inputs, timeout)
+            finally:
+                pool.shutdown()
+        elif language == 'javascript':
+            return LocalCodeExecutor._execute_javascript_batch(code, inputs, timeout)
+        else:
+            return [
+                {
+                    "success": False,
+                    "output": "",
+                    "error": f"Unsupported language: {language}",
+                    "execution_time": 0
+                }
+                for _ in inputs
+            ]
+
+    @staticmethod
+    def _execute_javascript_batch(code: str, inputs: List[str], timeout: int = 30) -> List[Dict[str, Any]]:
+        """Run js_harness.js, restarting it for the remaining inputs if a run hangs or crashes"""
+        results = []
+        while len(results) < len(inputs):
+            remaining = [stdin or "" for stdin in inputs[len(results):]]
+            start_time = time.time()
+            try:
+                process = subprocess.Popen(
+                    ['node', JS_HARNESS],
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.DEVNULL,
+                    text=True,
+                    encoding='utf-8'
+                )
+            except Exception as e:
+                results.extend(
+                    {"success": False, "output": "", "error": f"Execution error: {str(e)}", "execution_time": 0}
+                    for _ in remaining
+                )
+                break
+
+            lines: "queue.Queue" = queue.Queue()
+
+            def read_lines(stream=process.stdout, lines=lines):
+                for line in stream:
+                    lines.put(line)
+                lines.put(None)
+
+            threading.Thread(target=read_lines, daemon=True).start()
+
+            try:
+                process.stdin.write(json.dumps({
+                    "code": code,
+                    "inputs": remaining,
+                    "timeout_ms": timeout * 1000
+                }))
+                process.stdin.close()
+
+                for _ in remaining:
+                    start_time = time.time()
+                    # The harness enforces the timeout itself; this is the backstop
+                    line = lines.get(timeout=timeout + 5)
+                    if line is None:
+                        results.append({
+                            "success": False,
+                            "output": "",
+                            "error": f"Harness exited unexpectedly (exit code {process.wait()})",
+                            "execution_time": time.time() - start_time
+                        })
+                        break
+                    results.append(json.loads(line))
+            except queue.Empty:
+                results.append({
+                    "success": False,
+                    "output": "",
+                    "error": f"Execution timeout (>{timeout}s)",
+                    "execution_time": timeout
+                })
+            except Exception as e:
+                results.append({
+                    "success": False,
+                    "output": "",
+                    "error": f"Execution error: {str(e)}",
+                    "execution_time": time.time() - start_time
+                })
+            finally:
+                if process.poll() is None:
+                    process.kill()
+                process.wait()
+        return results
+
+    @staticmethod
+    def execute_coding_problem(language: str, user_code: str, test_cases: List[Dict[str, str]], batch: bool = True, on_result: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        """
+        Execute a coding problem locally and validate against test cases
+
+        Args:
+            language: 'python' or 'javascript'
+            user_code: User's submitted code
+            test_cases: List of test cases with 'input' and 'expected_output'
+            batch: Run all test cases in one child process (see module docstring)
+            on_result: Called with each test result as soon as it is known
+
+        Returns:
+            Same shape as Judge0Executor.execute_coding_problem
+        """
+        inputs = [test_case.get('input', '') for test_case in test_cases]
+
+        if batch:
+            exec_results = LocalCodeExecutor.execute_batch(language, user_code, inputs, timeout=30)
+        elif language.lower() == 'python':
+            exec_results = (LocalCodeExecutor.execute_python(user_code, stdin, timeout=30) for stdin in inputs)
+        else:
+            exec_results = (LocalCodeExecutor.execute_javascript(user_code, stdin, timeout=30) for stdin in inputs)
+
+        results = []
+        passed_count = 0
+        code_error = None
+
+        for idx, (test_case, exec_result) in enumerate(zip(test_cases, exec_results)):
+            test_input = test_case.get('input', '')
+            expected_output = test_case.get('expected_output', '').strip()
+
+            if not exec_result['success'] and exec_result['error']:
+                # Code has syntax/runtime error
+                if idx == 0:  # Only set error once
+                    code_error = exec_result['error']
+                results.append({
+                    'test_id': idx + 1,
+                    'input': test_input,
+                    'expected_output': expected_output,
+                    'actual_output': '',
+                    'passed': False,
+                    'error': exec_result['error'],
+                    'compile_error': False  # interpreted; syntax errors surface while running
+                })
+            else:
+                # Compare output
+                actual_output = exec_result['output'].strip()
+                passed = actual_output == expected_output
+
+                results.append({
+                    'test_id': idx + 1,
+                    'input': test_input,
+                    'expected_output': expected_output,
+                    'actual_output': actual_output,
+                    'passed': passed,
+                    'error': None,
+                    'compile_error': False
+                })
+
+                if passed:
+                    passed_count += 1
+
+            if on_result:
+                on_result(results[-1])
+
+        return {
+            'success': passed_count == len(test_cases),
+            'total_tests': len(test_cases),
+            'passed_tests': passed_count,
+            'results': results,
+            'code_error': code_error
+        }
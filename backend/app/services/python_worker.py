@@ -0,0 +1,120 @@
+"""
+Sandboxed Python worker process used by PythonWorkerPool
+Runs as a standalone script (python -I python_worker.py) and serves
+execution requests over its stdin/stdout pipes, one JSON document per line:
+
+    request:  {"code": str, "stdin": str}
+    response: {"success": bool, "output": str, "error": str or None,
+               "execution_time": float}
+
+A batch request {"code": str, "inputs": [str, ...]} runs the same program
+once per input and streams back one response line per input, in order.
+
+Every run gets a fresh __main__ namespace, and modules imported by the
+submission and changes to builtins are rolled back between the inputs of a
+batch. That is a convenience, not isolation: the pool retires a worker
+after one submission, so one submission never shares an interpreter with
+another. This file must only use the standard library, it is never
+imported by the backend itself.
+"""
+
+import builtins
+import io
+import json
+import os
+import sys
+import time
+import traceback
+
+
+def _open_protocol_streams():
+    """
+    Keep private copies of the pipe descriptors and point fd 0/1 at devnull,
+    so user code touching the raw descriptors cannot corrupt the protocol.
+    """
+    proto_in = os.fdopen(os.dup(0), 'r', encoding='utf-8')
+    proto_out = os.fdopen(os.dup(1), 'w', encoding='utf-8')
+
+    devnull = os.open(os.devnull, os.O_RDWR)
+    os.dup2(devnull, 0)
+    os.dup2(devnull, 1)
+    os.close(devnull)
+
+    return proto_in, proto_out
+
+
+def _exit_status(code, stderr) -> int:
+    """Translate a SystemExit code the same way the interpreter does"""
+    if code is None:
+        return 0
+    if isinstance(code, int):
+        return code
+    print(code, file=stderr)
+    return 1
+
+
+def run_code(code: str, stdin: str = "") -> dict:
+    """Execute one submission in a clean namespace and capture its output"""
+    stdout = io.StringIO()
+    stderr = io.StringIO()
+
+    saved_streams = (sys.stdin, sys.stdout, sys.stderr, sys.argv)
+    saved_modules = set(sys.modules)
+    saved_builtins = dict(builtins.__dict__)
+    saved_recursion_limit = sys.getrecursionlimit()
+
+    namespace = {'__name__': '__main__', '__builtins__': builtins}
+    sys.stdin = io.StringIO(stdin)
+    sys.stdout = stdout
+    sys.stderr = stderr
+    sys.argv = ['main.py']
+
+    returncode = 0
+    start_time = time.time()
+    try:
+        exec(compile(code, 'main.py', 'exec'), namespace)
+    except SystemExit as e:
+        returncode = _exit_status(e.code, stderr)
+    except BaseException:
+        etype, value, tb = sys.exc_info()
+        # Skip this frame so the traceback looks like a plain `python main.py` run
+        traceback.print_exception(etype, value, tb.tb_next if tb else None, file=stderr)
+        returncode = 1
+    finally:
+        execution_time = time.time() - start_time
+        sys.stdin, sys.stdout, sys.stderr, sys.argv = saved_streams
+        for name in set(sys.modules) - saved_modules:
+            del sys.modules[name]
+        builtins.__dict__.clear()
+        builtins.__dict__.update(saved_builtins)
+        sys.setrecursionlimit(saved_recursion_limit)
+
+    return {
+        "success": returncode == 0,
+        "output": stdout.getvalue(),
+        "error": stderr.getvalue() if returncode != 0 else None,
+        "execution_time": execution_time
+    }
+
+
+def main():
+    proto_in, proto_out = _open_protocol_streams()
+    # Bound before any user code runs, which may patch the json module
+    dumps, loads = json.dumps, json.loads
+
+    for line in proto_in:
+        if not line.strip():
+            continue
+        request = loads(line)
+        if 'inputs' in request:
+            stdins = [stdin or '' for stdin in request['inputs']]
+        else:
+            stdins = [request.get('stdin') or '']
+        for stdin in stdins:
+            response = run_code(request.get('code', ''), stdin)
+            proto_out.write(dumps(response) + '\n')
+            proto_out.flush()
+
+
+if __name__ == '__main__':
+    main()
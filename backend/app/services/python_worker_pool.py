@@ -0,0 +1,258 @@
+"""
+Pool of warm Python worker processes for local code execution
+Avoids paying interpreter startup and temp-file I/O for every test case:
+workers are started ahead of time and receive code and stdin over a pipe.
+A worker serves a single submission (one execute or execute_batch call)
+and is then replaced, so nothing a submission does to the interpreter,
+its loaded modules, threads or working directory reaches another
+submission; the replacement boots while the result is returned.
+"""
+
+import atexit
+import json
+import os
+import queue
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from typing import Dict, Any, List, Optional
+
+WORKER_SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "python_worker.py")
+
+# Warm workers kept ready (LOCAL_PYTHON_POOL_SIZE=0 disables the pool)
+POOL_SIZE = int(os.getenv("LOCAL_PYTHON_POOL_SIZE", "4"))
+
+
+def _worker_env() -> Dict[str, str]:
+    """Minimal environment for worker processes (no secrets from ours)"""
+    env = {"PYTHONIOENCODING": "utf-8"}
+    for key in ("PATH", "SYSTEMROOT", "TEMP", "TMP"):
+        if key in os.environ:
+            env[key] = os.environ[key]
+    return env
+
+
+class _Worker:
+    """A single pre-started worker process and its response channel"""
+
+    def __init__(self):
+        self.workdir = tempfile.mkdtemp(prefix="py-worker-")
+        # -I: isolated mode, ignores PYTHON* env vars and the user site dir
+        self.process = subprocess.Popen(
+            [sys.executable, '-I', WORKER_SCRIPT],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            cwd=self.workdir,
+            env=_worker_env(),
+            text=True,
+            encoding='utf-8',
+            bufsize=1
+        )
+        self._responses: "queue.Queue[Optional[str]]" = queue.Queue()
+        self._reader = threading.Thread(target=self._read_responses, daemon=True)
+        self._reader.start()
+
+    def _read_responses(self):
+        for line in self.process.stdout:
+            self._responses.put(line)
+        self._responses.put(None)  # EOF: worker exited
+
+    def is_alive(self) -> bool:
+        return self.process.poll() is None
+
+    def send(self, request: Dict[str, Any]):
+        """Write one request to the worker"""
+        try:
+            self.process.stdin.write(json.dumps(request) + "\n")
+            self.process.stdin.flush()
+        except (BrokenPipeError, OSError) as e:
+            raise RuntimeError(f"Worker process unavailable: {e}")
+
+    def receive(self, timeout: int) -> Dict[str, Any]:
+        """
+        Wait for the next response from the worker.
+
+        Raises:
+            TimeoutError: the worker did not answer within `timeout`
+            RuntimeError: the worker died before answering
+        """
+        try:
+            line = self._responses.get(timeout=timeout)
+        except queue.Empty:
+            raise TimeoutError()
+
+        if line is None:
+            raise RuntimeError(f"Worker process exited unexpectedly (exit code {self.process.wait()})")
+        return json.loads(line)
+
+    def run(self, code: str, stdin: str, timeout: int) -> Dict[str, Any]:
+        """Execute a single program run on this worker"""
+        self.send({"code": code, "stdin": stdin})
+        return self.receive(timeout)
+
+    def kill(self):
+        if self.is_alive():
+            self.process.kill()
+        try:
+            self.process.wait(timeout=5)
+        except subprocess.TimeoutExpired:
+            pass
+        for stream in (self.process.stdin, self.process.stdout):
+            try:
+                stream.close()
+            except Exception:
+                pass
+        shutil.rmtree(self.workdir, ignore_errors=True)
+
+
+class PythonWorkerPool:
+    """Fixed-size pool of sandboxed Python workers"""
+
+    def __init__(self, size: int = POOL_SIZE, replace: bool = True):
+        """`replace=False` skips starting a successor for each retired worker (single-use pools)"""
+        self.size = size
+        self.replace = replace
+        self._idle: "queue.LifoQueue[_Worker]" = queue.LifoQueue()
+        self._slots = threading.BoundedSemaphore(size)
+        self._lock = threading.Lock()
+        self._workers = set()
+        self._closed = False
+
+    def start(self):
+        """Pre-start all workers so the first requests do not pay startup cost"""
+        for _ in range(self.size - self._idle.qsize()):
+            self._idle.put(self._spawn())
+
+    def _spawn(self) -> _Worker:
+        worker = _Worker()
+        with self._lock:
+            self._workers.add(worker)
+        return worker
+
+    def _retire(self, worker: _Worker):
+        with self._lock:
+            self._workers.discard(worker)
+        worker.kill()
+
+    def _checkout(self) -> _Worker:
+        try:
+            worker = self._idle.get_nowait()
+        except queue.Empty:
+            return self._spawn()
+        if not worker.is_alive():
+            self._retire(worker)
+            return self._spawn()
+        return worker
+
+    def _checkin(self, worker: _Worker):
+        """Retire a worker after its submission and put a fresh one in its place"""
+        self._retire(worker)
+        if self._closed or not self.replace:
+            return
+        # The new interpreter boots while we return
+        self._idle.put(self._spawn())
+
+    def execute(self, code: str, stdin: str = "", timeout: int = 30) -> Dict[str, Any]:
+        """
+        Execute Python code on a warm worker
+
+        Returns the same shape as LocalCodeExecutor.execute_python:
+            {
+                'success': bool,
+                'output': str,
+                'error': str or None,
+                'execution_time': float
+            }
+        """
+        with self._slots:
+            worker = self._checkout()
+            start_time = time.time()
+            try:
+                return worker.run(code, stdin or "", timeout)
+            except TimeoutError:
+                return {
+                    "success": False,
+                    "output": "",
+                    "error": f"Execution timeout (>{timeout}s)",
+                    "execution_time": timeout
+                }
+            except Exception as e:
+                return {
+                    "success": False,
+                    "output": "",
+                    "error": f"Execution error: {str(e)}",
+                    "execution_time": time.time() - start_time
+                }
+            finally:
+                self._checkin(worker)
+
+    def execute_batch(self, code: str, inputs: List[str], timeout: int = 30) -> List[Dict[str, Any]]:
+        """
+        Run the same program once per input on a single worker process
+
+        Each input still gets a fresh namespace, its own stdout capture and
+        its own timeout. When a run times out or crashes the worker, that run
+        is reported as failed and the remaining inputs continue on a new
+        worker.
+
+        Returns:
+            One result per input, in input order, each shaped like `execute`
+        """
+        results: List[Dict[str, Any]] = []
+        with self._slots:
+            while len(results) < len(inputs):
+                remaining = [stdin or "" for stdin in inputs[len(results):]]
+                worker = self._checkout()
+                start_time = time.time()
+                try:
+                    worker.send({"code": code, "inputs": remaining})
+                    for _ in remaining:
+                        start_time = time.time()
+                        results.append(worker.receive(timeout))
+                except TimeoutError:
+                    results.append({
+                        "success": False,
+                        "output": "",
+                        "error": f"Execution timeout (>{timeout}s)",
+                        "execution_time": timeout
+                    })
+                except Exception as e:
+                    results.append({
+                        "success": False,
+                        "output": "",
+                        "error": f"Execution error: {str(e)}",
+                        "execution_time": time.time() - start_time
+                    })
+                finally:
+                    self._checkin(worker)
+        return results
+
+    def shutdown(self):
+        """Stop all workers; the pool cannot be used afterwards"""
+        self._closed = True
+        with self._lock:
+            workers = list(self._workers)
+            self._workers.clear()
+        for worker in workers:
+            worker.kill()
+
+
+_pool: Optional[PythonWorkerPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_python_worker_pool() -> Optional[PythonWorkerPool]:
+    """Return the process-wide worker pool, or None when it is disabled"""
+    global _pool
+    if POOL_SIZE <= 0:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            _pool = PythonWorkerPool()
+            _pool.start()
+            atexit.register(_pool.shutdown)
+        return _pool
@@ -0,0 +1,216 @@
+"""
+Streaming comparison of SQL query results against expected rows
+Rows are read from the cursor in fetchmany batches and checked as they
+arrive, so only the expected rows, one batch and a small preview are held
+in memory. Result columns are matched to the expected ones by name (in
+order too when column_order is set). Rows are compared ordered (row by
+row) or unordered (multiset), with a relative/absolute tolerance for
+numbers, and the comparison stops once the diff reaches SQL_MAX_DIFF_ROWS
+entries.
+
+`expected_result` is either a JSON list of row objects, or an object
+{"rows": [...], "ordered": bool, "tolerance": float, "column_order": bool}
+to override the defaults per test case.
+"""
+
+import json
+import math
+import os
+from collections import Counter
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+SQL_COMPARE_BATCH_SIZE = int(os.getenv("SQL_COMPARE_BATCH_SIZE", "500"))
+SQL_COMPARE_ORDERED = os.getenv("SQL_COMPARE_ORDERED", "true").lower() == "true"
+# Result columns must also appear in the expected JSON's key order
+SQL_COMPARE_COLUMN_ORDER = os.getenv("SQL_COMPARE_COLUMN_ORDER", "false").lower() == "true"
+SQL_FLOAT_TOLERANCE = float(os.getenv("SQL_FLOAT_TOLERANCE", "1e-6"))
+SQL_MAX_DIFF_ROWS = int(os.getenv("SQL_MAX_DIFF_ROWS", "5"))
+# Rows of the actual result kept for the response
+SQL_RESULT_PREVIEW_ROWS = int(os.getenv("SQL_RESULT_PREVIEW_ROWS", "100"))
+
+
+class Comparison:
+    """Outcome of comparing a result set with the expected rows"""
+
+    def __init__(self, match: bool, message: str, preview: List[Dict[str, Any]], row_count: int, truncated: bool):
+        self.match = match
+        self.message = message
+        self.preview = preview
+        self.row_count = row_count
+        self.truncated = truncated
+
+
+def split_expected(expected: Any) -> Tuple[Any, Dict[str, Any]]:
+    """Split a decoded expected_result into its rows and comparison options"""
+    if isinstance(expected, dict) and "rows" in expected:
+        options = {key: expected[key] for key in ("ordered", "tolerance", "column_order") if key in expected}
+        return expected["rows"], options
+    return expected, {}
+
+
+def parse_expected(expected_json: str) -> Tuple[Any, Dict[str, Any]]:
+    """
+    Split an expected_result into its rows and comparison options
+
+    Raises:
+        json.JSONDecodeError: expected_json is not valid JSON
+    """
+    return split_expected(json.loads(expected_json))
+
+
+def _normalize(value: Any) -> Any:
+    # Same representation the JSON round trip used to produce
+    if isinstance(value, (bytes, bytearray, memoryview)):
+        return str(bytes(value))
+    return value
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+
+def _values_equal(actual: Any, expected: Any, tolerance: float) -> bool:
+    if actual == expected:
+        return True
+    if tolerance and _is_number(actual) and _is_number(expected):
+        return math.isclose(actual, expected, rel_tol=tolerance, abs_tol=tolerance)
+    return False
+
+
+def _rows_equal(actual: Sequence[Any], expected: Sequence[Any], tolerance: float) -> bool:
+    return actual == expected or all(_values_equal(a, e, tolerance) for a, e in zip(actual, expected))
+
+
+def _hash_key(row: Sequence[Any], digits: Optional[int]) -> Tuple[Any, ...]:
+    """Multiset key; numbers are rounded to the tolerance so close values collide"""
+    if digits is None:
+        return tuple(row)
+    return tuple(round(float(v), digits) if _is_number(v) else v for v in row)
+
+
+def _format_row(columns: List[str], row: Sequence[Any]) -> str:
+    return json.dumps(dict(zip(columns, row)), default=str)
+
+
+def iter_cursor_batches(cursor, batch_size: int = SQL_COMPARE_BATCH_SIZE) -> Iterable[List[tuple]]:
+    while True:
+        batch = cursor.fetchmany(batch_size)
+        if not batch:
+            return
+        yield [tuple(row) for row in batch]
+
+
+def compare_rows(columns: List[str], batches: Iterable[List[tuple]], expected_rows: List[Dict[str, Any]], ordered: Optional[bool] = None, tolerance: Optional[float] = None, column_order: Optional[bool] = None, max_diff: int = SQL_MAX_DIFF_ROWS, preview_rows: int = SQL_RESULT_PREVIEW_ROWS) -> Comparison:
+    """
+    Compare a stream of result rows with the expected row objects
+
+    Args:
+        columns: Result column names (cursor.description order)
+        batches: Lists of row tuples, e.g. from iter_cursor_batches
+        expected_rows: Expected rows as dicts keyed by column name
+        ordered: Row order must match (default SQL_COMPARE_ORDERED)
+        tolerance: Relative/absolute tolerance for numbers (default SQL_FLOAT_TOLERANCE)
+        column_order: Columns must be in the expected key order (default SQL_COMPARE_COLUMN_ORDER)
+        max_diff: Stop after this many differing rows
+        preview_rows: Leading actual rows to keep in Comparison.preview
+    """
+    ordered = SQL_COMPARE_ORDERED if ordered is None else ordered
+    tolerance = SQL_FLOAT_TOLERANCE if tolerance is None else tolerance
+    column_order = SQL_COMPARE_COLUMN_ORDER if column_order is None else column_order
+
+    preview: List[Dict[str, Any]] = []
+    row_count = 0
+    truncated = False
+
+    def take_preview(rows: List[tuple]):
+        nonlocal truncated
+        room = preview_rows - len(preview)
+        preview.extend(dict(zip(columns, [_normalize(v) for v in row])) for row in rows[:room])
+        truncated = truncated or len(rows) > room
+
+    expected_columns = list(expected_rows[0].keys()) if expected_rows else list(columns)
+    if column_order:
+        columns_match = list(columns) == expected_columns
+    else:
+        columns_match = sorted(columns) == sorted(expected_columns)
+    if not columns_match:
+        for batch in batches:
+            take_preview(batch)
+            break
+        return Comparison(
+            False,
+            f"Results don't match.\nExpected columns{' (in order)' if column_order else ''}: {', '.join(expected_columns)}\nActual columns: {', '.join(columns)}",
+            preview, len(preview), truncated
+        )
+
+    # Project result rows into the expected column order
+    positions = [list(columns).index(column) for column in expected_columns]
+    expected = [tuple(row.get(column) for column in expected_columns) for row in expected_rows]
+    diff: List[str] = []
+
+    def project(batch: List[tuple]) -> List[tuple]:
+        return [tuple(_normalize(row[p]) for p in positions) for row in batch]
+
+    if ordered:
+        for batch in batches:
+            take_preview(batch)
+            rows = project(batch)
+            start = row_count
+            row_count += len(rows)
+            # Whole-batch fast path before per-value tolerance checks
+            if rows == expected[start:start + len(rows)]:
+                continue
+            for offset, row in enumerate(rows):
+                idx = start + offset
+                if idx >= len(expected):
+                    diff.append(f"Unexpected row {idx + 1}: {_format_row(expected_columns, row)}")
+                elif not _rows_equal(row, expected[idx], tolerance):
+                    diff.append(f"Row {idx + 1}: expected {_format_row(expected_columns, expected[idx])}, got {_format_row(expected_columns, row)}")
+                if len(diff) >= max_diff:
+                    break
+            if len(diff) >= max_diff:
+                break
+        if len(diff) < max_diff and row_count < len(expected):
+            for idx in range(row_count, min(len(expected), row_count + max_diff - len(diff))):
+                diff.append(f"Missing row {idx + 1}: {_format_row(expected_columns, expected[idx])}")
+    else:
+        digits = max(0, -math.floor(math.log10(tolerance))) if tolerance else None
+        remaining = Counter(_hash_key(row, digits) for row in expected)
+        unmatched: List[tuple] = []
+        for batch in batches:
+            take_preview(batch)
+            rows = project(batch)
+            row_count += len(rows)
+            for row in rows:
+                key = _hash_key(row, digits)
+                if remaining[key] > 0:
+                    remaining[key] -= 1
+                else:
+                    unmatched.append(row)
+            if len(unmatched) > max_diff:
+                break
+
+        # Rounding can split values that are within tolerance; pair leftovers explicitly
+        leftover = []
+        for row in expected:
+            key = _hash_key(row, digits)
+            if remaining[key] > 0:
+                remaining[key] -= 1
+                leftover.append(row)
+        for row in list(unmatched):
+            for candidate in leftover:
+                if _rows_equal(row, candidate, tolerance):
+                    leftover.remove(candidate)
+                    unmatched.remove(row)
+                    break
+        diff.extend(f"Unexpected row: {_format_row(expected_columns, row)}" for row in unmatched[:max_diff])
+        diff.extend(f"Missing row: {_format_row(expected_columns, row)}" for row in leftover[:max_diff - len(diff)])
+
+    if not diff:
+        return Comparison(True, "Results match!", preview, row_count, truncated)
+
+    return Comparison(
+        False,
+        f"Results don't match ({len(expected)} rows expected).\n" + "\n".join(diff[:max_diff]),
+        preview, row_count, truncated
+    )
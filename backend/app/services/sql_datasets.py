@@ -0,0 +1,348 @@
+"""
+Synthetic large datasets for SQL assignments
+An assignment can describe a large dataset declaratively instead of as an
+INSERT script:
+
+    {
+        "seed": 42,
+        "tables": {
+            "customers": {"rows": 100000, "columns": {
+                "id": {"type": "sequence"},
+                "region": {"type": "choice", "values": ["north", "south"], "weights": [3, 1]},
+                "name": {"type": "text", "prefix": "customer_"}
+            }},
+            "orders": {"rows": 2000000, "columns": {
+                "id": {"type": "sequence"},
+                "customer_id": {"type": "ref", "table": "customers"},
+                "amount": {"type": "float", "min": 1, "max": 500, "digits": 2},
+                "created_at": {"type": "date", "start": "2020-01-01", "end": "2024-12-31"},
+                "coupon": {"type": "text", "prefix": "C", "null_rate": 0.9}
+            }}
+        }
+    }
+
+The tables and columns must exist in the assignment's sql_schema (checked
+when the assignment is created). The rows are generated
+once (deterministically from the seed) into a SQLite file under
+SQL_DATASET_DIR, keyed by a hash of the schema and spec, and every submission
+opens that file with `mode=ro&immutable=1` and memory-mapped I/O, so all
+workers share the operating system's page cache. Connections start read-only;
+a submission that writes gets its own temporary copy (see SQLExecutor).
+"""
+
+import hashlib
+import json
+import os
+import random
+import sqlite3
+import tempfile
+import threading
+import time
+from datetime import date, timedelta
+from itertools import islice
+from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple
+from urllib.request import pathname2url
+
+from app.services.sql_templates import PRAGMA_STATEMENT
+
+SQL_DATASET_DIR = os.getenv("SQL_DATASET_DIR", os.path.join(tempfile.gettempdir(), "hackathon_sql_datasets"))
+SQL_DATASET_MMAP_BYTES = int(os.getenv("SQL_DATASET_MMAP_BYTES", str(1024 * 1024 * 1024)))
+SQL_DATASET_MAX_ROWS = int(os.getenv("SQL_DATASET_MAX_ROWS", "10000000"))
+# A build lock not touched for this long is assumed to belong to a crashed builder
+SQL_DATASET_BUILD_TIMEOUT = float(os.getenv("SQL_DATASET_BUILD_TIMEOUT", "900"))
+# How often a running build refreshes its lock file's mtime
+SQL_DATASET_LOCK_HEARTBEAT = min(30.0, SQL_DATASET_BUILD_TIMEOUT / 3)
+SQL_DATASET_INSERT_BATCH = 10000
+
+COLUMN_TYPES = {"sequence", "int", "float", "choice", "text", "date", "ref", "constant"}
+
+
+class DatasetSpecError(ValueError):
+    """The dataset spec is malformed"""
+
+
+def _schema_columns(schema_sql: str) -> Dict[str, List[str]]:
+    """Column names of every table the schema script creates (run on an empty in-memory database)"""
+    conn = sqlite3.connect(":memory:")
+    try:
+        conn.executescript(schema_sql)
+        tables = [row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")]
+        return {table: [row[1] for row in conn.execute(f'PRAGMA table_info("{table}")')] for table in tables}
+    except sqlite3.Error as e:
+        raise DatasetSpecError(f"sql_schema failed to run: {e}")
+    finally:
+        conn.close()
+
+
+def validate_spec(spec: Dict[str, Any], schema_sql: Optional[str] = None):
+    """
+    Check a dataset spec before it is stored; with `schema_sql`, also that
+    every table and column it fills exists in the schema
+
+    Raises:
+        DatasetSpecError: with a message suitable for the API response
+    """
+    if not isinstance(spec, dict) or not isinstance(spec.get("tables"), dict) or not spec["tables"]:
+        raise DatasetSpecError("Dataset spec needs a non-empty 'tables' object")
+
+    total_rows = 0
+    sequences: Dict[str, str] = {}
+    for table, table_spec in spec["tables"].items():
+        if not isinstance(table_spec, dict) or not isinstance(table_spec.get("rows"), int) or table_spec["rows"] < 0:
+            raise DatasetSpecError(f"Table '{table}' needs a non-negative integer 'rows'")
+        columns = table_spec.get("columns")
+        if not isinstance(columns, dict) or not columns:
+            raise DatasetSpecError(f"Table '{table}' needs a non-empty 'columns' object")
+        total_rows += table_spec["rows"]
+
+        for column, column_spec in columns.items():
+            kind = column_spec.get("type") if isinstance(column_spec, dict) else None
+            if kind not in COLUMN_TYPES:
+                raise DatasetSpecError(f"Column '{table}.{column}' has unknown type {kind!r} (expected one of {', '.join(sorted(COLUMN_TYPES))})")
+            if kind == "sequence":
+                sequences.setdefault(table, column)
+            elif kind in ("int", "float"):
+                low, high = column_spec.get("min", 0), column_spec.get("max", 0)
+                if not isinstance(low, (int, float)) or not isinstance(high, (int, float)) or low > high:
+                    raise DatasetSpecError(f"Column '{table}.{column}' needs numeric 'min' <= 'max'")
+                if kind == "int" and (not isinstance(low, int) or not isinstance(high, int)):
+                    raise DatasetSpecError(f"Column '{table}.{column}' needs integer 'min' and 'max'")
+            elif kind == "choice":
+                values = column_spec.get("values")
+                weights = column_spec.get("weights")
+                if not isinstance(values, list) or not values:
+                    raise DatasetSpecError(f"Column '{table}.{column}' needs a non-empty 'values' list")
+                if weights is not None and (not isinstance(weights, list) or len(weights) != len(values)):
+                    raise DatasetSpecError(f"Column '{table}.{column}' needs one weight per value")
+            elif kind == "date":
+                try:
+                    start, end = date.fromisoformat(column_spec["start"]), date.fromisoformat(column_spec["end"])
+                except (KeyError, TypeError, ValueError):
+                    raise DatasetSpecError(f"Column '{table}.{column}' needs ISO 'start' and 'end' dates")
+                if start > end:
+                    raise DatasetSpecError(f"Column '{table}.{column}' has start after end")
+            elif kind == "ref":
+                referenced = column_spec.get("table")
+                if referenced == table or referenced not in sequences or not spec["tables"][referenced]["rows"]:
+                    raise DatasetSpecError(f"Column '{table}.{column}' must reference an earlier, non-empty table with a sequence column")
+
+    if total_rows > SQL_DATASET_MAX_ROWS:
+        raise DatasetSpecError(f"Dataset has {total_rows} rows; the limit is {SQL_DATASET_MAX_ROWS}")
+
+    if schema_sql is None:
+        return
+    schema = _schema_columns(schema_sql)
+    # SQLite table and column names are case-insensitive
+    schema = {table.lower(): {column.lower() for column in columns} for table, columns in schema.items()}
+    for table, table_spec in spec["tables"].items():
+        if table.lower() not in schema:
+            raise DatasetSpecError(f"Table '{table}' is not created by sql_schema")
+        for column in table_spec["columns"]:
+            if column.lower() not in schema[table.lower()]:
+                raise DatasetSpecError(f"Column '{table}.{column}' does not exist in sql_schema")
+
+
+def dataset_key(schema_sql: str, spec: Dict[str, Any]) -> str:
+    canonical = json.dumps(spec, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(((schema_sql or "") + "\0" + canonical).encode("utf-8")).hexdigest()
+
+
+def dataset_path(schema_sql: str, spec: Dict[str, Any]) -> str:
+    return os.path.join(SQL_DATASET_DIR, dataset_key(schema_sql, spec) + ".sqlite")
+
+
+def _column_generator(column_spec: Dict[str, Any], rng: random.Random, table_rows: Dict[str, int], sequence_starts: Dict[str, int]) -> Callable[[int], Any]:
+    """Return f(row_index) producing the column's value"""
+    kind = column_spec["type"]
+    if kind == "sequence":
+        start = column_spec.get("start", 1)
+        return lambda i: start + i
+    if kind == "int":
+        low, high = column_spec.get("min", 0), column_spec.get("max", 0)
+        return lambda i: rng.randint(low, high)
+    if kind == "float":
+        low, high, digits = column_spec.get("min", 0), column_spec.get("max", 0), column_spec.get("digits", 2)
+        return lambda i: round(rng.uniform(low, high), digits)
+    if kind == "choice":
+        values, weights = column_spec["values"], column_spec.get("weights")
+        if weights:
+            return lambda i: rng.choices(values, weights)[0]
+        return lambda i: rng.choice(values)
+    if kind == "text":
+        prefix = column_spec.get("prefix", "")
+        return lambda i: f"{prefix}{i + 1}"
+    if kind == "date":
+        start = date.fromisoformat(column_spec["start"])
+        days = (date.fromisoformat(column_spec["end"]) - start).days
+        return lambda i: (start + timedelta(days=rng.randint(0, days))).isoformat()
+    if kind == "ref":
+        low = sequence_starts[column_spec["table"]]
+        high = low + table_rows[column_spec["table"]] - 1
+        return lambda i: rng.randint(low, high)
+    value = column_spec.get("value")
+    return lambda i: value
+
+
+def _with_nulls(generate: Callable[[int], Any], rng: random.Random, null_rate: float) -> Callable[[int], Any]:
+    return lambda i: None if rng.random() < null_rate else generate(i)
+
+
+def _generate_rows(table_spec: Dict[str, Any], rng: random.Random, table_rows: Dict[str, int], sequence_starts: Dict[str, int]) -> Iterator[tuple]:
+    generators = []
+    for column_spec in table_spec["columns"].values():
+        generate = _column_generator(column_spec, rng, table_rows, sequence_starts)
+        if column_spec.get("null_rate"):
+            generate = _with_nulls(generate, rng, column_spec["null_rate"])
+        generators.append(generate)
+    for i in range(table_spec["rows"]):
+        yield tuple(generate(i) for generate in generators)
+
+
+def generate_dataset(schema_sql: str, spec: Dict[str, Any], path: str):
+    """Run the schema script and insert the generated rows into a new SQLite file at path"""
+    rng = random.Random(spec.get("seed", 0))
+    table_rows: Dict[str, int] = {}
+    sequence_starts: Dict[str, int] = {}
+
+    conn = sqlite3.connect(path)
+    try:
+        # Nothing to recover if the build dies half way; the file is discarded
+        conn.execute("PRAGMA journal_mode=OFF")
+        conn.execute("PRAGMA synchronous=OFF")
+        conn.executescript(schema_sql or "")
+        for table, table_spec in spec["tables"].items():
+            columns = list(table_spec["columns"])
+            for column, column_spec in table_spec["columns"].items():
+                if column_spec["type"] == "sequence":
+                    sequence_starts.setdefault(table, column_spec.get("start", 1))
+            rows = _generate_rows(table_spec, rng, table_rows, sequence_starts)
+            quoted = ", ".join(f'"{column}"' for column in columns)
+            statement = f'INSERT INTO "{table}" ({quoted}) VALUES ({", ".join("?" * len(columns))})'
+            while True:
+                batch = list(islice(rows, SQL_DATASET_INSERT_BATCH))
+                if not batch:
+                    break
+                conn.executemany(statement, batch)
+            table_rows[table] = table_spec["rows"]
+        conn.commit()
+        # Planner statistics, so EXPLAIN QUERY PLAN reflects the real data
+        conn.execute("ANALYZE")
+        conn.commit()
+    finally:
+        conn.close()
+
+
+# One lock per dataset path, so threads building or waiting for one dataset never block another
+_build_locks: Dict[str, threading.Lock] = {}
+_build_locks_guard = threading.Lock()
+
+
+def _build_lock(path: str) -> threading.Lock:
+    with _build_locks_guard:
+        return _build_locks.setdefault(path, threading.Lock())
+
+
+def _remove(path: str):
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+
+
+def _heartbeat(lock_path: str, done: threading.Event):
+    """Refresh the lock file's mtime until the build is done, so waiters do not take it for stale"""
+    while not done.wait(SQL_DATASET_LOCK_HEARTBEAT):
+        try:
+            os.utime(lock_path)
+        except OSError:
+            return
+
+
+def ensure_dataset(schema_sql: str, spec: Dict[str, Any]) -> str:
+    """
+    Return the path of the generated dataset file, building it if needed.
+    One process builds while others wait for it (an O_EXCL lock file next to
+    the dataset, refreshed while the build runs); the file is written under a
+    temporary name and renamed into place, so readers never see a partial
+    database.
+    """
+    path = dataset_path(schema_sql, spec)
+    if os.path.exists(path):
+        return path
+
+    os.makedirs(SQL_DATASET_DIR, exist_ok=True)
+    lock_path = path + ".lock"
+    with _build_lock(path):
+        while not os.path.exists(path):
+            try:
+                fd = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+            except FileExistsError:
+                try:
+                    if time.time() - os.path.getmtime(lock_path) > SQL_DATASET_BUILD_TIMEOUT:
+                        os.remove(lock_path)
+                except OSError:
+                    pass
+                time.sleep(0.2)
+                continue
+
+            os.close(fd)
+            build_path = f"{path}.{os.getpid()}.tmp"
+            done = threading.Event()
+            threading.Thread(target=_heartbeat, args=(lock_path, done), daemon=True).start()
+            try:
+                generate_dataset(schema_sql, spec, build_path)
+                os.replace(build_path, path)
+            finally:
+                done.set()
+                _remove(build_path)
+                # May already be gone if a waiter wrongly judged it stale
+                _remove(lock_path)
+    return path
+
+
+def prebuild_dataset(schema_sql: str, spec: Dict[str, Any]):
+    """Build a dataset in a background thread so the first submission does not wait"""
+    def build():
+        try:
+            ensure_dataset(schema_sql, spec)
+        except Exception:
+            pass
+    threading.Thread(target=build, daemon=True).start()
+
+
+def open_dataset(schema_sql: str, spec: Dict[str, Any]) -> sqlite3.Connection:
+    """
+    Open the generated dataset read-only, immutable and memory-mapped
+
+    Raises:
+        sqlite3.Error: the schema script or the generated inserts failed
+    """
+    path = ensure_dataset(schema_sql, spec)
+    conn = sqlite3.connect(f"file:{pathname2url(path)}?mode=ro&immutable=1", uri=True, check_same_thread=False)
+    conn.execute(f"PRAGMA mmap_size={SQL_DATASET_MMAP_BYTES}")
+    for pragma in PRAGMA_STATEMENT.findall(schema_sql or ""):
+        try:
+            conn.execute(pragma.rstrip(";"))
+        except sqlite3.OperationalError:
+            # Pragmas that write (journal_mode, user_version) cannot apply to a read-only file
+            pass
+    return conn
+
+
+def writable_copy(conn: sqlite3.Connection) -> Tuple[sqlite3.Connection, str]:
+    """Copy a read-only dataset connection into a private temporary file"""
+    fd, path = tempfile.mkstemp(suffix=".sqlite", prefix="sql_overlay_")
+    os.close(fd)
+    copy = sqlite3.connect(path, check_same_thread=False)
+    conn.backup(copy)
+    return copy, path
+
+
+def dataset_files() -> List[Dict[str, Any]]:
+    """Generated dataset files on disk, for the metrics endpoint"""
+    if not os.path.isdir(SQL_DATASET_DIR):
+        return []
+    return [
+        {"file": name, "bytes": os.path.getsize(os.path.join(SQL_DATASET_DIR, name))}
+        for name in sorted(os.listdir(SQL_DATASET_DIR)) if name.endswith(".sqlite")
+    ]
@@ -0,0 +1,196 @@
+"""
+Efficiency grading of SQL submissions against the assignment's reference query
+Both queries run on a scaled-up copy of the dataset (the schema plus a
+performance seed script, or a generated dataset from sql_datasets). For each we record the SQLite VM instructions
+used by the whole script, the median wall time over a few runs and the
+EXPLAIN QUERY PLAN of its last statement (full scans, index searches,
+temporary B-trees). The score compares VM instructions, which unlike wall
+time do not depend on machine load. A submission that modifies the data or
+schema (e.g. deletes rows before counting them) is not comparable with a
+read-only reference and scores 0.
+The reference measurements are deterministic for a given schema, seed
+script, dataset spec and reference query, so they are cached (per process)
+under a hash of all of them; editing any of these produces a new key.
+"""
+
+import copy
+import hashlib
+import json
+import os
+import sqlite3
+import statistics
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from app.services.sql_executor import SQL_PROGRESS_INTERVAL, QueryLimitExceeded, SQLExecutor, split_statements
+
+SQL_EFFICIENCY_RUNS = int(os.getenv("SQL_EFFICIENCY_RUNS", "3"))
+# Progress handler granularity while counting VM instructions
+SQL_EFFICIENCY_STEP_INTERVAL = 10
+# Reference query measurements kept per process (0 disables the cache)
+SQL_REFERENCE_CACHE_MAX_ENTRIES = int(os.getenv("SQL_REFERENCE_CACHE_MAX_ENTRIES", "256"))
+
+_reference_metrics: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+_reference_lock = threading.Lock()
+
+
+def explain_plan(executor: SQLExecutor, query: str) -> Dict[str, Any]:
+    """Summarize EXPLAIN QUERY PLAN output for one statement"""
+    details = [row[3] for row in executor.conn.execute(f"EXPLAIN QUERY PLAN {query}").fetchall()]
+    return {
+        "plan": details,
+        "full_scans": sum(1 for detail in details if detail.startswith("SCAN") and "INDEX" not in detail),
+        "index_scans": sum(1 for detail in details if detail.startswith("SCAN") and "INDEX" in detail),
+        "index_searches": sum(1 for detail in details if detail.startswith("SEARCH")),
+        "temp_btrees": sum(1 for detail in details if "TEMP B-TREE" in detail),
+    }
+
+
+def _schema_version(conn: sqlite3.Connection) -> int:
+    return conn.execute("PRAGMA schema_version").fetchone()[0]
+
+
+def _run_once(schema_sql: str, seed_sql: Optional[str], dataset: Optional[Dict[str, Any]], statements: List[str], limits: Optional[Dict[str, int]], progress_interval: int, with_plan: bool) -> Dict[str, Any]:
+    """Run the statements on a fresh copy of the dataset and measure them all"""
+    executor = SQLExecutor(limits, progress_interval=progress_interval)
+    try:
+        schema_ok, schema_msg = executor.setup_schema(schema_sql, seed_sql, dataset)
+        if not schema_ok:
+            return {"error": schema_msg}
+
+        # A write swaps a generated dataset for a private copy, adds changes or bumps the schema cookie
+        conn = executor.conn
+        changes, schema_version = conn.total_changes, _schema_version(conn)
+        start = time.perf_counter()
+        vm_steps = 0
+        for statement in statements:
+            success, cursor = executor.run_query(statement)
+            if not success:
+                return {"error": cursor}
+            if cursor.description is not None:
+                rows = sum(len(batch) for batch in executor.fetch_batches(cursor))
+            else:
+                rows = cursor.rowcount
+            vm_steps += executor.vm_steps
+        metrics = {"rows": rows, "time_ms": (time.perf_counter() - start) * 1000, "vm_steps": vm_steps}
+        metrics["writes"] = executor.conn is not conn or executor.conn.total_changes != changes or _schema_version(executor.conn) != schema_version
+        if with_plan:
+            # Planned within the measured query's limit window
+            metrics.update(explain_plan(executor, statements[-1]))
+        return metrics
+    except QueryLimitExceeded as e:
+        return {"error": str(e)}
+    except sqlite3.Error as e:
+        return {"error": f"Query execution failed: {str(e)}"}
+    finally:
+        executor.close()
+
+
+def measure_query(schema_sql: str, seed_sql: Optional[str], query: str, limits: Optional[Dict[str, int]] = None, runs: int = SQL_EFFICIENCY_RUNS, dataset: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Measure a query (all its statements) on the performance dataset
+
+    Returns:
+        {'vm_steps', 'time_ms' (median), 'rows', 'writes', 'plan',
+         'full_scans', 'index_scans', 'index_searches', 'temp_btrees'}
+        or {'error': str}
+    """
+    statements = split_statements(query) or [query]
+
+    # One run with a fine-grained progress handler counts VM instructions...
+    metrics = _run_once(schema_sql, seed_sql, dataset, statements, limits, SQL_EFFICIENCY_STEP_INTERVAL, with_plan=True)
+    if "error" in metrics:
+        return metrics
+
+    # ...the timed runs use the normal (cheap) limit checks
+    timings = []
+    for _ in range(max(runs, 1)):
+        timed = _run_once(schema_sql, seed_sql, dataset, statements, limits, SQL_PROGRESS_INTERVAL, with_plan=False)
+        if "error" in timed:
+            return timed
+        timings.append(timed["time_ms"])
+    metrics["time_ms"] = round(statistics.median(timings), 3)
+    return metrics
+
+
+def reference_key(schema_sql: str, seed_sql: Optional[str], reference_query: str, limits: Optional[Dict[str, int]], runs: int, dataset: Optional[Dict[str, Any]]) -> str:
+    """Cache key of a reference measurement"""
+    parts = json.dumps([schema_sql, seed_sql, reference_query, limits, runs, dataset], sort_keys=True, default=str)
+    return hashlib.sha256(parts.encode("utf-8")).hexdigest()
+
+
+def measure_reference(schema_sql: str, seed_sql: Optional[str], reference_query: str, limits: Optional[Dict[str, int]] = None, runs: int = SQL_EFFICIENCY_RUNS, dataset: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """measure_query for the reference solution, served from the cache when it was measured before"""
+    if SQL_REFERENCE_CACHE_MAX_ENTRIES <= 0:
+        return measure_query(schema_sql, seed_sql, reference_query, limits, runs, dataset)
+
+    key = reference_key(schema_sql, seed_sql, reference_query, limits, runs, dataset)
+    with _reference_lock:
+        cached = _reference_metrics.get(key)
+        if cached is not None:
+            _reference_metrics.move_to_end(key)
+            return copy.deepcopy(cached)
+
+    metrics = measure_query(schema_sql, seed_sql, reference_query, limits, runs, dataset)
+    # Errors may come from the time limit under load; measure again next time
+    if "error" not in metrics:
+        with _reference_lock:
+            _reference_metrics[key] = copy.deepcopy(metrics)
+            while len(_reference_metrics) > SQL_REFERENCE_CACHE_MAX_ENTRIES:
+                _reference_metrics.popitem(last=False)
+    return metrics
+
+
+def clear_reference_cache():
+    with _reference_lock:
+        _reference_metrics.clear()
+
+
+def grade_efficiency(schema_sql: str, user_query: str, reference_query: str, seed_sql: Optional[str] = None, limits: Optional[Dict[str, int]] = None, runs: int = SQL_EFFICIENCY_RUNS, dataset: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """
+    Compare the user's query with the reference solution on the performance dataset
+
+    Returns:
+        {
+            'score': int or None,     # 0-100, 100 = at least as efficient as the reference
+            'steps_ratio': float,     # user VM steps / reference VM steps
+            'time_ratio': float,      # user median time / reference median time
+            'user': {...}, 'reference': {...},  # measure_query results
+            'notes': [str],
+            'error': str or None
+        }
+    """
+    reference = measure_reference(schema_sql, seed_sql, reference_query, limits, runs, dataset)
+    if "error" in reference:
+        return {"score": None, "user": None, "reference": reference, "notes": [], "error": f"Reference query failed: {reference['error']}"}
+
+    user = measure_query(schema_sql, seed_sql, user_query, limits, runs, dataset)
+    if "error" in user:
+        return {"score": 0, "user": user, "reference": reference, "notes": [user["error"]], "error": None}
+    if user["writes"] and not reference["writes"]:
+        note = "Modifies the data or schema, which the reference does not; only read-only queries are scored"
+        return {"score": 0, "user": user, "reference": reference, "notes": [note], "error": None}
+
+    # Counts are exact to within one interval, so smooth both sides by it
+    steps_ratio = (user["vm_steps"] + SQL_EFFICIENCY_STEP_INTERVAL) / (reference["vm_steps"] + SQL_EFFICIENCY_STEP_INTERVAL)
+    time_ratio = user["time_ms"] / reference["time_ms"] if reference["time_ms"] else None
+
+    notes = []
+    if user["full_scans"] > reference["full_scans"]:
+        notes.append(f"{user['full_scans']} full table scan(s) where the reference needs {reference['full_scans']}")
+    if user["index_searches"] < reference["index_searches"]:
+        notes.append(f"Uses {user['index_searches']} index search(es) where the reference uses {reference['index_searches']}")
+    if user["temp_btrees"] > reference["temp_btrees"]:
+        notes.append(f"{user['temp_btrees']} temporary B-tree(s) for sorting/grouping where the reference needs {reference['temp_btrees']}")
+
+    return {
+        "score": round(100 * min(1.0, 1 / steps_ratio)),
+        "steps_ratio": round(steps_ratio, 3),
+        "time_ratio": round(time_ratio, 3) if time_ratio is not None else None,
+        "user": user,
+        "reference": reference,
+        "notes": notes,
+        "error": None,
+    }
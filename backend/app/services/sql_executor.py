@@ -1,186 +1,533 @@
-import sqlite3
-import json
-from typing import Dict, List, Tuple, Any
-
-class SQLExecutor:
-    """Execute SQL queries safely in an isolated SQLite database"""
-    
-    def __init__(self):
-        # Use in-memory database for each execution
-        self.conn = None
-    
-    def setup_schema(self, schema_sql: str) -> Tuple[bool, str]:
-        """
-        Setup the database schema.
-        Args:
-            schema_sql: SQL commands to create tables and initial data
-        Returns:
-            (success, message)
-        """
-        try:
-            self.conn = sqlite3.connect(":memory:")
-            self.conn.row_factory = sqlite3.Row
-            cursor = self.conn.cursor()
-            
-            # Execute schema setup
-            cursor.executescript(schema_sql)
-            self.conn.commit()
-            
-            return True, "Schema setup successful"
-        except Exception as e:
-            return False, f"Schema setup failed: {str(e)}"
-    
-    def execute_query(self, query: str) -> Tuple[bool, Any]:
-        """
-        Execute a SQL query and return results.
-        Args:
-            query: SQL query to execute
-        Returns:
-            (success, result_or_error)
-        """
-        if not self.conn:
-            return False, "Database not initialized"
-        
-        try:
-            cursor = self.conn.cursor()
-            cursor.execute(query)
-            
-            # Fetch results
-            if query.strip().upper().startswith("SELECT"):
-                rows = cursor.fetchall()
-                results = [dict(row) for row in rows]
-                return True, results
-            else:
-                # For INSERT/UPDATE/DELETE, return affected rows count
-                self.conn.commit()
-                return True, {"affected_rows": cursor.rowcount}
-        except Exception as e:
-            return False, f"Query execution failed: {str(e)}"
-    
-    def close(self):
-        """Close the database connection"""
-        if self.conn:
-            self.conn.close()
-    
-    def compare_results(self, actual: Any, expected_json: str) -> Tuple[bool, str]:
-        """
-        Compare actual results with expected results.
-        Args:
-            actual: Query result (list of dicts)
-            expected_json: Expected result as JSON string
-        Returns:
-            (match, message)
-        """
-        try:
-            expected = json.loads(expected_json)
-            
-            # Convert dicts to comparable format
-            actual_data = json.loads(json.dumps(actual, default=str))
-            
-            if actual_data == expected:
-                return True, "Results match!"
-            else:
-                return False, f"Results don't match.\nExpected: {json.dumps(expected, indent=2)}\nActual: {json.dumps(actual_data, indent=2)}"
-        except json.JSONDecodeError as e:
-            return False, f"Invalid JSON in expected result: {str(e)}"
-        except Exception as e:
-            return False, f"Comparison failed: {str(e)}"
-
-
-def execute_sql_problem(schema_sql: str, user_query: str, test_cases: List[Dict]) -> Dict:
-    """
-    Execute a SQL problem and return test results.
-    
-    Args:
-        schema_sql: SQL schema setup
-        user_query: User's submitted SQL query (THIS QUERY IS TESTED)
-        test_cases: List of test cases with expected results (what user_query SHOULD produce)
-    
-    Returns:
-        {
-            'success': bool,
-            'total_tests': int,
-            'passed_tests': int,
-            'results': [
-                {
-                    'test_id': int,
-                    'passed': bool,
-                    'message': str,
-                    'expected_result': any
-                }
-            ],
-            'user_query': str,
-            'user_query_error': str or None  # If user query syntax is wrong
-        }
-    """
-    executor = SQLExecutor()
-    
-    # Setup schema
-    schema_ok, schema_msg = executor.setup_schema(schema_sql)
-    if not schema_ok:
-        executor.close()
-        return {
-            'success': False,
-            'total_tests': len(test_cases),
-            'passed_tests': 0,
-            'results': [],
-            'user_query': user_query,
-            'user_query_error': schema_msg
-        }
-    
-    # Execute user's query
-    user_query_error = None
-    user_result = None
-    success_exec, user_result = executor.execute_query(user_query)
-    
-    if not success_exec:
-        user_query_error = user_result
-        executor.close()
-        return {
-            'success': False,
-            'total_tests': len(test_cases),
-            'passed_tests': 0,
-            'results': [],
-            'user_query': user_query,
-            'user_query_error': user_query_error
-        }
-    
-    # Compare user's result against each test case
-    results = []
-    passed_count = 0
-    
-    for idx, test_case in enumerate(test_cases):
-        expected_result_json = test_case.get('expected_result')
-        
-        if not expected_result_json:
-            results.append({
-                'test_id': idx + 1,
-                'passed': False,
-                'message': 'Invalid test case configuration'
-            })
-            continue
-        
-        # Compare user's result with this test case
-        match, msg = executor.compare_results(user_result, expected_result_json)
-        
-        results.append({
-            'test_id': idx + 1,
-            'passed': match,
-            'message': msg,
-            'actual_result': user_result,
-            'expected_result': json.loads(expected_result_json)
-        })
-        
-        if match:
-            passed_count += 1
-    
-    executor.close()
-    
-    return {
-        'success': passed_count == len(test_cases),
-        'total_tests': len(test_cases),
-        'passed_tests': passed_count,
-        'results': results,
-        'user_query': user_query,
-        'user_query_error': user_query_error
-    }
+import sqlite3
+import json
+import os
+import time
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Tuple, Any
+from app.services.sql_compare import compare_rows, iter_cursor_batches, parse_expected, split_expected
+from app.services.sql_datasets import open_dataset, writable_copy
+from app.services.sql_templates import schema_templates
+
+# Default per-query limits; assignments can override them (see SQLLimits)
+SQL_TIME_LIMIT_MS = int(os.getenv("SQL_TIME_LIMIT_MS", "5000"))
+SQL_MAX_VM_STEPS = int(os.getenv("SQL_MAX_VM_STEPS", "100000000"))
+SQL_MAX_ROWS = int(os.getenv("SQL_MAX_ROWS", "100000"))
+SQL_MAX_RESULT_BYTES = int(os.getenv("SQL_MAX_RESULT_BYTES", str(16 * 1024 * 1024)))
+# SQLite VM instructions between limit checks
+SQL_PROGRESS_INTERVAL = 10000
+# Dataset variants of one submission graded at the same time
+SQL_DATASET_PARALLELISM = int(os.getenv("SQL_DATASET_PARALLELISM", "4"))
+
+DEFAULT_LIMITS = {
+    "time_limit_ms": SQL_TIME_LIMIT_MS,
+    "max_vm_steps": SQL_MAX_VM_STEPS,
+    "max_rows": SQL_MAX_ROWS,
+    "max_result_bytes": SQL_MAX_RESULT_BYTES,
+}
+
+
+# Pragmas that only read the schema, allowed with an argument; any other
+# pragma with an argument (an assignment such as journal_mode=off) is denied
+READ_ONLY_PRAGMAS = {"table_info", "table_xinfo", "index_list", "index_info", "index_xinfo", "foreign_key_list"}
+
+
+class QueryLimitExceeded(Exception):
+    """A query went over one of its execution limits"""
+
+
+def _value_size(value: Any) -> int:
+    if isinstance(value, (str, bytes)):
+        return len(value)
+    return 8
+
+class SQLExecutor:
+    """Execute SQL queries safely in an isolated SQLite database"""
+    
+    def __init__(self, limits: Optional[Dict[str, int]] = None, progress_interval: int = SQL_PROGRESS_INTERVAL):
+        # Use in-memory database for each execution
+        self.conn = None
+        self.limits = {**DEFAULT_LIMITS, **(limits or {})}
+        self.limit_error = None
+        self.progress_interval = progress_interval
+        self._steps = 0
+        self._deadline = 0.0
+        # Generated datasets are shared read-only files until the first write
+        self.read_only = False
+        self._savepoints: List[str] = []
+        self._copy_path = None
+        # Set while the executor runs its own statements (savepoints), which the authorizer allows
+        self._trusted = False
+    
+    def setup_schema(self, schema_sql: str, seed_sql: Optional[str] = None, dataset: Optional[Dict] = None) -> Tuple[bool, str]:
+        """
+        Setup the database schema.
+        Args:
+            schema_sql: SQL commands to create tables and initial data
+            seed_sql: Optional dataset variant script applied on top of the schema
+            dataset: Optional generated dataset spec (see sql_datasets); replaces seed_sql
+        Returns:
+            (success, message)
+        """
+        try:
+            if dataset:
+                self.conn = open_dataset(schema_sql, dataset)
+                self.read_only = True
+            else:
+                # Clone the cached template for this schema instead of re-running the script
+                self.conn = schema_templates.connect(schema_sql, seed_sql)
+            self._configure()
+            
+            return True, "Schema setup successful"
+        except Exception as e:
+            return False, f"Schema setup failed: {str(e)}"
+    
+    def _configure(self):
+        self.conn.row_factory = sqlite3.Row
+        # Statements commit on their own; no implicit BEGIN for the authorizer to deny
+        self.conn.isolation_level = None
+        # Limits and restrictions apply to user queries only, not to building the schema
+        self.conn.set_progress_handler(self._check_progress, self.progress_interval)
+        self.conn.set_authorizer(self._authorize)
+    
+    def _authorize(self, action: int, arg1: Optional[str], arg2: Optional[str], db_name: Optional[str], trigger: Optional[str]) -> int:
+        """
+        SQLite authorizer for submitted SQL: no ATTACH/DETACH (which would
+        open files on the host, also used by VACUUM INTO), no pragmas that
+        change settings, and no transaction control that could leave the
+        grading savepoint
+        """
+        if self._trusted:
+            return sqlite3.SQLITE_OK
+        if action in (sqlite3.SQLITE_ATTACH, sqlite3.SQLITE_DETACH, sqlite3.SQLITE_TRANSACTION, sqlite3.SQLITE_SAVEPOINT):
+            return sqlite3.SQLITE_DENY
+        if action == sqlite3.SQLITE_PRAGMA and arg2 is not None and arg1.lower() not in READ_ONLY_PRAGMAS:
+            return sqlite3.SQLITE_DENY
+        return sqlite3.SQLITE_OK
+    
+    @contextmanager
+    def _trusted_sql(self):
+        self._trusted = True
+        try:
+            yield
+        finally:
+            self._trusted = False
+    
+    def _make_writable(self):
+        """Move a read-only dataset connection onto a private copy, reopening any savepoints"""
+        copy, self._copy_path = writable_copy(self.conn)
+        self.conn.close()
+        self.conn = copy
+        self.read_only = False
+        self._configure()
+        with self._trusted_sql():
+            for name in self._savepoints:
+                self.conn.execute(f"SAVEPOINT {name}")
+    
+    def execute_query(self, query: str) -> Tuple[bool, Any]:
+        """
+        Execute a SQL query and return results.
+        Args:
+            query: SQL query to execute
+        Returns:
+            (success, result_or_error)
+        """
+        if not self.conn:
+            return False, "Database not initialized"
+        
+        success, cursor = self.run_query(query)
+        if not success:
+            return False, cursor
+        if cursor.description is None:
+            return True, {"affected_rows": cursor.rowcount}
+        try:
+            return True, self.fetch_rows(cursor)
+        except QueryLimitExceeded as e:
+            return False, str(e)
+    
+    def _check_progress(self) -> int:
+        """SQLite progress handler; a non-zero return interrupts the running statement"""
+        self._steps += self.progress_interval
+        if self._steps > self.limits["max_vm_steps"]:
+            self.limit_error = f"Instruction limit exceeded: query used more than {self.limits['max_vm_steps']} VM steps"
+            return 1
+        if time.monotonic() > self._deadline:
+            self.limit_error = f"Time limit exceeded: query ran longer than {self.limits['time_limit_ms']} ms"
+            return 1
+        return 0
+    
+    @property
+    def vm_steps(self) -> int:
+        """VM instructions used by the last query, to within progress_interval"""
+        return self._steps
+    
+    def fetch_batches(self, cursor: sqlite3.Cursor):
+        """
+        Yield the rows of an executed query in batches, enforcing the row and size limits.
+        Raises:
+            QueryLimitExceeded: a limit was hit while reading the rows
+        """
+        row_count = 0
+        result_bytes = 0
+        try:
+            for batch in iter_cursor_batches(cursor):
+                row_count += len(batch)
+                if row_count > self.limits["max_rows"]:
+                    raise QueryLimitExceeded(f"Row limit exceeded: result has more than {self.limits['max_rows']} rows")
+                result_bytes += sum(_value_size(value) for row in batch for value in row)
+                if result_bytes > self.limits["max_result_bytes"]:
+                    raise QueryLimitExceeded(f"Result size limit exceeded: result is larger than {self.limits['max_result_bytes']} bytes")
+                yield batch
+        except sqlite3.OperationalError:
+            if self.limit_error:
+                raise QueryLimitExceeded(self.limit_error) from None
+            raise
+    
+    def fetch_rows(self, cursor: sqlite3.Cursor) -> List[Dict[str, Any]]:
+        """Fetch all rows of an executed query as dicts, within the limits"""
+        columns = [column[0] for column in cursor.description]
+        return [dict(zip(columns, row)) for batch in self.fetch_batches(cursor) for row in batch]
+    
+    def run_query(self, query: str) -> Tuple[bool, Any]:
+        """
+        Execute a SQL query without fetching its rows.
+        Args:
+            query: SQL query to execute
+        Returns:
+            (success, cursor_or_error); cursor.description is None for
+            statements that return no rows (INSERT/UPDATE/DELETE/DDL)
+        """
+        if not self.conn:
+            return False, "Database not initialized"
+        
+        self.limit_error = None
+        self._steps = 0
+        self._deadline = time.monotonic() + self.limits["time_limit_ms"] / 1000
+        try:
+            try:
+                cursor = self.conn.cursor()
+                cursor.execute(query)
+            except sqlite3.OperationalError as e:
+                # Nothing was written yet, so the statement can simply run again on the copy
+                if not (self.read_only and "readonly" in str(e)):
+                    raise
+                self._make_writable()
+                self._deadline = time.monotonic() + self.limits["time_limit_ms"] / 1000
+                cursor = self.conn.cursor()
+                cursor.execute(query)
+            return True, cursor
+        except Exception as e:
+            if self.limit_error:
+                return False, self.limit_error
+            return False, f"Query execution failed: {str(e)}"
+    
+    def begin_savepoint(self, name: str):
+        """Open a savepoint; statements run until it is rolled back can be undone"""
+        with self._trusted_sql():
+            self.conn.execute(f"SAVEPOINT {name}")
+        self._savepoints.append(name)
+    
+    def rollback_savepoint(self, name: str):
+        """Undo everything since the savepoint and close it"""
+        with self._trusted_sql():
+            self.conn.execute(f"ROLLBACK TO {name}")
+            self.conn.execute(f"RELEASE {name}")
+        del self._savepoints[self._savepoints.index(name):]
+    
+    def close(self):
+        """Close the database connection"""
+        if self.conn:
+            self.conn.close()
+        if self._copy_path:
+            os.remove(self._copy_path)
+            self._copy_path = None
+    
+    def compare_results(self, actual: Any, expected_json: str, expected_value: Any = None) -> Tuple[bool, str]:
+        """
+        Compare actual results with expected results.
+        Args:
+            actual: Query result (list of dicts)
+            expected_json: Expected result as JSON string
+            expected_value: expected_json already decoded, if available
+        Returns:
+            (match, message)
+        """
+        try:
+            expected, options = split_expected(expected_value) if expected_value is not None else parse_expected(expected_json)
+            
+            if isinstance(actual, list) and _is_row_list(expected):
+                columns = list(actual[0].keys()) if actual else (list(expected[0].keys()) if expected else [])
+                rows = [tuple(row[column] for column in columns) for row in actual]
+                comparison = compare_rows(columns, [rows], expected, **options)
+                return comparison.match, comparison.message
+            
+            if actual == expected:
+                return True, "Results match!"
+            else:
+                return False, f"Results don't match.\nExpected: {json.dumps(expected)}\nActual: {json.dumps(actual, default=str)}"
+        except json.JSONDecodeError as e:
+            return False, f"Invalid JSON in expected result: {str(e)}"
+        except Exception as e:
+            return False, f"Comparison failed: {str(e)}"
+    
+    def compare_cursor(self, cursor: sqlite3.Cursor, expected_json: str, expected_value: Any = None) -> Tuple[bool, str, Any]:
+        """
+        Compare the rows of an executed query with expected results, reading
+        them in batches so large results are never fully materialized.
+        Args:
+            cursor: Cursor of an executed result-returning query
+            expected_json: Expected result as JSON string
+            expected_value: expected_json already decoded, if available
+        Returns:
+            (match, message, actual_preview)
+        """
+        try:
+            expected, options = split_expected(expected_value) if expected_value is not None else parse_expected(expected_json)
+            
+            if not _is_row_list(expected):
+                actual = self.fetch_rows(cursor)
+                match, msg = self.compare_results(actual, expected_json, expected_value)
+                return match, msg, actual
+            
+            columns = [column[0] for column in cursor.description]
+            comparison = compare_rows(columns, self.fetch_batches(cursor), expected, **options)
+            return comparison.match, comparison.message, comparison.preview
+        except QueryLimitExceeded as e:
+            return False, str(e), None
+        except json.JSONDecodeError as e:
+            return False, f"Invalid JSON in expected result: {str(e)}", None
+        except Exception as e:
+            return False, f"Comparison failed: {str(e)}", None
+
+
+def split_statements(sql: str) -> List[str]:
+    """Split a SQL script into complete statements (semicolons inside literals are kept)"""
+    statements = []
+    buffer = ""
+    for part in sql.split(";"):
+        buffer += part + ";"
+        if sqlite3.complete_statement(buffer):
+            if buffer.strip(" \t\r\n;"):
+                statements.append(buffer.strip())
+            buffer = ""
+    if buffer.strip(" \t\r\n;"):
+        # Incomplete trailing statement; let SQLite report the error
+        statements.append(buffer.strip()[:-1])
+    return statements
+
+
+def _is_row_list(expected: Any) -> bool:
+    return isinstance(expected, list) and all(isinstance(row, dict) for row in expected)
+
+
+def _grade_dataset(schema_sql: str, seed_sql: Optional[str], user_query: str, cases: List[Tuple[int, Dict]], limits: Optional[Dict[str, int]], on_result: Optional[Callable[[Dict], None]]) -> Tuple[List[Dict], Optional[str]]:
+    """
+    Run the user's statements on one dataset (the schema plus an optional seed
+    script) and grade the test cases that use it.
+    Returns:
+        (results, user_query_error); results is empty when the schema or the
+        user's statements failed on this dataset
+    """
+    executor = SQLExecutor(limits)
+    
+    # Setup schema
+    schema_ok, schema_msg = executor.setup_schema(schema_sql, seed_sql)
+    if not schema_ok:
+        executor.close()
+        return [], schema_msg
+    
+    # A test case with a verification query checks the database state left by the user's statements
+    verification = any(test_case.get('verification_query') for _, test_case in cases)
+    if verification:
+        executor.begin_savepoint("submission")
+    
+    # Execute user's statements; the last one's result is compared directly
+    user_result = None
+    statements = split_statements(user_query) or [user_query]
+    for statement in statements[:-1]:
+        success_exec, cursor = executor.run_query(statement)
+        if not success_exec:
+            break
+        cursor.close()
+    else:
+        changes_before = executor.conn.total_changes
+        success_exec, cursor = executor.run_query(statements[-1])
+    
+    # Expected results compared with the user's own result (not a verification query)
+    direct_expected = {test_case.get('expected_result') for _, test_case in cases if test_case.get('expected_result') and not test_case.get('verification_query')}
+    if success_exec and cursor.description is not None and (executor.conn.total_changes != changes_before or len(direct_expected) > 1):
+        # The statement runs once: rows from one with side effects (e.g. RETURNING)
+        # cannot be re-read, and several expected results all compare the same rows
+        try:
+            user_result = executor.fetch_rows(cursor)
+        except QueryLimitExceeded as e:
+            success_exec, cursor = False, str(e)
+    
+    if not success_exec:
+        executor.close()
+        return [], cursor
+    
+    if cursor.description is None:
+        user_result = {"affected_rows": cursor.rowcount}
+    # Otherwise, unless already fetched, rows are streamed from the cursor for the one expected result
+    
+    def run_and_compare(query: str, expected_result_json: str, expected_value: Any) -> Tuple[bool, str, Any]:
+        success_exec, cursor = executor.run_query(query)
+        if not success_exec:
+            return False, cursor, None
+        if cursor.description is None:
+            actual = {"affected_rows": cursor.rowcount}
+            match, msg = executor.compare_results(actual, expected_result_json, expected_value)
+            return match, msg, actual
+        comparison = executor.compare_cursor(cursor, expected_result_json, expected_value)
+        cursor.close()
+        return comparison
+    
+    # Compare user's result (or the verification query result) against each test case
+    results = []
+    comparisons = {}  # (verification query, expected_result) -> (match, message, actual_result)
+    
+    for idx, test_case in cases:
+        expected_result_json = test_case.get('expected_result')
+        expected_value = test_case.get('expected_value')  # pre-decoded by the assignment cache
+        verify_query = test_case.get('verification_query')
+        
+        if not expected_result_json:
+            results.append({
+                'test_id': idx + 1,
+                'passed': False,
+                'message': 'Invalid test case configuration'
+            })
+            if on_result:
+                on_result(results[-1])
+            continue
+        
+        key = (verify_query, expected_result_json)
+        if key not in comparisons:
+            if verify_query:
+                # Independent cases: undo whatever the verification query changed
+                executor.begin_savepoint("test_case")
+                comparisons[key] = run_and_compare(verify_query, expected_result_json, expected_value)
+                executor.rollback_savepoint("test_case")
+            elif user_result is not None:
+                match, msg = executor.compare_results(user_result, expected_result_json, expected_value)
+                comparisons[key] = (match, msg, user_result)
+            else:
+                comparisons[key] = executor.compare_cursor(cursor, expected_result_json, expected_value)
+                cursor.close()
+        match, msg, actual_result = comparisons[key]
+        if expected_value is None:
+            try:
+                expected_value = json.loads(expected_result_json)
+            except ValueError:
+                # Already reported by the comparison message
+                expected_value = expected_result_json
+        
+        results.append({
+            'test_id': idx + 1,
+            'passed': match,
+            'message': msg,
+            'actual_result': actual_result,
+            'expected_result': expected_value
+        })
+        if seed_sql:
+            results[-1]['dataset'] = test_case.get('dataset')
+
+        if on_result:
+            on_result(results[-1])
+    
+    executor.close()
+    return results, None
+
+
+def execute_sql_problem(schema_sql: str, user_query: str, test_cases: List[Dict], on_result: Optional[Callable[[Dict], None]] = None, limits: Optional[Dict[str, int]] = None, performance: Optional[Dict] = None) -> Dict:
+    """
+    Execute a SQL problem and return test results.
+    
+    Test cases with a 'seed_sql' dataset variant are graded against the schema
+    plus that seed script; each distinct dataset runs concurrently on its own
+    connection.
+    
+    Args:
+        schema_sql: SQL schema setup
+        user_query: User's submitted SQL (THIS IS TESTED); may contain several statements
+        test_cases: List of test cases with expected results (what user_query SHOULD produce),
+            or with a 'verification_query' whose result over the state left by
+            user_query is compared instead (assignments with sql_verification);
+            optionally 'seed_sql' and a 'dataset' label
+        on_result: Called with each test result as soon as it is known
+        limits: Overrides of DEFAULT_LIMITS (time_limit_ms, max_vm_steps, max_rows, max_result_bytes)
+        performance: Efficiency grading settings {'reference_query', 'seed_sql', 'dataset', 'runs'};
+            applied once all test cases pass
+    
+    Returns:
+        {
+            'success': bool,
+            'total_tests': int,
+            'passed_tests': int,
+            'results': [
+                {
+                    'test_id': int,
+                    'passed': bool,
+                    'message': str,
+                    'expected_result': any,
+                    'dataset': str  # only for test cases with a seed_sql variant
+                }
+            ],
+            'user_query': str,
+            'user_query_error': str or None,  # If user query syntax is wrong or a limit was exceeded
+            'datasets': [...],  # per-variant summary, only when variants are used
+            'efficiency': {...}  # sql_efficiency.grade_efficiency result, only with performance
+        }
+    """
+    # Group test cases by dataset variant (None = the assignment schema alone)
+    datasets: Dict[Optional[str], List[Tuple[int, Dict]]] = {}
+    for idx, test_case in enumerate(test_cases):
+        datasets.setdefault(test_case.get('seed_sql') or None, []).append((idx, test_case))
+    if not datasets:
+        datasets[None] = []
+    
+    def grade(seed_sql: Optional[str]) -> Tuple[List[Dict], Optional[str]]:
+        return _grade_dataset(schema_sql, seed_sql, user_query, datasets[seed_sql], limits, on_result)
+    
+    if len(datasets) == 1:
+        outcomes = [grade(next(iter(datasets)))]
+    else:
+        # sqlite3 releases the GIL while a statement runs, so variants overlap
+        with ThreadPoolExecutor(max_workers=min(len(datasets), SQL_DATASET_PARALLELISM)) as pool:
+            outcomes = list(pool.map(grade, datasets))
+    
+    results = sorted((result for dataset_results, _ in outcomes for result in dataset_results), key=lambda r: r['test_id'])
+    errors = [error for _, error in outcomes if error]
+    passed_count = sum(1 for result in results if result['passed'])
+    
+    response = {
+        'success': passed_count == len(test_cases) and not errors,
+        'total_tests': len(test_cases),
+        'passed_tests': passed_count,
+        'results': results if not errors or len(datasets) > 1 else [],
+        'user_query': user_query,
+        'user_query_error': errors[0] if errors else None
+    }
+    if any(seed_sql for seed_sql in datasets):
+        response['datasets'] = [
+            {
+                'dataset': cases[0][1].get('dataset') if seed_sql else None,
+                'test_ids': [idx + 1 for idx, _ in cases],
+                'passed_tests': sum(1 for result in dataset_results if result['passed']),
+                'user_query_error': error
+            }
+            for (seed_sql, cases), (dataset_results, error) in zip(datasets.items(), outcomes)
+        ]
+    if performance and response['success']:
+        from app.services.sql_efficiency import grade_efficiency  # imports this module
+        response['efficiency'] = grade_efficiency(
+            schema_sql,
+            user_query,
+            performance['reference_query'],
+            seed_sql=performance.get('seed_sql'),
+            dataset=performance.get('dataset'),
+            limits=limits,
+            **({'runs': performance['runs']} if performance.get('runs') else {})
+        )
+    return response
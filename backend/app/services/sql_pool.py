@@ -0,0 +1,126 @@
+"""
+Process pool for SQL grading
+SQL grading is mostly Python work (row conversion and comparison), so it
+runs in worker processes instead of the request threads. Each worker keeps
+its own schema template cache resident, so repeated submissions to the same
+assignment only pay for a backup-API clone; every worker, including those
+started to replace recycled ones, prebuilds the warm-up schemas first. Workers are recycled after
+SQL_POOL_MAX_TASKS gradings, and at most SQL_POOL_WORKERS + SQL_POOL_QUEUE
+gradings are admitted at once; further submissions wait up to
+SQL_POOL_QUEUE_TIMEOUT seconds for a slot.
+"""
+
+import atexit
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from typing import Dict, List, Optional
+
+from app.services.sql_executor import execute_sql_problem
+from app.services.sql_templates import schema_templates
+
+SQL_POOL_WORKERS = int(os.getenv("SQL_POOL_WORKERS", str(os.cpu_count() or 1)))
+SQL_POOL_MAX_TASKS = int(os.getenv("SQL_POOL_MAX_TASKS", "500"))
+SQL_POOL_QUEUE = int(os.getenv("SQL_POOL_QUEUE", str(4 * max(SQL_POOL_WORKERS, 1))))
+SQL_POOL_QUEUE_TIMEOUT = float(os.getenv("SQL_POOL_QUEUE_TIMEOUT", "10"))
+
+
+class SQLPoolBusy(Exception):
+    """Raised when the grading queue stays full for SQL_POOL_QUEUE_TIMEOUT seconds"""
+
+
+def _warm(schemas: List[str]) -> int:
+    """Build schema templates in a worker process ahead of the first submission"""
+    built = 0
+    for schema_sql in schemas:
+        try:
+            schema_templates.connect(schema_sql).close()
+            built += 1
+        except Exception:
+            pass
+    return built
+
+
+class SQLGradingPool:
+    """Bounded front end to a recycling ProcessPoolExecutor running execute_sql_problem"""
+
+    def __init__(self, workers: int = SQL_POOL_WORKERS, max_tasks: int = SQL_POOL_MAX_TASKS, queue_size: int = SQL_POOL_QUEUE):
+        self.workers = workers
+        self.max_tasks = max_tasks
+        self._slots = threading.BoundedSemaphore(workers + queue_size)
+        self._lock = threading.Lock()
+        self._warm_schemas: List[str] = []
+        self._executor = self._create_executor()
+
+    def _create_executor(self) -> ProcessPoolExecutor:
+        # Recycling workers is not supported with fork, so workers are spawned
+        return ProcessPoolExecutor(
+            max_workers=self.workers,
+            mp_context=multiprocessing.get_context("spawn"),
+            max_tasks_per_child=self.max_tasks,
+            initializer=_warm,
+            initargs=(self._warm_schemas,)
+        )
+
+    def warm(self, schemas: List[str]):
+        """
+        Prebuild the given schema templates in every worker process, also
+        those started later, and start the workers now (does not wait)
+        """
+        with self._lock:
+            # Read (pickled) by the initializer whenever a worker is spawned
+            self._warm_schemas[:] = schemas
+            for _ in range(self.workers):
+                self._executor.submit(int)
+
+    def grade(self, schema_sql: str, user_query: str, test_cases: List[Dict], limits: Optional[Dict[str, int]] = None, performance: Optional[Dict] = None) -> Dict:
+        """
+        Run execute_sql_problem in a worker process
+
+        Raises:
+            SQLPoolBusy: no queue slot became free in time
+        """
+        if not self._slots.acquire(timeout=SQL_POOL_QUEUE_TIMEOUT):
+            raise SQLPoolBusy("SQL grading queue is full")
+        try:
+            with self._lock:
+                executor = self._executor
+            try:
+                return executor.submit(execute_sql_problem, schema_sql, user_query, test_cases, None, limits, performance).result()
+            except BrokenProcessPool:
+                # A worker died (e.g. out of memory); replace the pool for later submissions
+                with self._lock:
+                    if self._executor is executor:
+                        self._executor = self._create_executor()
+                return {
+                    'success': False,
+                    'total_tests': len(test_cases),
+                    'passed_tests': 0,
+                    'results': [],
+                    'user_query': user_query,
+                    'user_query_error': "Execution error: SQL grading worker crashed"
+                }
+        finally:
+            self._slots.release()
+
+    def shutdown(self):
+        with self._lock:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+_pool: Optional[SQLGradingPool] = None
+_pool_lock = threading.Lock()
+
+
+def get_sql_grading_pool() -> Optional[SQLGradingPool]:
+    """Return the process-wide SQL grading pool, or None when it is disabled"""
+    global _pool
+    if SQL_POOL_WORKERS <= 0:
+        return None
+    with _pool_lock:
+        if _pool is None:
+            _pool = SQLGradingPool()
+            atexit.register(_pool.shutdown)
+        return _pool
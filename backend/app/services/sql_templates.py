@@ -0,0 +1,170 @@
+"""
+Cache of prebuilt SQL assignment databases
+Each distinct `Assignment.sql_schema` script is executed once into an
+in-memory template database, keyed by a hash of the script, so editing the
+schema naturally produces a new template. Dataset variants (a test case's
+seed script on top of the schema) are cached the same way, built from a
+clone of the schema template. Submissions get a private copy cloned with
+the SQLite backup API instead of re-running the scripts.
+Templates are evicted LRU-first once the entry or byte budget is exceeded.
+"""
+
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+from collections import OrderedDict
+from concurrent.futures import Future
+from typing import Any, Dict, Optional
+
+SQL_TEMPLATE_CACHE_ENABLED = os.getenv("SQL_TEMPLATE_CACHE_ENABLED", "true").lower() == "true"
+SQL_TEMPLATE_CACHE_MAX_ENTRIES = int(os.getenv("SQL_TEMPLATE_CACHE_MAX_ENTRIES", "64"))
+SQL_TEMPLATE_CACHE_MAX_BYTES = int(os.getenv("SQL_TEMPLATE_CACHE_MAX_BYTES", str(256 * 1024 * 1024)))
+
+# Connection settings such as foreign_keys are not part of the copied database
+PRAGMA_STATEMENT = re.compile(r"^\s*PRAGMA\s+[^;]+;?", re.IGNORECASE | re.MULTILINE)
+
+
+def schema_key(schema_sql: str, seed_sql: Optional[str] = None) -> str:
+    key = hashlib.sha256((schema_sql or "").encode("utf-8")).hexdigest()
+    if seed_sql:
+        key += ":" + hashlib.sha256(seed_sql.encode("utf-8")).hexdigest()
+    return key
+
+
+class _Template:
+    """A built schema database; clones are serialized because they read the shared connection"""
+
+    def __init__(self, conn: sqlite3.Connection, schema_sql: str):
+        self.conn = conn
+        self.pragmas = [statement.rstrip(";") for statement in PRAGMA_STATEMENT.findall(schema_sql)]
+        self.size = conn.execute("PRAGMA page_count").fetchone()[0] * conn.execute("PRAGMA page_size").fetchone()[0]
+        self.lock = threading.Lock()
+
+    def clone(self) -> sqlite3.Connection:
+        target = sqlite3.connect(":memory:", check_same_thread=False)
+        with self.lock:
+            self.conn.backup(target)
+        for pragma in self.pragmas:
+            target.execute(pragma)
+        return target
+
+
+class SchemaTemplateCache:
+    """Thread-safe LRU of schema templates with single-flight builds"""
+
+    def __init__(self, max_entries: int = SQL_TEMPLATE_CACHE_MAX_ENTRIES, max_bytes: int = SQL_TEMPLATE_CACHE_MAX_BYTES, enabled: bool = SQL_TEMPLATE_CACHE_ENABLED):
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.enabled = enabled
+        self._templates: "OrderedDict[str, _Template]" = OrderedDict()
+        self._building: Dict[str, Future] = {}
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.builds = 0
+        self.evictions = 0
+
+    def _build(self, schema_sql: str, seed_sql: Optional[str] = None) -> sqlite3.Connection:
+        # A variant starts from (a clone of) the schema template
+        if seed_sql:
+            conn = self.connect(schema_sql)
+            script = seed_sql
+        else:
+            conn = sqlite3.connect(":memory:", check_same_thread=False)
+            script = schema_sql
+        try:
+            conn.executescript(script)
+            conn.commit()
+        except Exception:
+            conn.close()
+            raise
+        return conn
+
+    def _store(self, key: str, template: _Template):
+        """Insert a template and evict down to the budgets (caller holds the lock)"""
+        self._templates[key] = template
+        self._bytes += template.size
+        while len(self._templates) > self.max_entries or self._bytes > self.max_bytes:
+            _, evicted = self._templates.popitem(last=False)
+            self._bytes -= evicted.size
+            self.evictions += 1
+            # Clones in progress hold the template lock; close once they finish
+            with evicted.lock:
+                evicted.conn.close()
+
+    def _get_template(self, schema_sql: str, seed_sql: Optional[str] = None) -> _Template:
+        key = schema_key(schema_sql, seed_sql)
+        with self._lock:
+            template = self._templates.get(key)
+            if template is not None:
+                self._templates.move_to_end(key)
+                self.hits += 1
+                return template
+            future = self._building.get(key)
+            owner = future is None
+            if owner:
+                future = Future()
+                self._building[key] = future
+
+        if not owner:
+            return future.result()
+
+        try:
+            template = _Template(self._build(schema_sql, seed_sql), schema_sql + "\n" + (seed_sql or ""))
+            with self._lock:
+                self.builds += 1
+                if template.size <= self.max_bytes:
+                    self._store(key, template)
+            future.set_result(template)
+            return template
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                del self._building[key]
+
+    def connect(self, schema_sql: str, seed_sql: Optional[str] = None) -> sqlite3.Connection:
+        """
+        Return a new private in-memory database containing the schema and seed
+        data, plus the dataset variant's seed script when given
+
+        Raises:
+            sqlite3.Error: the schema or seed script failed
+        """
+        if not self.enabled:
+            return self._build(schema_sql, seed_sql)
+
+        while True:
+            template = self._get_template(schema_sql, seed_sql)
+            try:
+                return template.clone()
+            except sqlite3.ProgrammingError:
+                # Evicted (and closed) between lookup and clone; fetch again
+                continue
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "templates": len(self._templates),
+                "bytes": self._bytes,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "builds": self.builds,
+                "evictions": self.evictions,
+            }
+
+    def clear(self):
+        with self._lock:
+            for template in self._templates.values():
+                with template.lock:
+                    template.conn.close()
+            self._templates.clear()
+            self._bytes = 0
+
+
+schema_templates = SchemaTemplateCache()
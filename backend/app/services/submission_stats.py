@@ -0,0 +1,133 @@
+"""
+Submission statistics for the admin dashboards
+Every submission insert also bumps its assignment's row in
+submission_counters, in the same transaction, so per-assignment stats are a
+primary-key lookup. The row is created with the assignment (and backfilled
+for older ones by migration v004). Assignments still without a row (inserted
+outside the app) fall back to one conditional-aggregation query, and the
+first new submission initializes their row from that aggregate.
+"""
+
+from typing import Any, Dict, List
+
+from sqlalchemy import case, func, select
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.assignment import Assignment
+from app.models.submission import Submission
+from app.models.submission_counters import SubmissionCounters
+from app.models.user import User
+
+
+def _aggregate_columns():
+    """total, passed, failed and distinct submitters over the selected submissions"""
+    return (
+        func.count(Submission.id).label("total"),
+        func.coalesce(func.sum(case((Submission.status == "pass", 1), else_=0)), 0).label("passed"),
+        func.coalesce(func.sum(case((Submission.status == "fail", 1), else_=0)), 0).label("failed"),
+        func.count(func.distinct(Submission.user_id)).label("submitters"),
+    )
+
+
+def _user_count():
+    return select(func.count(User.id)).scalar_subquery()
+
+
+def record_submission(db: Session, submission: Submission):
+    """
+    Add a submission and update its assignment's counters; the caller commits
+    both together.
+    """
+    db.add(submission)
+    db.flush()
+    if _increment(db, submission):
+        return
+
+    # No counters row yet: start from the full aggregate, which includes this submission
+    row = db.query(*_aggregate_columns()).filter(Submission.assignment_id == submission.assignment_id).one()
+    try:
+        with db.begin_nested():
+            db.add(SubmissionCounters(assignment_id=submission.assignment_id, **row._mapping))
+    except IntegrityError:
+        # A concurrent submission created the row first; its aggregate could not
+        # see this uncommitted submission, so count it on top
+        _increment(db, submission)
+
+
+def _increment(db: Session, submission: Submission) -> bool:
+    """Add a flushed submission to its assignment's counters row; False when there is no row"""
+    counters = db.query(SubmissionCounters).filter(SubmissionCounters.assignment_id == submission.assignment_id)
+    updated = counters.update({
+        SubmissionCounters.total: SubmissionCounters.total + 1,
+        SubmissionCounters.passed: SubmissionCounters.passed + (1 if submission.status == "pass" else 0),
+        SubmissionCounters.failed: SubmissionCounters.failed + (1 if submission.status == "fail" else 0),
+    }, synchronize_session=False)
+    if not updated:
+        return False
+
+    # Counted in a separate statement after the UPDATE took the row lock, so a
+    # concurrent submission by the same user has committed and is visible
+    # (READ COMMITTED); a count of 1 is this submission only
+    user_submissions = db.query(func.count(Submission.id)).filter(
+        Submission.assignment_id == submission.assignment_id,
+        Submission.user_id == submission.user_id
+    ).scalar()
+    if user_submissions == 1:
+        counters.update({SubmissionCounters.submitters: SubmissionCounters.submitters + 1}, synchronize_session=False)
+    return True
+
+
+def assignment_stats(db: Session, assignment_id: int) -> Dict[str, int]:
+    """Submission counts of one assignment in a single query"""
+    row = db.query(
+        SubmissionCounters.total, SubmissionCounters.passed, SubmissionCounters.failed, SubmissionCounters.submitters,
+        _user_count().label("users")
+    ).filter(SubmissionCounters.assignment_id == assignment_id).first()
+    if row is None:
+        row = db.query(*_aggregate_columns(), _user_count().label("users")).filter(Submission.assignment_id == assignment_id).one()
+
+    return {
+        "total_submissions": row.total,
+        "passed_submissions": row.passed,
+        "failed_submissions": row.failed,
+        "submitted": row.submitters,
+        "remaining": row.users - row.submitters
+    }
+
+
+def completion_stats(db: Session) -> Dict[str, Any]:
+    """
+    Stats of every assignment plus how many users completed (passed) how many
+    assignments, each computed with one GROUP BY query
+    """
+    total_users = db.query(func.count(User.id)).scalar()
+
+    per_assignment = db.query(Submission.assignment_id, *_aggregate_columns()).group_by(Submission.assignment_id).subquery()
+    rows = db.query(
+        Assignment.id, per_assignment.c.total, per_assignment.c.passed, per_assignment.c.failed, per_assignment.c.submitters
+    ).outerjoin(per_assignment, per_assignment.c.assignment_id == Assignment.id).order_by(Assignment.id).all()
+    assignments: List[Dict[str, int]] = [
+        {
+            "assignment_id": row.id,
+            "total_submissions": row.total or 0,
+            "passed_submissions": row.passed or 0,
+            "failed_submissions": row.failed or 0,
+            "submitted": row.submitters or 0,
+            "remaining": total_users - (row.submitters or 0)
+        }
+        for row in rows
+    ]
+
+    completed_per_user = db.query(
+        func.count(func.distinct(Submission.assignment_id)).label("completed")
+    ).filter(Submission.status == "pass").group_by(Submission.user_id).subquery()
+    distribution = db.query(
+        completed_per_user.c.completed, func.count().label("users")
+    ).group_by(completed_per_user.c.completed).order_by(completed_per_user.c.completed).all()
+    completion = [{"assignments_completed": row.completed, "user_count": row.users} for row in distribution]
+    without_pass = total_users - sum(row.users for row in distribution)
+    if without_pass > 0:
+        completion.insert(0, {"assignments_completed": 0, "user_count": without_pass})
+
+    return {"completion_stats": completion, "assignments": assignments, "total_users": total_users}
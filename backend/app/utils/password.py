@@ -1,10 +1,10 @@
-from passlib.context import CryptContext
-
-# Use pbkdf2_sha256 to avoid bcrypt native dependency issues on some systems.
-pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
-
-def hash_password(password: str):
-    return pwd_context.hash(password)
-
-def verify_password(plain_password: str, hashed_password: str):
-    return pwd_context.verify(plain_password, hashed_password)
+from passlib.context import CryptContext
+
+# Use pbkdf2_sha256 to avoid bcrypt native dependency issues on some systems.
+pwd_context = CryptContext(schemes=["pbkdf2_sha256"], deprecated="auto")
+
+def hash_password(password: str):
+    return pwd_context.hash(password)
+
+def verify_password(plain_password: str, hashed_password: str):
+    return pwd_context.verify(plain_password, hashed_password)
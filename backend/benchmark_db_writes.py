@@ -0,0 +1,104 @@
+#!/usr/bin/env python
+"""
+Concurrent submission-write benchmark: SQLAlchemy defaults vs the tuned engine
+Each worker thread repeatedly does what a graded submission does to the
+database: read the assignment's test cases, insert a Submission and update
+its counters (record_submission), then commit. The same workload runs on a
+fresh SQLite file with a plain create_engine() and with create_db_engine()
+(pool sizing, WAL, synchronous=NORMAL, busy_timeout, mmap).
+Run:
+    python benchmark_db_writes.py [--threads 16] [--writes 200]
+"""
+import argparse
+import os
+import tempfile
+import threading
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("JWT_SECRET", "benchmark")
+os.environ.setdefault("AWS_LAMBDA_FUNCTION", "benchmark")
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.database import create_db_engine
+from app.migrations import run_migrations
+from app.models import Assignment, Submission, TestCase, User
+from app.services.submission_stats import record_submission
+
+
+def run(engine, threads: int, writes: int) -> dict:
+    run_migrations(engine)
+    Session = sessionmaker(bind=engine, autoflush=False)
+    with Session() as db:
+        db.add_all([User(id=i, name=f"u{i}", email=f"u{i}@example.com", password="x", role="employee", domain="data") for i in range(1, threads + 1)])
+        db.add(Assignment(id=1, title="t", description="d", domain="data", difficulty="easy", problem_type="coding", language="python"))
+        db.add_all([TestCase(assignment_id=1, input=str(i), expected_output=str(i)) for i in range(10)])
+        db.commit()
+
+    committed = 0
+    errors = []
+    latencies = []
+    lock = threading.Lock()
+
+    def worker(user_id: int):
+        nonlocal committed
+        for i in range(writes):
+            start = time.perf_counter()
+            db = Session()
+            try:
+                db.query(TestCase).filter(TestCase.assignment_id == 1).all()
+                record_submission(db, Submission(assignment_id=1, user_id=user_id, code="print(1)", status="pass" if i % 2 else "fail", output="", score=0))
+                db.commit()
+                with lock:
+                    committed += 1
+                    latencies.append(time.perf_counter() - start)
+            except Exception as e:
+                db.rollback()
+                with lock:
+                    errors.append(type(e).__name__ + ": " + str(e).splitlines()[0])
+            finally:
+                db.close()
+
+    started = time.perf_counter()
+    workers = [threading.Thread(target=worker, args=(user_id,)) for user_id in range(1, threads + 1)]
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    elapsed = time.perf_counter() - started
+
+    latencies.sort()
+    engine.dispose()
+    return {
+        "writes/s": round(committed / elapsed, 1),
+        "committed": committed,
+        "errors": len(errors),
+        "locked": sum(1 for error in errors if "locked" in error),
+        "p50_ms": round(latencies[len(latencies) // 2] * 1000, 1) if latencies else None,
+        "p99_ms": round(latencies[int(len(latencies) * 0.99)] * 1000, 1) if latencies else None,
+        "first_error": errors[0] if errors else None,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--threads", type=int, default=16)
+    parser.add_argument("--writes", type=int, default=200, help="writes per thread")
+    args = parser.parse_args()
+
+    directory = tempfile.mkdtemp()
+    profiles = {
+        "defaults": lambda url: create_engine(url, connect_args={"check_same_thread": False}),
+        "tuned": create_db_engine,
+    }
+    print(f"{args.threads} threads x {args.writes} submissions on SQLite\n")
+    for name, make_engine in profiles.items():
+        url = f"sqlite:///{os.path.join(directory, name + '.db')}"
+        result = run(make_engine(url), args.threads, args.writes)
+        print(f"{name:<9} " + "  ".join(f"{key}={value}" for key, value in result.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+"""
+Local stand-in for the Judge0 API, for testing the executors without RapidAPI
+Runs submitted Python/JavaScript code with the local interpreters and serves
+the subset of the Judge0 CE API the backend uses:
+
+    POST /submissions            GET /submissions/{token}
+    POST /submissions/batch      GET /submissions/batch?tokens=a,b,c
+    PUT {callback_url}           (sent when a submission finishes)
+
+Usage:
+    python fake_judge0_server.py --port 2358 --delay 0.3
+    JUDGE0_API_URL=http://127.0.0.1:2358 uvicorn app.main:app
+"""
+import argparse
+import base64
+import json
+import subprocess
+import sys
+import threading
+import time
+import urllib.request
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlparse, parse_qs, unquote
+
+COMMANDS = {
+    71: [sys.executable, '-c'],  # Python 3
+    63: ['node', '-e'],  # Node.js
+}
+
+STATUSES = {
+    1: "In Queue",
+    2: "Processing",
+    3: "Accepted",
+    5: "Time Limit Exceeded",
+    11: "Runtime Error (NZEC)",
+    13: "Internal Error",
+}
+
+submissions = {}
+submissions_lock = threading.Lock()
+options = argparse.Namespace(delay=0.0)
+
+
+def b64(text):
+    return base64.b64encode(text.encode('utf-8')).decode('ascii') if text else None
+
+
+def set_status(submission, status_id):
+    submission['status'] = {"id": status_id, "description": STATUSES[status_id]}
+
+
+def run_submission(token):
+    with submissions_lock:
+        submission = submissions[token]
+    time.sleep(options.delay)
+    set_status(submission, 2)
+
+    command = COMMANDS.get(submission['language_id'])
+    start = time.time()
+    try:
+        if command is None:
+            raise ValueError(f"Unsupported language_id {submission['language_id']}")
+        completed = subprocess.run(
+            command + [submission['source_code']],
+            input=submission.get('stdin') or '',
+            capture_output=True,
+            text=True,
+            timeout=float(submission.get('wall_time_limit') or 10)
+        )
+        submission['stdout'] = completed.stdout
+        submission['stderr'] = completed.stderr
+        set_status(submission, 3 if completed.returncode == 0 else 11)
+    except subprocess.TimeoutExpired:
+        set_status(submission, 5)
+    except Exception as e:
+        submission['stderr'] = str(e)
+        set_status(submission, 13)
+    submission['time'] = f"{time.time() - start:.3f}"
+
+    callback_url = submission.get('callback_url')
+    if callback_url:
+        body = json.dumps(serialize(submission, True, None)).encode('utf-8')
+        headers = {"content-type": "application/json"}
+        # Like Judge0, send credentials in the URL as HTTP Basic auth
+        url = urlparse(callback_url)
+        if url.username is not None:
+            credentials = f"{unquote(url.username)}:{unquote(url.password or '')}".encode('utf-8')
+            headers["authorization"] = f"Basic {base64.b64encode(credentials).decode('ascii')}"
+            callback_url = url._replace(netloc=url.netloc.rpartition('@')[2]).geturl()
+        request = urllib.request.Request(callback_url, data=body, method='PUT', headers=headers)
+        try:
+            urllib.request.urlopen(request, timeout=5).read()
+        except Exception as e:
+            print(f"Callback to {callback_url} failed: {e}")
+
+
+def create_submission(payload):
+    token = str(uuid.uuid4())
+    submission = dict(payload, token=token, stdout=None, stderr=None, compile_output=None, time=None)
+    set_status(submission, 1)
+    with submissions_lock:
+        submissions[token] = submission
+    threading.Thread(target=run_submission, args=(token,), daemon=True).start()
+    return token
+
+
+def serialize(submission, base64_encoded, fields):
+    data = {
+        "token": submission['token'],
+        "status": submission['status'],
+        "time": submission['time'],
+        "stdout": submission['stdout'],
+        "stderr": submission['stderr'],
+        "compile_output": submission['compile_output'],
+    }
+    if base64_encoded:
+        for key in ("stdout", "stderr", "compile_output"):
+            data[key] = b64(data[key])
+    if fields and fields != '*':
+        data = {key: value for key, value in data.items() if key in fields.split(',')}
+    return data
+
+
+class Judge0Handler(BaseHTTPRequestHandler):
+    def send_json(self, status, body):
+        encoded = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('content-type', 'application/json')
+        self.send_header('content-length', str(len(encoded)))
+        self.end_headers()
+        self.wfile.write(encoded)
+
+    def read_json(self):
+        length = int(self.headers.get('content-length') or 0)
+        return json.loads(self.rfile.read(length) or b'{}')
+
+    def do_POST(self):
+        path = urlparse(self.path).path
+        if path == '/submissions':
+            self.send_json(201, {"token": create_submission(self.read_json())})
+        elif path == '/submissions/batch':
+            payloads = self.read_json().get('submissions', [])
+            self.send_json(201, [{"token": create_submission(payload)} for payload in payloads])
+        else:
+            self.send_json(404, {"error": "not found"})
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        query = parse_qs(url.query)
+        base64_encoded = query.get('base64_encoded', ['false'])[0] == 'true'
+        fields = query.get('fields', [None])[0]
+
+        with submissions_lock:
+            if url.path == '/submissions/batch':
+                tokens = query.get('tokens', [''])[0].split(',')
+                found = [submissions.get(token) for token in tokens]
+                body = {"submissions": [serialize(s, base64_encoded, fields) if s else None for s in found]}
+                self.send_json(200, body)
+                return
+            token = url.path.rsplit('/', 1)[-1]
+            submission = submissions.get(token)
+        if submission is None:
+            self.send_json(404, {"error": "not found"})
+        else:
+            self.send_json(200, serialize(submission, base64_encoded, fields))
+
+    def log_message(self, format, *args):
+        pass
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=2358)
+    parser.add_argument('--delay', type=float, default=0.0, help="seconds a submission stays queued")
+    parser.parse_args(namespace=options)
+
+    server = ThreadingHTTPServer((options.host, options.port), Judge0Handler)
+    print(f"Fake Judge0 listening on http://{options.host}:{options.port}")
+    server.serve_forever()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+#!/usr/bin/env python
+"""
+Import a question bank straight into the database configured by DATABASE_URL
+Each file is JSON Lines, one /assignments/create body per line, or a zip of
+.jsonl files. Invalid records are reported and skipped; the rest are written
+in chunks, one transaction per chunk (see app/services/assignment_import.py).
+Run:
+    python import_assignments.py bank.jsonl [more.zip ...] [--chunk-size 200] [--dry-run]
+"""
+import argparse
+import json
+import sys
+import time
+
+from app.database import SessionLocal, engine
+from app.migrations import run_migrations
+from app.services.assignment_import import IMPORT_CHUNK_SIZE, AssignmentImportError, import_file
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("files", nargs="+", help=".jsonl or .zip files")
+    parser.add_argument("--chunk-size", type=int, default=IMPORT_CHUNK_SIZE, help="assignments per transaction")
+    parser.add_argument("--dry-run", action="store_true", help="validate only")
+    args = parser.parse_args()
+
+    run_migrations(engine)
+    exit_code = 0
+    for path in args.files:
+        started = time.perf_counter()
+        db = SessionLocal()
+        try:
+            report = import_file(db, path, chunk_size=args.chunk_size, dry_run=args.dry_run)
+        except (AssignmentImportError, OSError) as e:
+            print(f"{path}: {e}", file=sys.stderr)
+            exit_code = 1
+            continue
+        finally:
+            db.close()
+
+        elapsed = time.perf_counter() - started
+        print(f"{path}: {report['imported']} assignments ({report['test_cases']} test cases) "
+              f"{'validated' if args.dry_run else 'imported'} in {elapsed:.2f}s, "
+              f"{report['invalid']} invalid, {report['failed']} failed")
+        for error in report["errors"]:
+            print("  " + json.dumps(error), file=sys.stderr)
+        if report["invalid"] or report["failed"]:
+            exit_code = 1
+    sys.exit(exit_code)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,16 +1,18 @@
-from app.database import Base, engine
-from app.models import User, Assignment, Submission, TestCase
-
-# Drop all existing tables
-Base.metadata.drop_all(bind=engine)
-print("✅ Dropped all tables")
-
-# Create all tables with correct schema
-Base.metadata.create_all(bind=engine)
-print("✅ Created all tables with correct schema")
-
-print("\nTables created:")
-print("- users")
-print("- assignments")
-print("- submissions")
-print("- testcases")
+from app.database import Base, engine
+from app.migrations import run_migrations, schema_migrations
+from app.models import User, Assignment, Submission, TestCase
+
+# Drop all existing tables (development only; deployed databases are upgraded by app.migrations)
+Base.metadata.drop_all(bind=engine)
+schema_migrations.drop(bind=engine, checkfirst=True)
+print("✅ Dropped all tables")
+
+# Create all tables with correct schema
+run_migrations(engine)
+print("✅ Created all tables with correct schema")
+
+print("\nTables created:")
+print("- users")
+print("- assignments")
+print("- submissions")
+print("- testcases")
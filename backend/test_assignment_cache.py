@@ -0,0 +1,104 @@
+"""
+Checks for the in-process assignment bundle cache
+Run with: python test_assignment_cache.py (or pytest)
+"""
+import os
+import tempfile
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("JWT_SECRET", "test")
+os.environ.setdefault("AWS_LAMBDA_FUNCTION", "test")
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app import models
+from app.migrations import run_migrations
+from app.services import assignment_cache as assignment_cache_module
+from app.services.assignment_cache import AssignmentCache
+
+ASSIGNMENT = {"title": "t", "description": "d", "domain": "dev", "difficulty": "easy", "problem_type": "coding", "language": "python"}
+
+
+def _session():
+    engine = create_engine(f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'test.db')}")
+    run_migrations(engine)
+    db = sessionmaker(bind=engine)()
+    db.add(models.Assignment(id=1, **ASSIGNMENT))
+    db.add(models.TestCase(assignment_id=1, input="1", expected_output="1"))
+    db.commit()
+    return db
+
+
+def _add_test_case(db):
+    db.add(models.TestCase(assignment_id=1, input="2", expected_output="2"))
+    db.commit()
+
+
+def test_bundles_are_served_from_memory_until_invalidated():
+    db = _session()
+    cache = AssignmentCache(enabled=True)
+    bundle = cache.get(1, db)
+    assert [tc["input"] for tc in bundle.code_test_cases] == ["1"]
+
+    _add_test_case(db)
+    assert cache.get(1, db) is bundle
+
+    cache.invalidate(1)
+    assert len(cache.get(1, db).code_test_cases) == 2
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 2
+    assert cache.get(2, db) is None
+
+
+def test_entries_expire_after_the_ttl():
+    db = _session()
+    cache = AssignmentCache(ttl=0.2, enabled=True)
+    cache.get(1, db)
+    _add_test_case(db)
+    time.sleep(0.3)
+    assert len(cache.get(1, db).code_test_cases) == 2
+
+
+def test_a_load_that_races_an_edit_is_not_kept():
+    db = _session()
+    cache = AssignmentCache(enabled=True)
+    real_load = assignment_cache_module.load_bundle
+
+    def load_during_edit(assignment_id, db, version=0):
+        bundle = real_load(assignment_id, db, version)
+        _add_test_case(db)
+        cache.invalidate(assignment_id)
+        return bundle
+
+    assignment_cache_module.load_bundle = load_during_edit
+    try:
+        stale = cache.get(1, db)
+    finally:
+        assignment_cache_module.load_bundle = real_load
+    assert len(stale.code_test_cases) == 1
+    assert cache.stats()["entries"] == 0
+    assert len(cache.get(1, db).code_test_cases) == 2
+
+
+def test_lru_eviction_and_clear():
+    db = _session()
+    db.add(models.Assignment(id=2, **ASSIGNMENT))
+    db.commit()
+    cache = AssignmentCache(max_entries=1, enabled=True)
+    cache.get(1, db)
+    cache.get(2, db)
+    assert cache.stats()["entries"] == 1
+    cache.get(2, db)
+    assert cache.stats()["hits"] == 1
+
+    cache.clear()
+    assert cache.stats()["entries"] == 0
+
+
+if __name__ == "__main__":
+    test_bundles_are_served_from_memory_until_invalidated()
+    test_entries_expire_after_the_ttl()
+    test_a_load_that_races_an_edit_is_not_kept()
+    test_lru_eviction_and_clear()
+    print("All assignment cache checks passed")
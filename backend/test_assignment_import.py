@@ -0,0 +1,83 @@
+"""
+Checks for the bulk assignment import
+Run with: python test_assignment_import.py (or pytest)
+"""
+import io
+import json
+import os
+import tempfile
+import zipfile
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("JWT_SECRET", "test")
+os.environ.setdefault("AWS_LAMBDA_FUNCTION", "test")
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.migrations import run_migrations
+from app import models
+from app.services.assignment_cache import load_bundle
+from app.services.assignment_import import import_assignments
+
+CODING = {"title": "double", "description": "d", "domain": "dev", "difficulty": "easy", "problem_type": "coding", "language": "python",
+          "test_cases": [{"input": "2", "expected_output": "4"}, {"input": "3", "expected_output": "6"}]}
+SQL = {"title": "count", "description": "d", "domain": "data", "difficulty": "easy", "problem_type": "sql",
+       "sql_schema": "CREATE TABLE t (a INTEGER);", "sql_query": "SELECT COUNT(*) FROM t", "sql_limits": {"max_rows": 10},
+       "test_cases": [{"sql_query": "SELECT COUNT(*) FROM t", "expected_result": "[[0]]"},
+                      {"sql_query": "SELECT COUNT(*) FROM t", "expected_result": "[[1]]", "seed_sql": "INSERT INTO t VALUES (1);", "dataset_name": "one"}]}
+
+
+def _session():
+    engine = create_engine(f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'test.db')}")
+    run_migrations(engine)
+    return sessionmaker(bind=engine)()
+
+
+def _jsonl(*records) -> bytes:
+    return "\n".join(record if isinstance(record, str) else json.dumps(record) for record in records).encode("utf-8")
+
+
+def test_import_jsonl_in_chunks_and_skip_invalid_records():
+    db = _session()
+    body = _jsonl(CODING, SQL, "{broken", dict(CODING, language=None), SQL, CODING)
+
+    report = import_assignments(db, io.BytesIO(body), chunk_size=2)
+
+    assert (report["imported"], report["invalid"], report["failed"], report["chunks"]) == (4, 2, 0, 2)
+    assert [error["line"] for error in report["errors"]] == [3, 4]
+    assert report["test_cases"] == 8
+    assert db.query(models.Assignment).count() == 4
+
+    # Datasets and limits are attached to the right rows
+    for assignment_id in report["assignment_ids"]:
+        bundle = load_bundle(assignment_id, db)
+        if bundle.problem_type == "sql":
+            assert bundle.sql_limits == {"max_rows": 10}
+            assert [tc.get("dataset") for tc in bundle.sql_test_cases] == [None, "one"]
+            assert bundle.sql_test_cases[1]["seed_sql"] == "INSERT INTO t VALUES (1);"
+        else:
+            assert len(bundle.code_test_cases) == 2
+
+
+def test_import_zip_and_dry_run():
+    archive = io.BytesIO()
+    with zipfile.ZipFile(archive, "w") as zf:
+        zf.writestr("bank/a.jsonl", _jsonl(CODING, SQL))
+        zf.writestr("bank/b.jsonl", _jsonl(CODING))
+        zf.writestr("bank/readme.txt", "ignored")
+    db = _session()
+
+    report = import_assignments(db, io.BytesIO(archive.getvalue()), dry_run=True)
+    assert (report["imported"], report["assignment_ids"]) == (3, [])
+    assert db.query(models.Assignment).count() == 0
+
+    report = import_assignments(db, io.BytesIO(archive.getvalue()))
+    assert report["imported"] == 3
+    assert db.query(models.TestCase).count() == 6
+
+
+if __name__ == "__main__":
+    test_import_jsonl_in_chunks_and_skip_invalid_records()
+    test_import_zip_and_dry_run()
+    print("All import checks passed")
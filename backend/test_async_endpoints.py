@@ -0,0 +1,225 @@
+"""
+Checks for the response shapes of the async (AsyncSession) endpoints
+Run with: python test_async_endpoints.py (or pytest)
+"""
+import asyncio
+import os
+import tempfile
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("JWT_SECRET", "test")
+os.environ.setdefault("AWS_LAMBDA_FUNCTION", "test")
+os.environ.setdefault("SQL_POOL_WORKERS", "0")
+
+from fastapi.testclient import TestClient
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.config import settings
+from app.database import create_async_db_engine, create_db_engine, get_async_db
+from app.main import app
+from app.migrations import run_migrations
+from app.routers import assignments, submissions
+from app.services.assignment_cache import assignment_cache
+
+CODE_ASSIGNMENT = {
+    "title": "Echo", "description": "Print the input", "domain": "dev", "difficulty": "easy",
+    "problem_type": "coding", "language": "python",
+    "test_cases": [{"input": "1", "expected_output": "1"}, {"input": "2", "expected_output": "2", "hidden": True}],
+}
+SQL_ASSIGNMENT = {
+    "title": "Count", "description": "Count the rows", "domain": "data", "difficulty": "easy", "problem_type": "sql",
+    "sql_schema": "CREATE TABLE t (id INTEGER); INSERT INTO t VALUES (1), (2);",
+    "test_cases": [{"expected_result": '[{"n": 2}]'}],
+}
+
+
+def _with_client(test):
+    """Run test(client) against a fresh database file"""
+    url = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'test.db')}"
+    engine = create_db_engine(url)
+    run_migrations(engine)
+    async_engine = create_async_db_engine(url)
+    sessions = async_sessionmaker(async_engine, autoflush=False, expire_on_commit=False)
+
+    async def get_test_db():
+        async with sessions() as db:
+            yield db
+
+    app.dependency_overrides[get_async_db] = get_test_db
+    assignment_cache.clear()
+    try:
+        test(TestClient(app))
+    finally:
+        app.dependency_overrides.pop(get_async_db, None)
+        assignment_cache.clear()
+        asyncio.run(async_engine.dispose())
+
+
+def test_register_and_login():
+    def test(client):
+        user = {"name": "A", "email": "a@x", "password": "pw", "role": "admin", "domain": "dev"}
+        assert client.post("/auth/register", json=user).json() == {"message": "User registered successfully"}
+        duplicate = client.post("/auth/register", json=user)
+        assert duplicate.status_code == 400 and duplicate.json() == {"detail": "Email already registered"}
+
+        login = client.post("/auth/login", json={"email": "a@x", "password": "pw"})
+        assert login.status_code == 200
+        assert set(login.json()) == {"access_token", "role"} and login.json()["role"] == "admin"
+        assert client.post("/auth/login", json={"email": "a@x", "password": "wrong"}).status_code == 401
+    _with_client(test)
+
+
+def test_create_list_and_get_assignments():
+    def test(client):
+        created = client.post("/assignments/create", json=CODE_ASSIGNMENT).json()
+        assert created == {"message": "Assignment created successfully", "id": created["id"]}
+        client.post("/assignments/create", json=SQL_ASSIGNMENT)
+
+        listing = client.get("/assignments/")
+        assert listing.status_code == 200 and "X-Next-Cursor" not in listing.headers
+        assert [a["title"] for a in listing.json()] == ["Echo", "Count"]
+        assert set(listing.json()[0]) == {"id", "title", "description", "domain", "difficulty", "problem_type", "language"}
+        assert client.get("/assignments/", headers={"If-None-Match": listing.headers["ETag"]}).status_code == 304
+
+        page = client.get("/assignments/", params={"limit": 1, "fields": "title"})
+        assert page.json() == [{"id": created["id"], "title": "Echo"}]
+        assert page.headers["X-Next-Cursor"] == str(created["id"])
+        assert client.get("/assignments/", params={"fields": "sql_query"}).status_code == 400
+
+        assignment = client.get(f"/assignments/{created['id']}").json()
+        assert assignment["title"] == "Echo" and assignment["language"] == "python"
+        assert [tc["hidden"] for tc in assignment["test_cases"]] == [False, True]
+        assert set(assignment["test_cases"][0]) == {"id", "input", "expected_output", "sql_query", "expected_result", "hidden"}
+        assert client.get("/assignments/999").status_code == 404
+    _with_client(test)
+
+
+def test_listing_filters_pages_and_etags():
+    def test(client):
+        variants = [
+            {"domain": "dev", "difficulty": "easy", "problem_type": "coding", "language": "python"},
+            {"domain": "dev", "difficulty": "hard", "problem_type": "coding", "language": "javascript"},
+            {"domain": "data", "difficulty": "easy", "problem_type": "sql", "language": None},
+        ]
+        ids = []
+        for i in range(7):
+            body = dict(CODE_ASSIGNMENT, title=f"a{i}", **variants[i % 3])
+            ids.append(client.post("/assignments/create", json=body).json()["id"])
+
+        def listed(**params):
+            return [a["id"] for a in client.get("/assignments/", params=params).json()]
+
+        # The default projection includes language
+        assert client.get("/assignments/").json()[1]["language"] == "javascript"
+        assert listed(domain="dev") == [ids[i] for i in (0, 1, 3, 4, 6)]
+        assert listed(domain="dev", difficulty="easy") == [ids[i] for i in (0, 3, 6)]
+        assert listed(problem_type="coding", language="javascript") == [ids[1], ids[4]]
+        assert listed(domain="data", problem_type="sql") == [ids[2], ids[5]]
+        assert listed(domain="data", language="python") == []
+
+        # Following X-Next-Cursor visits every match once and ends without a cursor
+        seen, params = [], {"domain": "dev", "limit": 2}
+        while True:
+            page = client.get("/assignments/", params=params)
+            seen.extend(a["id"] for a in page.json())
+            if "X-Next-Cursor" not in page.headers:
+                break
+            params["after_id"] = page.headers["X-Next-Cursor"]
+        assert seen == listed(domain="dev")
+        assert len(page.json()) == 1
+        # An exactly full last page has no cursor either
+        assert "X-Next-Cursor" not in client.get("/assignments/", params={"domain": "data", "limit": 2}).headers
+        # after_id alone pages with the default size
+        assert listed(after_id=ids[4]) == [ids[5], ids[6]]
+
+        # Conditional requests: 304 while nothing changed, 200 with a new ETag after a create
+        first = client.get("/assignments/", params={"domain": "dev"})
+        etag = first.headers["ETag"]
+        cached = client.get("/assignments/", params={"domain": "dev"}, headers={"If-None-Match": f'"other", {etag}'})
+        assert cached.status_code == 304 and cached.headers["ETag"] == etag and not cached.content
+        client.post("/assignments/create", json=dict(CODE_ASSIGNMENT, title="new"))
+        changed = client.get("/assignments/", params={"domain": "dev"}, headers={"If-None-Match": etag})
+        assert changed.status_code == 200 and changed.headers["ETag"] != etag
+    _with_client(test)
+
+
+def test_dataset_specs_are_validated_off_the_event_loop():
+    def test(client):
+        real_validate, loops = assignments.validate_spec, []
+
+        def validate_spec(spec, schema_sql=None):
+            try:
+                loops.append(asyncio.get_running_loop())
+            except RuntimeError:
+                loops.append(None)
+            return real_validate(spec, schema_sql)
+
+        spec = {"seed": 1, "tables": {"missing": {"rows": 1, "columns": {"id": {"type": "sequence"}}}}}
+        assignments.validate_spec = validate_spec
+        try:
+            response = client.post("/assignments/create", json=dict(SQL_ASSIGNMENT, sql_performance={"dataset": spec}))
+        finally:
+            assignments.validate_spec = real_validate
+        assert response.status_code == 400 and "Invalid dataset spec" in response.json()["detail"]
+        assert loops == [None]
+    _with_client(test)
+
+
+def test_submit_code_and_sql():
+    def test(client):
+        code_id = client.post("/assignments/create", json=CODE_ASSIGNMENT).json()["id"]
+        sql_id = client.post("/assignments/create", json=SQL_ASSIGNMENT).json()["id"]
+
+        saved = settings.CODE_EXECUTOR
+        settings.CODE_EXECUTOR = "local"
+        try:
+            result = client.post("/assignments/submit-code", json={"assignment_id": code_id, "code": "print(input())"}).json()
+        finally:
+            settings.CODE_EXECUTOR = saved
+        assert result["passed_tests"] == result["total_tests"] == 2
+        assert len(result["results"]) == 2
+
+        result = client.post("/assignments/submit-sql", json={"assignment_id": sql_id, "sql_query": "SELECT COUNT(*) AS n FROM t"}).json()
+        assert result["passed_tests"] == result["total_tests"] == 1
+
+        wrong_type = client.post("/assignments/submit-sql", json={"assignment_id": code_id, "sql_query": "SELECT 1"})
+        assert wrong_type.status_code == 400 and wrong_type.json() == {"detail": "This assignment is not a SQL problem"}
+        assert client.post("/assignments/submit-code", json={"assignment_id": 999, "code": ""}).status_code == 404
+    _with_client(test)
+
+
+def test_recorded_submissions_and_stats():
+    def test(client):
+        client.post("/auth/register", json={"name": "A", "email": "a@x", "password": "pw", "role": "student", "domain": "dev"})
+        assignment_id = client.post("/assignments/create", json=CODE_ASSIGNMENT).json()["id"]
+
+        saved = submissions.run_code
+        submissions.run_code = lambda payload: {"passed": payload["code"] == "ok", "results": []}
+        try:
+            for code in ("bad", "ok"):
+                run = client.post("/submissions/run", json={"assignment_id": assignment_id, "user_id": 1, "code": code})
+                assert run.json() == {"result": {"passed": code == "ok", "results": []}}
+        finally:
+            submissions.run_code = saved
+
+        assert client.get(f"/assignments/{assignment_id}/stats").json() == {
+            "total_submissions": 2, "passed_submissions": 1, "failed_submissions": 1, "submitted": 1, "remaining": 0
+        }
+        stats = client.get("/assignments/completion-stats").json()
+        assert stats["total_users"] == 1
+        assert stats["completion_stats"] == [{"assignments_completed": 1, "user_count": 1}]
+        assert stats["assignments"] == [{
+            "assignment_id": assignment_id, "total_submissions": 2, "passed_submissions": 1,
+            "failed_submissions": 1, "submitted": 1, "remaining": 0
+        }]
+    _with_client(test)
+
+
+if __name__ == "__main__":
+    test_register_and_login()
+    test_create_list_and_get_assignments()
+    test_listing_filters_pages_and_etags()
+    test_dataset_specs_are_validated_off_the_event_loop()
+    test_submit_code_and_sql()
+    test_recorded_submissions_and_stats()
+    print("All async endpoint checks passed")
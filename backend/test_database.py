@@ -0,0 +1,65 @@
+"""
+Checks for the database engine profiles
+Run with: python test_database.py (or pytest)
+"""
+import asyncio
+import os
+import tempfile
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("JWT_SECRET", "test")
+os.environ.setdefault("AWS_LAMBDA_FUNCTION", "test")
+
+from sqlalchemy import text
+
+from app.config import settings
+from app.database import async_database_url, create_async_db_engine, create_db_engine, engine_options
+
+
+def test_profiles_match_the_url():
+    server = engine_options("postgresql://u:p@db/app")
+    assert server["pool_size"] == settings.DB_POOL_SIZE and server["pool_pre_ping"] == settings.DB_POOL_PRE_PING
+    assert "connect_args" not in server
+
+    sqlite_file = engine_options("sqlite:////tmp/app.db")
+    assert sqlite_file["connect_args"]["check_same_thread"] is False
+    assert sqlite_file["pool_size"] == settings.DB_POOL_SIZE
+
+    for url in ("sqlite://", "sqlite:///:memory:"):
+        assert "pool_size" not in engine_options(url)
+
+
+def test_async_urls_keep_the_credentials():
+    assert async_database_url("sqlite:////tmp/app.db") == "sqlite+aiosqlite:////tmp/app.db"
+    assert async_database_url("postgresql://u:p@db/app") == "postgresql+asyncpg://u:p@db/app"
+    try:
+        async_database_url("mysql://u:p@db/app")
+    except ValueError:
+        pass
+    else:
+        raise AssertionError("a database without an async driver was accepted")
+
+
+def test_sqlite_pragmas_are_applied_to_sync_and_async_connections():
+    url = f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'test.db')}"
+    expected = (settings.SQLITE_JOURNAL_MODE.lower(), settings.SQLITE_BUSY_TIMEOUT_MS)
+    query = text("SELECT (SELECT journal_mode FROM pragma_journal_mode), (SELECT timeout FROM pragma_busy_timeout)")
+
+    engine = create_db_engine(url)
+    with engine.connect() as conn:
+        assert tuple(conn.execute(query).one()) == expected
+    engine.dispose()
+
+    async def check():
+        async_engine = create_async_db_engine(url)
+        async with async_engine.connect() as conn:
+            assert tuple((await conn.execute(query)).one()) == expected
+        await async_engine.dispose()
+    asyncio.run(check())
+
+
+if __name__ == "__main__":
+    test_profiles_match_the_url()
+    test_async_urls_keep_the_credentials()
+    test_sqlite_pragmas_are_applied_to_sync_and_async_connections()
+    print("All database engine checks passed")
@@ -0,0 +1,168 @@
+"""
+Checks for the content-addressed execution result cache
+Run with: python test_execution_cache.py (or pytest)
+"""
+import os
+import threading
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("JWT_SECRET", "test")
+os.environ.setdefault("AWS_LAMBDA_FUNCTION", "test")
+
+from app.services.execution_cache import ExecutionCache, execution_key, is_program_outcome
+
+TRANSIENT = ("API error",)
+
+
+def _cacheable(result):
+    return is_program_outcome(result, TRANSIENT)
+
+
+def _counting(result):
+    calls = []
+
+    def execute():
+        calls.append(1)
+        return dict(result)
+    return execute, calls
+
+
+def test_key_covers_code_stdin_and_limits():
+    key = execution_key("judge0", "Python", "3.11", "print(1)", "", {"timeout": 5})
+    assert key == execution_key("judge0", "python", "3.11", "print(1)", "", {"timeout": 5})
+    assert key != execution_key("judge0", "python", "3.11", "print(2)", "", {"timeout": 5})
+    assert key != execution_key("judge0", "python", "3.11", "print(1)", "x", {"timeout": 5})
+    assert key != execution_key("judge0", "python", "3.11", "print(1)", "", {"timeout": 6})
+    assert key != execution_key("piston", "python", "3.11", "print(1)", "", {"timeout": 5})
+
+
+def test_hits_are_private_copies_and_expire_after_the_ttl():
+    cache = ExecutionCache(ttl=0.2, enabled=True)
+    execute, calls = _counting({"success": True, "output": "1"})
+
+    first = cache.get_or_execute("k", execute, _cacheable)
+    first["output"] = "changed by the caller"
+    assert cache.get_or_execute("k", execute, _cacheable)["output"] == "1"
+    assert len(calls) == 1
+
+    time.sleep(0.3)
+    cache.get_or_execute("k", execute, _cacheable)
+    assert len(calls) == 2
+    assert cache.stats()["hits"] == 1 and cache.stats()["misses"] == 2
+
+
+def test_transport_failures_are_not_cached():
+    cache = ExecutionCache(enabled=True)
+    execute, calls = _counting({"success": False, "error": "API error: 502"})
+    cache.get_or_execute("k", execute, _cacheable)
+    cache.get_or_execute("k", execute, _cacheable)
+    assert len(calls) == 2
+
+    # A program that fails is its own outcome and is reused
+    execute, calls = _counting({"success": False, "error": "NameError: x"})
+    cache.get_or_execute("k2", execute, _cacheable)
+    cache.get_or_execute("k2", execute, _cacheable)
+    assert len(calls) == 1
+
+
+def test_concurrent_identical_runs_execute_once():
+    cache = ExecutionCache(enabled=True)
+    started, release, calls = threading.Event(), threading.Event(), []
+
+    def execute():
+        calls.append(1)
+        started.set()
+        release.wait(10)
+        return {"success": True, "output": "ok"}
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(cache.get_or_execute("k", execute, _cacheable))) for _ in range(5)]
+    threads[0].start()
+    started.wait(10)
+    for thread in threads[1:]:
+        thread.start()
+    while cache.stats()["shared_in_flight"] < 4:
+        time.sleep(0.01)
+    release.set()
+    for thread in threads:
+        thread.join(10)
+
+    assert len(calls) == 1
+    assert [r["output"] for r in results] == ["ok"] * 5
+    assert cache.stats()["in_flight"] == 0
+
+
+def test_errors_reach_every_waiter_and_are_not_cached():
+    cache = ExecutionCache(enabled=True)
+    started, release = threading.Event(), threading.Event()
+
+    def execute():
+        started.set()
+        release.wait(10)
+        raise RuntimeError("worker crashed")
+
+    errors = []
+
+    def call():
+        try:
+            cache.get_or_execute("k", execute, _cacheable)
+        except RuntimeError as e:
+            errors.append(str(e))
+
+    owner = threading.Thread(target=call)
+    owner.start()
+    started.wait(10)
+    waiter = threading.Thread(target=call)
+    waiter.start()
+    while cache.stats()["shared_in_flight"] < 1:
+        time.sleep(0.01)
+    release.set()
+    owner.join(10)
+    waiter.join(10)
+
+    assert errors == ["worker crashed"] * 2
+    assert cache.stats()["entries"] == 0
+
+
+def test_lru_eviction_and_clear():
+    cache = ExecutionCache(max_entries=2, enabled=True)
+    for key in ("a", "b"):
+        cache.get_or_execute(key, lambda: {"success": True, "output": key}, _cacheable)
+    cache.get_or_execute("a", lambda: {"success": True, "output": "miss"}, _cacheable)  # a is now most recent
+    cache.get_or_execute("c", lambda: {"success": True, "output": "c"}, _cacheable)
+
+    assert cache.get_or_execute("a", lambda: {"success": True, "output": "miss"}, _cacheable)["output"] == "a"
+    assert cache.get_or_execute("b", lambda: {"success": True, "output": "miss"}, _cacheable)["output"] == "miss"
+    assert cache.stats()["evictions"] == 2
+
+    cache.clear()
+    assert cache.stats()["entries"] == 0 and cache.stats()["bytes"] == 0
+
+
+def test_batches_run_only_the_misses():
+    cache = ExecutionCache(enabled=True)
+    cache.get_or_execute("k1", lambda: {"success": True, "output": "cached"}, _cacheable)
+    ran = []
+
+    def execute_many(indexes):
+        ran.append(indexes)
+        return [{"success": True, "output": f"run {idx}"} for idx in indexes]
+
+    results = cache.get_or_execute_many(["k0", "k1", "k2"], execute_many, _cacheable)
+    assert ran == [[0, 2]]
+    assert [r["output"] for r in results] == ["run 0", "cached", "run 2"]
+
+    cache.get_or_execute_many(["k0", "k1", "k2"], execute_many, _cacheable)
+    assert len(ran) == 1
+
+
+if __name__ == "__main__":
+    test_key_covers_code_stdin_and_limits()
+    test_hits_are_private_copies_and_expire_after_the_ttl()
+    test_transport_failures_are_not_cached()
+    test_concurrent_identical_runs_execute_once()
+    test_errors_reach_every_waiter_and_are_not_cached()
+    test_lru_eviction_and_clear()
+    test_batches_run_only_the_misses()
+    print("All execution cache checks passed")
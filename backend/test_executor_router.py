@@ -0,0 +1,100 @@
+"""
+Checks for executor routing: the local fallback opt-in and hedged attempts
+Run with: python test_executor_router.py (or pytest)
+"""
+import os
+import threading
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("JWT_SECRET", "test")
+os.environ.setdefault("AWS_LAMBDA_FUNCTION", "test")
+
+from app.config import settings
+from app.services import executor_router as router_module
+from app.services.executor_router import ExecutorRouter
+
+TEST_CASES = [{"input": "1", "expected_output": "1"}, {"input": "2", "expected_output": "2"}]
+
+
+def _result(backend: str, passed: bool = True):
+    results = [{"test_id": i + 1, "passed": passed, "actual_output": backend, "error": None} for i in range(len(TEST_CASES))]
+    return {"success": passed, "total_tests": len(results), "passed_tests": len(results) if passed else 0, "results": results, "code_error": None}
+
+
+def test_remote_mode_never_falls_back_to_local_without_opt_in():
+    router = ExecutorRouter()
+    saved = settings.CODE_EXECUTOR, settings.EXECUTOR_LOCAL_FALLBACK
+    try:
+        settings.CODE_EXECUTOR, settings.EXECUTOR_LOCAL_FALLBACK = "remote", False
+        assert "local" not in router.candidates("python")
+        router_module.EXECUTOR_ORDER_OVERRIDES["python"] = "judge0,local"
+        assert router.candidates("python") == ["judge0"]
+
+        settings.EXECUTOR_LOCAL_FALLBACK = True
+        assert router.candidates("python") == ["judge0", "local"]
+
+        settings.CODE_EXECUTOR, settings.EXECUTOR_LOCAL_FALLBACK = "local", False
+        router_module.EXECUTOR_ORDER_OVERRIDES["python"] = ""
+        assert router.candidates("python") == ["local"]
+    finally:
+        settings.CODE_EXECUTOR, settings.EXECUTOR_LOCAL_FALLBACK = saved
+        router_module.EXECUTOR_ORDER_OVERRIDES["python"] = ""
+
+
+def _race(slow_streams_first: bool):
+    """piston stalls past the hedge delay, judge0 is started and finishes first"""
+    router = ExecutorRouter()
+    release_slow = threading.Event()
+
+    def run(name, language, user_code, test_cases, on_result):
+        if name == "piston":
+            if slow_streams_first:
+                on_result(_result(name)["results"][0])
+            release_slow.wait(5)
+        result = _result(name)
+        for test_result in result["results"]:
+            on_result(test_result)
+        return result
+
+    for _ in range(router_module.EXECUTOR_HEDGE_MIN_SAMPLES):
+        router.health["piston"].record(0.01, True)
+    saved = router._run, router_module.EXECUTOR_HEDGE, router_module.EXECUTOR_HEDGE_MIN_DELAY, dict(router_module.EXECUTOR_ORDER_OVERRIDES)
+    router._run = run
+    router_module.EXECUTOR_HEDGE, router_module.EXECUTOR_HEDGE_MIN_DELAY = True, 0.05
+    router_module.EXECUTOR_ORDER_OVERRIDES["javascript"] = "piston,judge0"
+    router._available = lambda name: True
+    streamed = []
+    try:
+        timer = threading.Timer(0.5, release_slow.set)
+        timer.start()
+        result = router.grade("javascript", "code", TEST_CASES, on_result=streamed.append)
+        timer.join()
+        time.sleep(0.1)
+    finally:
+        router._run = saved[0]
+        router_module.EXECUTOR_HEDGE, router_module.EXECUTOR_HEDGE_MIN_DELAY = saved[1], saved[2]
+        router_module.EXECUTOR_ORDER_OVERRIDES.update(saved[3])
+    return result, streamed
+
+
+def test_hedged_attempt_wins_when_the_first_streamed_nothing():
+    result, streamed = _race(slow_streams_first=False)
+    assert {r["actual_output"] for r in result["results"]} == {"judge0"}
+    # The abandoned attempt's results arrive after the stream is closed
+    assert [r["actual_output"] for r in streamed] == ["judge0", "judge0"]
+
+
+def test_losing_hedged_attempt_is_not_streamed():
+    result, streamed = _race(slow_streams_first=True)
+    # judge0 finished first, but piston had already streamed a result, so piston's result is used
+    assert {r["actual_output"] for r in result["results"]} == {"piston"}
+    assert [r["actual_output"] for r in streamed] == ["piston", "piston"]
+    assert sorted(r["test_id"] for r in streamed) == [1, 2]
+
+
+if __name__ == "__main__":
+    test_remote_mode_never_falls_back_to_local_without_opt_in()
+    test_hedged_attempt_wins_when_the_first_streamed_nothing()
+    test_losing_hedged_attempt_is_not_streamed()
+    print("All executor router checks passed")
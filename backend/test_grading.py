@@ -0,0 +1,117 @@
+"""
+Checks for fail-fast grading: what counts as a compile error
+Run with: python test_grading.py (or pytest)
+"""
+import os
+import shutil
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("JWT_SECRET", "test")
+os.environ.setdefault("AWS_LAMBDA_FUNCTION", "test")
+
+from app.config import settings
+from app.services import grading
+from app.services.grading import grade_code_submission, syntax_error
+
+TEST_CASES = [{"input": "1", "expected_output": "1"}, {"input": "1 +", "expected_output": "1 +"}, {"input": "3", "expected_output": "3"}]
+
+
+def _grade_locally(language, user_code, fail_fast):
+    saved = settings.CODE_EXECUTOR
+    settings.CODE_EXECUTOR = "local"
+    try:
+        return grade_code_submission(language, user_code, TEST_CASES, fail_fast=fail_fast)
+    finally:
+        settings.CODE_EXECUTOR = saved
+
+
+def test_fail_fast_is_off_by_default():
+    assert settings.GRADING_FAIL_FAST == "off"
+
+
+def test_runtime_syntax_errors_do_not_skip_the_remaining_tests():
+    # eval of bad input raises SyntaxError while running, for one test case only
+    result = _grade_locally("python", "s = input()\nprint(eval(s))", "compile")
+    assert [r["passed"] for r in result["results"]] == [True, False, True]
+    assert "SyntaxError" in result["results"][1]["error"]
+    assert not any(r.get("skipped") for r in result["results"])
+
+    if shutil.which("node"):
+        code = "const s = require('fs').readFileSync(0, 'utf8').trim();\nconsole.log(JSON.parse(s));"
+        result = _grade_locally("javascript", code, "first_failure")
+        assert [r["passed"] for r in result["results"]] == [True, False, True]
+        assert "JSON" in result["results"][1]["error"]
+
+
+def test_syntax_errors_are_reported_without_running_the_code():
+    calls = []
+    saved = grading.executor_router.grade
+    grading.executor_router.grade = lambda *args, **kwargs: calls.append(args) or saved(*args, **kwargs)
+    try:
+        result = _grade_locally("python", "def f(:\n    pass", "compile")
+        assert calls == []
+        assert all(r["skipped"] for r in result["results"])
+        assert "SyntaxError" in result["code_error"] and "main.py" in result["code_error"]
+
+        # With fail-fast off the executor reports it, for every test case
+        result = _grade_locally("python", "def f(:\n    pass", "off")
+        assert len(calls) == 1
+        assert not any(r.get("skipped") for r in result["results"])
+    finally:
+        grading.executor_router.grade = saved
+
+
+def test_syntax_check():
+    assert syntax_error("python", "print(1)") is None
+    assert "IndentationError" in syntax_error("python", "if True:\nprint(1)")
+    assert syntax_error("sql", "SELEC") is None
+    if shutil.which("node"):
+        # Top-level return and require are fine in Node's CommonJS wrapper
+        assert syntax_error("javascript", "const fs = require('fs');\nreturn;") is None
+        assert "SyntaxError" in syntax_error("javascript", "function (")
+
+
+def test_executor_compile_errors_stop_first_failure_waves():
+    def grade(language, user_code, test_cases, on_result=None):
+        results = [{"test_id": i + 1, "passed": False, "actual_output": "", "error": "error: expected ';'", "compile_error": True} for i in range(len(test_cases))]
+        return {"success": False, "total_tests": len(results), "passed_tests": 0, "results": results, "code_error": results[0]["error"]}
+
+    saved = grading.executor_router.grade
+    grading.executor_router.grade = grade
+    try:
+        result = grade_code_submission("python", "print(1)", TEST_CASES, fail_fast="first_failure")
+    finally:
+        grading.executor_router.grade = saved
+    assert [r.get("skipped", False) for r in result["results"]] == [False, True, True]
+    assert result["results"][2]["error"] == "error: expected ';'"
+
+
+def test_failure_history_is_only_used_by_first_failure():
+    calls = []
+    saved = grading.order_by_failure_rate, grading.record_test_outcomes, grading.executor_router.grade
+
+    def grade(language, user_code, test_cases, on_result=None):
+        results = [{"test_id": i + 1, "passed": True, "actual_output": tc["input"], "error": None} for i, tc in enumerate(test_cases)]
+        return {"success": True, "total_tests": len(results), "passed_tests": len(results), "results": results, "code_error": None}
+
+    grading.order_by_failure_rate = lambda assignment_id, test_cases: calls.append("order") or list(range(len(test_cases)))
+    grading.record_test_outcomes = lambda assignment_id, test_cases, results: calls.append("record")
+    grading.executor_router.grade = grade
+    try:
+        for fail_fast in ("off", "compile"):
+            grade_code_submission("python", "print(input())", TEST_CASES, fail_fast=fail_fast, assignment_id=1)
+        assert calls == []
+        grade_code_submission("python", "print(input())", TEST_CASES, fail_fast="first_failure", assignment_id=1)
+        assert calls == ["order", "record"]
+    finally:
+        grading.order_by_failure_rate, grading.record_test_outcomes, grading.executor_router.grade = saved
+
+
+if __name__ == "__main__":
+    test_fail_fast_is_off_by_default()
+    test_runtime_syntax_errors_do_not_skip_the_remaining_tests()
+    test_syntax_errors_are_reported_without_running_the_code()
+    test_syntax_check()
+    test_executor_compile_errors_stop_first_failure_waves()
+    test_failure_history_is_only_used_by_first_failure()
+    print("All grading checks passed")
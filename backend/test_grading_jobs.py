@@ -0,0 +1,63 @@
+"""
+Checks for the background grading job queue
+Run with: python test_grading_jobs.py (or pytest)
+"""
+import os
+import threading
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("JWT_SECRET", "test")
+os.environ.setdefault("AWS_LAMBDA_FUNCTION", "test")
+
+from app.services.grading_jobs import GradingJobManager, GradingQueueFull
+
+
+def _wait_for(job, status):
+    for _ in range(100):
+        if job.status == status:
+            return
+        threading.Event().wait(0.05)
+    raise AssertionError(f"job {job.id} is {job.status}, expected {status}")
+
+
+def test_full_queue_refuses_jobs_until_one_finishes():
+    manager = GradingJobManager(workers=1, queue_size=1)
+    release = threading.Event()
+
+    def grade(on_result):
+        release.wait(10)
+        return {"passed": True}
+
+    try:
+        running = manager.submit("code", 1, grade)
+        queued = manager.submit("code", 1, grade)
+        try:
+            manager.submit("code", 1, grade)
+        except GradingQueueFull:
+            pass
+        else:
+            raise AssertionError("a third job was accepted")
+        assert manager.get(queued.id).status == "queued"
+
+        release.set()
+        _wait_for(running, "completed")
+        _wait_for(queued, "completed")
+        _wait_for(manager.submit("code", 1, grade), "completed")
+    finally:
+        release.set()
+
+
+def test_failed_jobs_free_their_slot():
+    manager = GradingJobManager(workers=1, queue_size=0)
+
+    def grade(on_result):
+        raise RuntimeError("boom")
+
+    for _ in range(3):
+        _wait_for(manager.submit("code", 1, grade), "failed")
+
+
+if __name__ == "__main__":
+    test_full_queue_refuses_jobs_until_one_finishes()
+    test_failed_jobs_free_their_slot()
+    print("All grading job checks passed")
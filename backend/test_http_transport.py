@@ -0,0 +1,162 @@
+"""
+Checks for the pooled executor transport: retries and the circuit breaker
+Run with: python test_http_transport.py (or pytest)
+"""
+import os
+import socket
+import threading
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("JWT_SECRET", "test")
+os.environ.setdefault("AWS_LAMBDA_FUNCTION", "test")
+
+import requests
+
+from app.services.http_transport import CircuitBreaker, CircuitOpenError, PooledTransport
+
+
+def _silent_server():
+    """A server that accepts connections and reads requests but never answers; returns (url, received request count)"""
+    listener = socket.socket()
+    listener.bind(("127.0.0.1", 0))
+    listener.listen(8)
+    received = []
+
+    def serve():
+        while True:
+            conn, _ = listener.accept()
+            conn.recv(65536)
+            received.append(conn)
+
+    threading.Thread(target=serve, daemon=True).start()
+    return f"http://127.0.0.1:{listener.getsockname()[1]}", received
+
+
+def _transport(max_retries=2):
+    transport = PooledTransport("test", max_retries=max_retries)
+    transport._backoff = lambda attempt, response=None: 0
+    return transport
+
+
+def _closed_port_url():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return f"http://127.0.0.1:{s.getsockname()[1]}"
+
+
+def test_post_is_not_retried_after_it_was_sent():
+    url, received = _silent_server()
+    transport = _transport()
+    try:
+        transport.post(url, json={"source_code": "print(1)"}, timeout=0.3)
+        assert False, "expected a timeout"
+    except requests.ReadTimeout:
+        pass
+    time.sleep(0.1)
+    assert len(received) == 1
+
+    try:
+        transport.get(url, timeout=0.3)
+        assert False, "expected a timeout"
+    except requests.ReadTimeout:
+        pass
+    time.sleep(0.1)
+    assert len(received) == 4  # a GET is retried
+
+
+def test_post_is_retried_when_the_connection_failed():
+    transport = _transport()
+    calls = []
+    real_request = transport.session.request
+
+    def request(method, url, **kwargs):
+        calls.append(url)
+        return real_request(method, url, **kwargs)
+
+    transport.session.request = request
+    try:
+        transport.post(_closed_port_url(), timeout=1)
+        assert False, "expected a connection error"
+    except requests.ConnectionError:
+        pass
+    assert len(calls) == 3
+
+
+def test_post_is_not_retried_on_server_errors():
+    transport = _transport()
+    statuses = []
+
+    def request(method, url, **kwargs):
+        response = requests.Response()
+        response.status_code = 503
+        statuses.append(method)
+        return response
+
+    transport.session.request = request
+    assert transport.post("http://judge0/submissions").status_code == 503
+    assert statuses == ["POST"]
+    assert transport.get("http://judge0/submissions/t").status_code == 503
+    assert statuses == ["POST", "GET", "GET", "GET"]
+
+
+def test_half_open_breaker_allows_one_trial():
+    breaker = CircuitBreaker(failure_threshold=2, reset_timeout=0.1)
+    breaker.record_failure()
+    assert breaker.state == "closed"
+    breaker.record_failure()
+    assert breaker.state == "open" and not breaker.allow_request()
+
+    time.sleep(0.15)
+    assert breaker.state == "half-open"
+    assert breaker.allow_request()
+    assert not breaker.allow_request()  # only one trial at a time
+    breaker.record_failure()
+    assert breaker.state == "open"  # a failed trial re-opens at once
+
+    time.sleep(0.15)
+    assert breaker.allow_request()
+    breaker.record_success()
+    assert breaker.state == "closed" and breaker.allow_request() and breaker.allow_request()
+
+
+def test_unexpected_error_during_trial_ends_it():
+    transport = _transport(max_retries=0)
+    transport.breaker = CircuitBreaker(failure_threshold=1, reset_timeout=0.1)
+
+    def broken(method, url, **kwargs):
+        raise requests.exceptions.ChunkedEncodingError("connection broken")
+
+    def ok(method, url, **kwargs):
+        response = requests.Response()
+        response.status_code = 200
+        return response
+
+    transport.session.request = broken
+    for _ in range(2):
+        try:
+            transport.get("http://piston/execute")
+            assert False, "expected ChunkedEncodingError"
+        except requests.exceptions.ChunkedEncodingError:
+            pass
+        assert transport.breaker.state == "open"
+        try:
+            transport.get("http://piston/execute")
+            assert False, "expected an open circuit"
+        except CircuitOpenError:
+            pass
+        time.sleep(0.15)
+
+    # The failed trials did not leave the breaker stuck half-open
+    transport.session.request = ok
+    assert transport.get("http://piston/execute").status_code == 200
+    assert transport.breaker.state == "closed"
+
+
+if __name__ == "__main__":
+    test_post_is_not_retried_after_it_was_sent()
+    test_post_is_retried_when_the_connection_failed()
+    test_post_is_not_retried_on_server_errors()
+    test_half_open_breaker_allows_one_trial()
+    test_unexpected_error_during_trial_ends_it()
+    print("All HTTP transport checks passed")
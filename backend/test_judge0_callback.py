@@ -0,0 +1,112 @@
+"""
+Checks for Judge0 callback mode, against fake_judge0_server.py
+Run with: python test_judge0_callback.py (or pytest)
+"""
+import os
+import socket
+import subprocess
+import sys
+import threading
+import time
+import uuid
+from http.server import ThreadingHTTPServer
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("JWT_SECRET", "test")
+os.environ.setdefault("AWS_LAMBDA_FUNCTION", "test")
+
+import uvicorn
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+import fake_judge0_server
+from app.routers import judge0_callback
+from app.services import judge0_executor
+from app.services.judge0_executor import Judge0Executor
+
+SECRET = "s3cret/with?chars"
+
+
+def _free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _callback_app():
+    app = FastAPI()
+    app.include_router(judge0_callback.router)
+    return app
+
+
+def _configure(callback_url, secret=SECRET):
+    saved = (judge0_executor.JUDGE0_CALLBACK_URL, judge0_executor.JUDGE0_CALLBACK_SECRET, judge0_callback.JUDGE0_CALLBACK_SECRET)
+    judge0_executor.JUDGE0_CALLBACK_URL = callback_url
+    judge0_executor.JUDGE0_CALLBACK_SECRET = judge0_callback.JUDGE0_CALLBACK_SECRET = secret
+    return saved
+
+
+def _restore(saved):
+    judge0_executor.JUDGE0_CALLBACK_URL, judge0_executor.JUDGE0_CALLBACK_SECRET, judge0_callback.JUDGE0_CALLBACK_SECRET = saved
+
+
+def test_results_arrive_by_callback_from_fake_judge0():
+    judge0 = ThreadingHTTPServer(("127.0.0.1", 0), fake_judge0_server.Judge0Handler)
+    threading.Thread(target=judge0.serve_forever, daemon=True).start()
+    port = _free_port()
+    backend = uvicorn.Server(uvicorn.Config(_callback_app(), host="127.0.0.1", port=port, log_level="warning"))
+    threading.Thread(target=backend.run, daemon=True).start()
+    while not backend.started:
+        time.sleep(0.05)
+
+    saved = _configure(f"http://127.0.0.1:{port}")
+    saved_api, saved_delay = judge0_executor.JUDGE0_API_URL, judge0_executor.JUDGE0_POLL_INITIAL_DELAY
+    judge0_executor.JUDGE0_API_URL = f"http://127.0.0.1:{judge0.server_address[1]}"
+    # Polling would take 10 seconds, so a fast result came by callback
+    judge0_executor.JUDGE0_POLL_INITIAL_DELAY = 10
+    try:
+        assert "?" not in Judge0Executor._callback_url()
+        marker = uuid.uuid4().hex
+        start = time.monotonic()
+        result = Judge0Executor.execute_code("python", f"print(input() + '{marker}')", stdin="ok")
+        assert result["success"], result
+        assert result["output"].strip() == f"ok{marker}"
+        assert time.monotonic() - start < 5
+    finally:
+        judge0_executor.JUDGE0_API_URL, judge0_executor.JUDGE0_POLL_INITIAL_DELAY = saved_api, saved_delay
+        _restore(saved)
+        backend.should_exit = True
+        judge0.shutdown()
+
+
+def test_callback_requires_the_secret_as_basic_auth():
+    saved = _configure("http://backend")
+    try:
+        client = TestClient(_callback_app())
+        body = {"token": "t", "status": {"id": 3}}
+        assert client.put("/judge0/callback", json=body).status_code == 401
+        assert client.put("/judge0/callback", params={"secret": SECRET}, json=body).status_code == 401
+        assert client.put("/judge0/callback", json=body, auth=("judge0", "wrong")).status_code == 403
+        assert client.put("/judge0/callback", json=body, auth=("judge0", SECRET)).status_code == 200
+    finally:
+        _restore(saved)
+
+
+def test_callback_route_is_only_mounted_when_configured():
+    probe = "from app.main import app; print('/judge0/callback' in app.openapi()['paths'])"
+    env = {key: value for key, value in os.environ.items() if not key.startswith("JUDGE0_CALLBACK")}
+
+    def run(**extra):
+        return subprocess.run([sys.executable, "-c", probe], env=dict(env, **extra), capture_output=True, text=True, cwd=os.path.dirname(os.path.abspath(__file__)))
+
+    assert run().stdout.strip() == "False"
+    missing_secret = run(JUDGE0_CALLBACK_URL="https://backend.example")
+    assert missing_secret.returncode != 0 and "JUDGE0_CALLBACK_SECRET" in missing_secret.stderr
+    assert run(JUDGE0_CALLBACK_URL="https://backend.example", JUDGE0_CALLBACK_SECRET=SECRET).stdout.strip() == "True"
+
+
+if __name__ == "__main__":
+    test_results_arrive_by_callback_from_fake_judge0()
+    test_callback_requires_the_secret_as_basic_auth()
+    test_callback_route_is_only_mounted_when_configured()
+    print("All Judge0 callback checks passed")
@@ -0,0 +1,91 @@
+"""
+Checks for the Judge0 executor's test case fan-out and process-wide run slots
+Run with: python test_judge0_executor.py (or pytest)
+"""
+import os
+import threading
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("JWT_SECRET", "test")
+os.environ.setdefault("AWS_LAMBDA_FUNCTION", "test")
+
+from app.services import judge0_executor
+from app.services.judge0_executor import Judge0Executor
+
+
+def test_batches_hold_one_slot_per_test_case():
+    slots = 4
+    saved = judge0_executor._global_run_slots, judge0_executor.JUDGE0_MAX_CONCURRENT_RUNS, Judge0Executor.execute_batch
+    judge0_executor._global_run_slots = threading.BoundedSemaphore(slots)
+    judge0_executor.JUDGE0_MAX_CONCURRENT_RUNS = slots
+    held = []
+
+    def execute_batch(language, code, stdins, timeout=30):
+        held.append(slots - judge0_executor._global_run_slots._value)
+        return [{"success": True, "output": stdin, "error": None, "execution_time": 0} for stdin in stdins]
+
+    Judge0Executor.execute_batch = staticmethod(execute_batch)
+    try:
+        test_cases = [{"input": str(i), "expected_output": str(i)} for i in range(10)]
+        result = Judge0Executor.execute_coding_problem("python", "print(input())", test_cases, use_batch=True)
+    finally:
+        judge0_executor._global_run_slots, judge0_executor.JUDGE0_MAX_CONCURRENT_RUNS, Judge0Executor.execute_batch = saved
+    assert result["passed_tests"] == 10
+    assert held == [4, 4, 2]
+
+
+def test_batches_respect_max_parallel_and_report_compile_errors_on_every_result():
+    saved = Judge0Executor.execute_batch
+    groups = []
+
+    def execute_batch(language, code, stdins, timeout=30):
+        groups.append(len(stdins))
+        return [
+            {"success": True, "output": stdin, "error": None, "execution_time": 0} if stdin != "3"
+            else {"success": False, "output": "", "error": "Compilation Error", "execution_time": 0, "compile_error": True}
+            for stdin in stdins
+        ]
+
+    Judge0Executor.execute_batch = staticmethod(execute_batch)
+    try:
+        test_cases = [{"input": str(i), "expected_output": str(i)} for i in range(7)]
+        result = Judge0Executor.execute_coding_problem("python", "print(input())", test_cases, max_parallel=3, use_batch=True)
+    finally:
+        Judge0Executor.execute_batch = saved
+    assert groups == [3, 3, 1]
+    assert len({frozenset(r) for r in result["results"]}) == 1
+    assert [r["compile_error"] for r in result["results"]] == [False, False, False, True, False, False, False]
+
+
+def test_test_cases_run_concurrently_in_test_order():
+    saved = Judge0Executor._execute_with_slot
+    lock, running, peak = threading.Lock(), [0], [0]
+
+    def execute_with_slot(language, code, stdin):
+        with lock:
+            running[0] += 1
+            peak[0] = max(peak[0], running[0])
+        time.sleep(0.05 * (5 - int(stdin) % 5))  # later test cases finish first
+        with lock:
+            running[0] -= 1
+        return {"success": True, "output": stdin, "error": None, "execution_time": 0}
+
+    Judge0Executor._execute_with_slot = staticmethod(execute_with_slot)
+    streamed = []
+    try:
+        test_cases = [{"input": str(i), "expected_output": str(i)} for i in range(10)]
+        result = Judge0Executor.execute_coding_problem("python", "print(input())", test_cases, max_parallel=3, use_batch=False, on_result=streamed.append)
+    finally:
+        Judge0Executor._execute_with_slot = saved
+    assert result["passed_tests"] == 10
+    assert [r["test_id"] for r in result["results"]] == list(range(1, 11))
+    assert [r["test_id"] for r in streamed] == list(range(1, 11))
+    assert peak[0] == 3
+
+
+if __name__ == "__main__":
+    test_batches_hold_one_slot_per_test_case()
+    test_batches_respect_max_parallel_and_report_compile_errors_on_every_result()
+    test_test_cases_run_concurrently_in_test_order()
+    print("All Judge0 executor checks passed")
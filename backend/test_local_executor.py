@@ -0,0 +1,117 @@
+"""
+Checks for LocalCodeExecutor batch mode isolation semantics
+Run with: python test_local_executor.py (or pytest)
+"""
+import shutil
+import sys
+
+from app.services import python_worker_pool
+from app.services.local_executor import LocalCodeExecutor
+from app.services.python_worker_pool import PythonWorkerPool
+
+
+def test_python_batch_isolation():
+    code = """
+import sys
+counter = globals().get('counter', 0) + 1
+sys.modules.setdefault('leak_marker', sys)
+print(sys.stdin.read().strip(), counter)
+"""
+    results = LocalCodeExecutor.execute_batch('python', code, ['a', 'b', 'c'], timeout=5)
+    assert [r['output'] for r in results] == ['a 1\n', 'b 1\n', 'c 1\n']
+    assert all(r['success'] for r in results)
+
+
+def test_python_batch_per_case_timeout():
+    code = "x = input()\nif x == '2':\n    while True: pass\nprint(x)"
+    results = LocalCodeExecutor.execute_batch('python', code, ['1', '2', '3'], timeout=1)
+    assert results[0]['output'] == '1\n'
+    assert not results[1]['success'] and 'timeout' in results[1]['error']
+    assert results[2]['output'] == '3\n'
+
+
+def test_javascript_batch_isolation():
+    if not shutil.which('node'):
+        print('node not installed, skipping')
+        return
+    code = """
+const input = require('fs').readFileSync(0, 'utf-8').trim();
+globalThis.counter = (globalThis.counter || 0) + 1;
+Array.prototype.leaked = true;
+console.log(input, globalThis.counter, [].leaked === true && globalThis.counter > 1);
+"""
+    results = LocalCodeExecutor.execute_batch('javascript', code, ['a', 'b'], timeout=5)
+    assert [r['output'] for r in results] == ['a 1 false\n', 'b 1 false\n']
+
+
+def test_javascript_batch_per_case_timeout():
+    if not shutil.which('node'):
+        print('node not installed, skipping')
+        return
+    code = "const x = require('fs').readFileSync(0, 'utf-8'); if (x === '2') { while (true) {} } console.log(x);"
+    results = LocalCodeExecutor.execute_batch('javascript', code, ['1', '2', '3'], timeout=1)
+    assert results[0]['output'] == '1\n'
+    assert not results[1]['success'] and 'timeout' in results[1]['error']
+    assert results[2]['output'] == '3\n'
+
+
+def test_coding_problem_result_shape():
+    test_cases = [
+        {'input': '5', 'expected_output': '120'},
+        {'input': '3', 'expected_output': '7'},
+    ]
+    code = "import math\nprint(math.factorial(int(input())))"
+    batch = LocalCodeExecutor.execute_coding_problem('python', code, test_cases)
+    serial = LocalCodeExecutor.execute_coding_problem('python', code, test_cases, batch=False)
+    assert batch == serial
+    assert batch['passed_tests'] == 1 and batch['total_tests'] == 2
+    assert [r['test_id'] for r in batch['results']] == [1, 2]
+
+
+def test_pooled_worker_state_does_not_reach_the_next_submission():
+    pool = PythonWorkerPool(size=1)
+    pool.start()
+    try:
+        tamper = """
+import json, __main__
+json.dumps = lambda *args, **kwargs: 'tampered'
+open('left_behind.txt', 'w').write('x')
+print('ok')
+"""
+        assert pool.execute(tamper, timeout=5)['output'] == 'ok\n'
+        result = pool.execute("import json, os\nprint(json.dumps([1]), os.path.exists('left_behind.txt'))", timeout=5)
+        assert result['output'] == '[1] False\n'
+    finally:
+        pool.shutdown()
+
+
+def test_single_use_pool_does_not_start_replacements():
+    spawned = []
+    real_worker = python_worker_pool._Worker
+
+    def worker():
+        spawned.append(real_worker())
+        return spawned[-1]
+
+    pool = PythonWorkerPool(size=1, replace=False)
+    python_worker_pool._Worker = worker
+    try:
+        code = "import sys\nprint(sys.executable)"
+        results = pool.execute_batch(code, ['', ''], timeout=5)
+    finally:
+        python_worker_pool._Worker = real_worker
+        pool.shutdown()
+    assert len(spawned) == 1
+    assert not spawned[0].is_alive()
+    assert [r['output'] for r in results] == [sys.executable + '\n'] * 2
+
+
+def run_tests():
+    for name, test in list(globals().items()):
+        if name.startswith('test_') and callable(test):
+            test()
+            print(f'{name}: ok')
+
+
+if __name__ == '__main__':
+    run_tests()
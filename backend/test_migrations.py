@@ -0,0 +1,124 @@
+"""
+Checks for the schema migrations and the indexes behind the hot queries
+Run with: python test_migrations.py (or pytest)
+"""
+import os
+import tempfile
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("JWT_SECRET", "test")
+os.environ.setdefault("AWS_LAMBDA_FUNCTION", "test")
+
+from sqlalchemy import create_engine, event, inspect
+from sqlalchemy.orm import sessionmaker
+
+from app.database import Base
+from app.migrations import applied_versions, discover, run_migrations
+from app import models
+from app.models import Assignment, Submission, User
+from app.services.assignment_cache import load_bundle
+from app.services.submission_stats import assignment_stats, completion_stats, record_submission
+
+# The four tables (and their data) as created before migrations existed
+LEGACY_SCHEMA = [
+    "CREATE TABLE users (id INTEGER PRIMARY KEY, name VARCHAR, email VARCHAR UNIQUE, password VARCHAR, role VARCHAR, domain VARCHAR)",
+    "CREATE TABLE assignments (id INTEGER PRIMARY KEY, title VARCHAR NOT NULL, description TEXT NOT NULL, domain VARCHAR NOT NULL, difficulty VARCHAR NOT NULL, problem_type VARCHAR, language VARCHAR, test_input TEXT, expected_output TEXT, sql_schema TEXT, sql_query TEXT)",
+    "CREATE TABLE submissions (id INTEGER PRIMARY KEY, assignment_id INTEGER REFERENCES assignments(id), user_id INTEGER REFERENCES users(id), code VARCHAR, status VARCHAR, output VARCHAR, score INTEGER)",
+    "CREATE TABLE testcases (id INTEGER PRIMARY KEY, assignment_id INTEGER REFERENCES assignments(id), input TEXT, expected_output TEXT, sql_query TEXT, expected_result TEXT, hidden BOOLEAN)",
+    "INSERT INTO users VALUES (1, 'a', 'a@example.com', 'x', 'employee', 'data')",
+    "INSERT INTO assignments VALUES (1, 't', 'd', 'data', 'easy', 'coding', 'python', NULL, NULL, NULL, NULL)",
+    "INSERT INTO testcases VALUES (1, 1, '2', '4', NULL, NULL, 0)",
+    "INSERT INTO submissions VALUES (1, 1, 1, 'print(4)', 'pass', '', 100)",
+]
+
+
+def _engine():
+    path = os.path.join(tempfile.mkdtemp(), "test.db")
+    return create_engine(f"sqlite:///{path}")
+
+
+def test_fresh_database_is_migrated_once():
+    engine = _engine()
+    ran = run_migrations(engine)
+    assert ran == [name for _, name, _ in discover()]
+    assert applied_versions(engine) == [version for version, _, _ in discover()]
+    assert run_migrations(engine) == []
+    assert {"users", "assignments", "submissions", "testcases", "submission_counters"} <= set(inspect(engine).get_table_names())
+
+
+def test_migrations_create_the_models_schema():
+    migrated, created = _engine(), _engine()
+    run_migrations(migrated)
+    Base.metadata.create_all(bind=created)
+
+    def schema(engine):
+        inspector = inspect(engine)
+        return {
+            table: (
+                {(column["name"], str(column["type"]), column["nullable"]) for column in inspector.get_columns(table)},
+                {(index["name"], tuple(index["column_names"]), bool(index["unique"])) for index in inspector.get_indexes(table)},
+            )
+            for table in Base.metadata.tables
+        }
+    assert schema(migrated) == schema(created)
+
+
+def test_legacy_database_is_upgraded_in_place():
+    engine = _engine()
+    with engine.begin() as conn:
+        for statement in LEGACY_SCHEMA:
+            conn.exec_driver_sql(statement)
+
+    run_migrations(engine)
+
+    with engine.connect() as conn:
+        assert conn.exec_driver_sql("SELECT COUNT(*) FROM submissions").scalar() == 1
+        assert conn.exec_driver_sql("SELECT COUNT(*) FROM testcases").scalar() == 1
+    indexes = {index["name"] for table in ("assignments", "submissions", "testcases") for index in inspect(engine).get_indexes(table)}
+    assert {
+        "ix_assignments_domain_difficulty_id",
+        "ix_testcases_assignment_id",
+        "ix_submissions_assignment_user_status",
+        "ix_submissions_status_user_assignment",
+    } <= indexes
+
+
+def test_hot_queries_use_indexes():
+    engine = _engine()
+    run_migrations(engine)
+    db = sessionmaker(bind=engine)()
+    db.add(User(id=1, name="a", email="a@example.com", password="x", role="employee", domain="data"))
+    db.add(Assignment(id=1, title="t", description="d", domain="data", difficulty="easy", problem_type="coding", language="python"))
+    db.add(models.TestCase(assignment_id=1, input="2", expected_output="4"))
+    db.commit()
+
+    statements = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    load_bundle(1, db)
+    record_submission(db, Submission(assignment_id=1, user_id=1, code="", status="pass", output="", score=100))
+    db.commit()
+    assignment_stats(db, 1)
+    completion_stats(db)
+    db.query(Assignment.id, Assignment.title).filter(Assignment.domain == "data", Assignment.difficulty == "easy", Assignment.id > 0).order_by(Assignment.id).limit(10).all()
+    event.remove(engine, "before_cursor_execute", capture)
+
+    assert statements
+    with engine.connect() as conn:
+        for statement, parameters in statements:
+            plan = [row[3] for row in conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters)]
+            for table in ("assignments", "submissions", "testcases"):
+                full_scans = [step for step in plan if step.startswith(f"SCAN {table}") and "INDEX" not in step]
+                assert not full_scans, f"{statement}\n{plan}"
+
+
+if __name__ == "__main__":
+    test_fresh_database_is_migrated_once()
+    test_migrations_create_the_models_schema()
+    test_legacy_database_is_upgraded_in_place()
+    test_hot_queries_use_indexes()
+    print("All migration checks passed")
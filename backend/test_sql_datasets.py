@@ -0,0 +1,96 @@
+"""
+Checks for generated SQL datasets: spec validation and the build lock
+Run with: python test_sql_datasets.py (or pytest)
+"""
+import os
+import tempfile
+import threading
+import time
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("JWT_SECRET", "test")
+os.environ.setdefault("AWS_LAMBDA_FUNCTION", "test")
+
+from app.services import sql_datasets
+from app.services.sql_datasets import DatasetSpecError, dataset_path, ensure_dataset, validate_spec
+
+SCHEMA = "CREATE TABLE Customers (id INTEGER PRIMARY KEY, region TEXT);"
+SPEC = {"seed": 1, "tables": {"customers": {"rows": 5, "columns": {"id": {"type": "sequence"}, "Region": {"type": "constant", "value": "north"}}}}}
+
+
+def _rejected(spec, schema_sql):
+    try:
+        validate_spec(spec, schema_sql)
+    except DatasetSpecError as e:
+        return str(e)
+    return None
+
+
+def test_spec_must_match_the_schema():
+    assert _rejected(SPEC, SCHEMA) is None
+    assert _rejected(SPEC, None) is None
+    assert "not created by sql_schema" in _rejected(SPEC, "CREATE TABLE orders (id INTEGER);")
+    assert "not created by sql_schema" in _rejected(SPEC, "")
+    missing_column = {"tables": {"customers": {"rows": 1, "columns": {"email": {"type": "text"}}}}}
+    assert "customers.email" in _rejected(missing_column, SCHEMA)
+    assert "failed to run" in _rejected(SPEC, "CREATE TABLE (")
+
+
+def _in_dataset_dir(test):
+    saved = sql_datasets.SQL_DATASET_DIR
+    sql_datasets.SQL_DATASET_DIR = tempfile.mkdtemp()
+    try:
+        test()
+    finally:
+        sql_datasets.SQL_DATASET_DIR = saved
+
+
+def test_waiting_for_one_dataset_does_not_block_another():
+    def test():
+        other_spec = dict(SPEC, seed=2)
+        busy = dataset_path(SCHEMA, SPEC) + ".lock"
+        os.makedirs(sql_datasets.SQL_DATASET_DIR, exist_ok=True)
+        open(busy, "w").close()  # another process is building this one
+
+        waiter = threading.Thread(target=ensure_dataset, args=(SCHEMA, SPEC))
+        waiter.start()
+        time.sleep(0.3)
+        start = time.monotonic()
+        assert os.path.exists(ensure_dataset(SCHEMA, other_spec))
+        assert time.monotonic() - start < 5
+        assert waiter.is_alive()
+
+        os.remove(busy)
+        waiter.join(10)
+        assert os.path.exists(dataset_path(SCHEMA, SPEC))
+    _in_dataset_dir(test)
+
+
+def test_build_keeps_its_lock_fresh_and_tolerates_losing_it():
+    def test():
+        lock_path = dataset_path(SCHEMA, SPEC) + ".lock"
+        real_generate, mtimes = sql_datasets.generate_dataset, []
+
+        def slow_generate(schema_sql, spec, path):
+            os.utime(lock_path, (0, 0))
+            time.sleep(0.5)
+            mtimes.append(os.path.getmtime(lock_path))
+            os.remove(lock_path)  # e.g. removed by a waiter that took it for stale
+            real_generate(schema_sql, spec, path)
+
+        saved_heartbeat = sql_datasets.SQL_DATASET_LOCK_HEARTBEAT
+        sql_datasets.generate_dataset, sql_datasets.SQL_DATASET_LOCK_HEARTBEAT = slow_generate, 0.1
+        try:
+            assert os.path.exists(ensure_dataset(SCHEMA, SPEC))
+        finally:
+            sql_datasets.generate_dataset, sql_datasets.SQL_DATASET_LOCK_HEARTBEAT = real_generate, saved_heartbeat
+        assert time.time() - mtimes[0] < 5
+        assert not os.path.exists(lock_path)
+    _in_dataset_dir(test)
+
+
+if __name__ == "__main__":
+    test_spec_must_match_the_schema()
+    test_waiting_for_one_dataset_does_not_block_another()
+    test_build_keeps_its_lock_fresh_and_tolerates_losing_it()
+    print("All SQL dataset checks passed")
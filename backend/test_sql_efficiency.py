@@ -0,0 +1,71 @@
+"""
+Checks for SQL efficiency grading
+Run with: python test_sql_efficiency.py (or pytest)
+"""
+import os
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("JWT_SECRET", "test")
+os.environ.setdefault("AWS_LAMBDA_FUNCTION", "test")
+
+from app.services import sql_efficiency
+from app.services.sql_efficiency import clear_reference_cache, grade_efficiency
+
+SCHEMA = "CREATE TABLE c (id INTEGER PRIMARY KEY, region TEXT);"
+SEED = "WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n WHERE i < 5000) INSERT INTO c SELECT i, 'r' || (i % 7) FROM n;"
+DATASET = {"seed": 1, "tables": {"c": {"rows": 5000, "columns": {"id": {"type": "sequence"}, "region": {"type": "text", "prefix": "r"}}}}}
+
+
+def test_writes_before_the_measured_query_score_zero():
+    for seed_sql, dataset in ((SEED, None), (None, DATASET)):
+        result = grade_efficiency(SCHEMA, "DELETE FROM c; SELECT COUNT(*) AS n FROM c", "SELECT COUNT(*) AS n FROM c", seed_sql=seed_sql, runs=1, dataset=dataset)
+        assert result["score"] == 0, result
+        assert "read-only" in result["notes"][0]
+
+        # Indexes built by the submission are paid for in its VM steps
+        result = grade_efficiency(SCHEMA, "CREATE INDEX ix ON c (region); SELECT id FROM c WHERE region = 'r3'", "SELECT id FROM c WHERE region = 'r3'", seed_sql=seed_sql, runs=1, dataset=dataset)
+        assert result["score"] == 0
+        assert result["user"]["vm_steps"] > result["reference"]["vm_steps"]
+
+
+def test_read_only_scripts_are_measured_as_a_whole():
+    result = grade_efficiency(SCHEMA, "SELECT COUNT(*) AS n FROM c", "SELECT COUNT(*) AS n FROM c", seed_sql=SEED, runs=1)
+    assert result["score"] == 100 and not result["user"]["writes"]
+
+    result = grade_efficiency(SCHEMA, "SELECT * FROM c; SELECT COUNT(*) AS n FROM c", "SELECT COUNT(*) AS n FROM c", seed_sql=SEED, runs=1)
+    assert result["score"] < 50, result
+
+    # Write assignments compare a writing reference with a writing submission
+    result = grade_efficiency(SCHEMA, "DELETE FROM c WHERE id > 10", "DELETE FROM c WHERE id > 10", seed_sql=SEED, runs=1)
+    assert result["score"] == 100 and result["user"]["writes"]
+
+
+def test_reference_is_measured_once_per_query_and_dataset():
+    clear_reference_cache()
+    real_measure, measured = sql_efficiency.measure_query, []
+
+    def measure_query(schema_sql, seed_sql, query, *args):
+        measured.append(query)
+        return real_measure(schema_sql, seed_sql, query, *args)
+
+    sql_efficiency.measure_query = measure_query
+    try:
+        for user_query in ("SELECT COUNT(*) AS n FROM c", "SELECT COUNT(id) AS n FROM c"):
+            result = grade_efficiency(SCHEMA, user_query, "SELECT COUNT(*) AS n FROM c", seed_sql=SEED, runs=1)
+            assert result["reference"]["vm_steps"] > 0
+        assert measured.count("SELECT COUNT(*) AS n FROM c") == 2  # the reference once, the first submission once
+
+        # An edited reference or seed script is measured again
+        grade_efficiency(SCHEMA, "SELECT COUNT(*) AS n FROM c", "SELECT COUNT(1) AS n FROM c", seed_sql=SEED, runs=1)
+        grade_efficiency(SCHEMA, "SELECT COUNT(*) AS n FROM c", "SELECT COUNT(1) AS n FROM c", seed_sql=SEED.replace("5000", "4000"), runs=1)
+        assert measured.count("SELECT COUNT(1) AS n FROM c") == 2
+    finally:
+        sql_efficiency.measure_query = real_measure
+        clear_reference_cache()
+
+
+if __name__ == "__main__":
+    test_writes_before_the_measured_query_score_zero()
+    test_read_only_scripts_are_measured_as_a_whole()
+    test_reference_is_measured_once_per_query_and_dataset()
+    print("All SQL efficiency checks passed")
@@ -0,0 +1,184 @@
+"""
+Checks for SQL grading: verification queries and what submitted SQL may do
+Run with: python test_sql_executor.py (or pytest)
+"""
+import os
+import tempfile
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("JWT_SECRET", "test")
+os.environ.setdefault("AWS_LAMBDA_FUNCTION", "test")
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.migrations import run_migrations
+from app import models
+from app.services.assignment_cache import load_bundle
+from app.services.sql_executor import SQLExecutor, execute_sql_problem
+
+SCHEMA = "CREATE TABLE e (id INTEGER PRIMARY KEY); INSERT INTO e VALUES (1), (2);"
+EXPECTED = '[{"id": 1}, {"id": 2}]'
+
+
+def _session():
+    engine = create_engine(f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'test.db')}")
+    run_migrations(engine)
+    return sessionmaker(bind=engine)()
+
+
+def test_test_case_query_is_not_a_verification_query_by_default():
+    # The assignment form fills every test case's sql_query with the reference query
+    result = execute_sql_problem(SCHEMA, "SELECT 42 AS wrong", [{"sql_query": "SELECT id FROM e ORDER BY id", "expected_result": EXPECTED}])
+    assert result["passed_tests"] == 0
+
+    result = execute_sql_problem(SCHEMA, "SELECT id FROM e ORDER BY id", [{"sql_query": "SELECT 1", "expected_result": EXPECTED}])
+    assert result["passed_tests"] == 1
+
+
+def test_verification_queries_need_the_assignment_flag():
+    db = _session()
+    for assignment_id, verification in ((1, False), (2, True)):
+        db.add(models.Assignment(id=assignment_id, title="t", description="d", domain="data", difficulty="easy", problem_type="sql", sql_schema=SCHEMA, sql_verification=verification))
+        db.add(models.TestCase(assignment_id=assignment_id, sql_query="SELECT id FROM e ORDER BY id", expected_result='[{"id": 1}]'))
+    db.commit()
+
+    plain, verified = load_bundle(1, db), load_bundle(2, db)
+    assert "verification_query" not in plain.sql_test_cases[0]
+    assert verified.sql_test_cases[0]["verification_query"] == "SELECT id FROM e ORDER BY id"
+
+    submission = "DELETE FROM e WHERE id = 2"
+    assert execute_sql_problem(SCHEMA, submission, plain.sql_test_cases)["passed_tests"] == 0
+    assert execute_sql_problem(SCHEMA, submission, verified.sql_test_cases)["passed_tests"] == 1
+
+
+def test_submitted_sql_cannot_reach_files_or_leave_the_savepoint():
+    target = os.path.join(tempfile.mkdtemp(), "pwned.db")
+    verify = [{"verification_query": "SELECT id FROM e ORDER BY id", "expected_result": EXPECTED}]
+    for submission in (
+        f"ATTACH DATABASE '{target}' AS p; CREATE TABLE p.t(a TEXT); SELECT 1 AS x",
+        f"VACUUM INTO '{target}'",
+        "PRAGMA journal_mode = OFF; SELECT 1 AS x",
+        "DELETE FROM e; COMMIT; SELECT 1 AS x",
+        "RELEASE submission; DELETE FROM e",
+        "BEGIN; DELETE FROM e",
+    ):
+        for test_cases in ([{"expected_result": EXPECTED}], verify):
+            result = execute_sql_problem(SCHEMA, submission, test_cases)
+            assert result["user_query_error"], submission
+        assert "authoriz" in execute_sql_problem(SCHEMA, submission, [{"expected_result": EXPECTED}])["user_query_error"], submission
+    assert not os.path.exists(target)
+
+    # Reading the schema and ordinary multi-statement submissions still work
+    result = execute_sql_problem(SCHEMA, "INSERT INTO e VALUES (3); DELETE FROM e WHERE id = 3; PRAGMA table_info(e)", [{"expected_result": '[{"cid": 0, "name": "id", "type": "INTEGER", "notnull": 0, "dflt_value": null, "pk": 1}]'}])
+    assert result["passed_tests"] == 1, result
+
+
+def test_generated_dataset_connections_are_restricted():
+    executor = SQLExecutor()
+    ok, message = executor.setup_schema("CREATE TABLE n (v INTEGER);", dataset={"seed": 1, "tables": {"n": {"rows": 10, "columns": {"v": {"type": "sequence"}}}}})
+    assert ok, message
+    try:
+        target = os.path.join(tempfile.mkdtemp(), "pwned.db")
+        ok, error = executor.run_query(f"ATTACH DATABASE '{target}' AS p")
+        assert not ok and "not authorized" in error
+        assert not os.path.exists(target)
+        ok, cursor = executor.run_query("DELETE FROM n WHERE v > 5")
+        assert ok, cursor
+        assert executor.execute_query("SELECT COUNT(*) AS c FROM n") == (True, [{"c": 5}])
+    finally:
+        executor.close()
+
+
+def test_columns_are_matched_by_name_unless_column_order_is_set():
+    expected = '[{"id": 1, "name": "a"}]'
+    schema = "CREATE TABLE p (id INTEGER, name TEXT); INSERT INTO p VALUES (1, 'a');"
+    for query in ("SELECT id, name FROM p", "SELECT name, id FROM p"):
+        assert execute_sql_problem(schema, query, [{"expected_result": expected}])["passed_tests"] == 1
+    result = execute_sql_problem(schema, "SELECT id FROM p", [{"expected_result": expected}])
+    assert result["passed_tests"] == 0 and "Expected columns: id, name" in result["results"][0]["message"]
+
+    strict = '{"rows": [{"id": 1, "name": "a"}], "column_order": true}'
+    assert execute_sql_problem(schema, "SELECT id, name FROM p", [{"expected_result": strict}])["passed_tests"] == 1
+    result = execute_sql_problem(schema, "SELECT name, id FROM p", [{"expected_result": strict}])
+    assert result["passed_tests"] == 0
+    assert "in order" in result["results"][0]["message"]
+
+
+def test_user_query_runs_once_for_several_expected_results():
+    executed = []
+    real_run_query = SQLExecutor.run_query
+
+    def run_query(self, query):
+        executed.append(query)
+        return real_run_query(self, query)
+
+    SQLExecutor.run_query = run_query
+    try:
+        result = execute_sql_problem(SCHEMA, "SELECT id FROM e ORDER BY id", [
+            {"expected_result": EXPECTED},
+            {"expected_result": '[{"id": 1}]'},
+            {"expected_result": EXPECTED},
+        ])
+    finally:
+        SQLExecutor.run_query = real_run_query
+    assert [r["passed"] for r in result["results"]] == [True, False, True]
+    assert executed == ["SELECT id FROM e ORDER BY id;"]
+
+
+def test_runaway_queries_are_stopped_by_the_limits():
+    endless = "WITH RECURSIVE n(i) AS (SELECT 1 UNION ALL SELECT i + 1 FROM n) SELECT MAX(i) FROM n"
+    cases = (
+        ({"max_vm_steps": 100000, "time_limit_ms": 60000}, endless, "Instruction limit exceeded"),
+        ({"max_vm_steps": 10 ** 12, "time_limit_ms": 200}, endless, "Time limit exceeded"),
+        ({"max_rows": 1}, "SELECT id FROM e", "Row limit exceeded"),
+        ({"max_result_bytes": 10}, "SELECT printf('%.100c', 'x') AS s", "Result size limit exceeded"),
+    )
+    for limits, query, message in cases:
+        result = execute_sql_problem(SCHEMA, query, [{"expected_result": EXPECTED}], limits=limits)
+        # Time and instruction limits fail the query, result limits the test case
+        error = result["user_query_error"] or result["results"][0]["message"]
+        assert result["passed_tests"] == 0
+        assert error.startswith(message), error
+
+    # Queries within the limits are unaffected
+    assert execute_sql_problem(SCHEMA, "SELECT id FROM e ORDER BY id", [{"expected_result": EXPECTED}], limits={"max_rows": 2})["success"]
+
+
+def test_dataset_variants_are_graded_separately():
+    test_cases = [
+        {"expected_result": '[{"n": 2}]'},
+        {"expected_result": '[{"n": 3}]', "seed_sql": "INSERT INTO e VALUES (3);", "dataset": "three"},
+        {"expected_result": '[{"n": 2}]', "seed_sql": "DELETE FROM e WHERE id = 1;", "dataset": "one"},
+    ]
+    result = execute_sql_problem(SCHEMA, "SELECT COUNT(*) AS n FROM e", test_cases)
+    assert [r["passed"] for r in result["results"]] == [True, True, False]
+    assert [r.get("dataset") for r in result["results"]] == [None, "three", "one"]
+    assert result["datasets"] == [
+        {"dataset": None, "test_ids": [1], "passed_tests": 1, "user_query_error": None},
+        {"dataset": "three", "test_ids": [2], "passed_tests": 1, "user_query_error": None},
+        {"dataset": "one", "test_ids": [3], "passed_tests": 0, "user_query_error": None},
+    ]
+
+    # A query that fails on one variant keeps the results of the others
+    test_cases = [
+        {"expected_result": '[{"n": 0}]'},
+        {"expected_result": '[{"n": 0}]', "seed_sql": "CREATE TABLE extra (x INTEGER);", "dataset": "extra"},
+    ]
+    result = execute_sql_problem(SCHEMA, "SELECT COUNT(*) AS n FROM extra", test_cases)
+    assert not result["success"] and "no such table" in result["user_query_error"]
+    assert [(r["test_id"], r["passed"]) for r in result["results"]] == [(2, True)]
+    assert [d["passed_tests"] for d in result["datasets"]] == [0, 1]
+    assert "no such table" in result["datasets"][0]["user_query_error"]
+
+
+if __name__ == "__main__":
+    test_test_case_query_is_not_a_verification_query_by_default()
+    test_verification_queries_need_the_assignment_flag()
+    test_submitted_sql_cannot_reach_files_or_leave_the_savepoint()
+    test_generated_dataset_connections_are_restricted()
+    test_columns_are_matched_by_name_unless_column_order_is_set()
+    test_user_query_runs_once_for_several_expected_results()
+    test_runaway_queries_are_stopped_by_the_limits()
+    test_dataset_variants_are_graded_separately()
+    print("All SQL executor checks passed")
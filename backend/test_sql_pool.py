@@ -0,0 +1,35 @@
+"""
+Checks for the SQL grading process pool
+Run with: python test_sql_pool.py (or pytest)
+"""
+import os
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("JWT_SECRET", "test")
+os.environ.setdefault("AWS_LAMBDA_FUNCTION", "test")
+
+from app.services.sql_pool import SQLGradingPool
+
+SCHEMA = "CREATE TABLE warm (x INTEGER);"
+
+
+def _worker_templates():
+    from app.services.sql_templates import schema_templates
+    return os.getpid(), len(schema_templates._templates)
+
+
+def test_every_worker_is_warmed_including_replacements():
+    # One task per worker, so each probe after the first few runs on a freshly spawned worker
+    pool = SQLGradingPool(workers=2, max_tasks=1)
+    try:
+        pool.warm([SCHEMA])
+        probes = [pool._executor.submit(_worker_templates).result(timeout=60) for _ in range(4)]
+    finally:
+        pool.shutdown()
+    assert len({pid for pid, _ in probes}) == 4
+    assert all(templates == 1 for _, templates in probes)
+
+
+if __name__ == "__main__":
+    test_every_worker_is_warmed_including_replacements()
+    print("All SQL pool checks passed")
@@ -0,0 +1,96 @@
+"""
+Checks for the SQL schema template cache
+Run with: python test_sql_templates.py (or pytest)
+"""
+import os
+import sqlite3
+import threading
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("JWT_SECRET", "test")
+os.environ.setdefault("AWS_LAMBDA_FUNCTION", "test")
+
+from app.services.sql_templates import SchemaTemplateCache
+
+SCHEMA = "PRAGMA foreign_keys = ON; CREATE TABLE t (id INTEGER PRIMARY KEY); INSERT INTO t VALUES (1), (2);"
+
+
+def _count(conn):
+    return conn.execute("SELECT COUNT(*) FROM t").fetchone()[0]
+
+
+def test_clones_are_private_and_keep_pragmas():
+    cache = SchemaTemplateCache(enabled=True)
+    first = cache.connect(SCHEMA)
+    first.execute("DELETE FROM t")
+    second = cache.connect(SCHEMA)
+    assert _count(first) == 0 and _count(second) == 2
+    assert second.execute("PRAGMA foreign_keys").fetchone()[0] == 1
+    assert cache.stats()["builds"] == 1 and cache.stats()["hits"] == 1
+
+
+def test_editing_the_schema_or_seed_builds_a_new_template():
+    cache = SchemaTemplateCache(enabled=True)
+    cache.connect(SCHEMA)
+    edited = cache.connect(SCHEMA + " INSERT INTO t VALUES (3);")
+    assert _count(edited) == 3
+
+    variant = cache.connect(SCHEMA, "INSERT INTO t VALUES (10);")
+    assert _count(variant) == 3
+    assert _count(cache.connect(SCHEMA)) == 2
+    assert cache.stats()["builds"] == 3
+
+
+def test_concurrent_first_requests_build_once():
+    cache = SchemaTemplateCache(enabled=True)
+    started, release, builds = threading.Event(), threading.Event(), []
+    real_build = cache._build
+
+    def slow_build(schema_sql, seed_sql=None):
+        builds.append(schema_sql)
+        started.set()
+        release.wait(10)
+        return real_build(schema_sql, seed_sql)
+
+    cache._build = slow_build
+    counts = []
+    threads = [threading.Thread(target=lambda: counts.append(_count(cache.connect(SCHEMA)))) for _ in range(4)]
+    threads[0].start()
+    started.wait(10)
+    for thread in threads[1:]:
+        thread.start()
+    release.set()
+    for thread in threads:
+        thread.join(10)
+    assert len(builds) == 1
+    assert counts == [2] * 4
+
+
+def test_failed_builds_are_not_cached():
+    cache = SchemaTemplateCache(enabled=True)
+    for _ in range(2):
+        try:
+            cache.connect("CREATE TABLE (")
+        except sqlite3.Error:
+            pass
+        else:
+            raise AssertionError("a broken schema was accepted")
+    assert cache.stats()["templates"] == 0
+
+
+def test_eviction_closes_templates_but_not_clones():
+    cache = SchemaTemplateCache(max_entries=1, enabled=True)
+    clone = cache.connect(SCHEMA)
+    cache.connect("CREATE TABLE other (x INTEGER);")
+    assert cache.stats()["templates"] == 1 and cache.stats()["evictions"] == 1
+    assert _count(clone) == 2
+    assert _count(cache.connect(SCHEMA)) == 2
+
+
+if __name__ == "__main__":
+    test_clones_are_private_and_keep_pragmas()
+    test_editing_the_schema_or_seed_builds_a_new_template()
+    test_concurrent_first_requests_build_once()
+    test_failed_builds_are_not_cached()
+    test_eviction_closes_templates_but_not_clones()
+    print("All SQL template checks passed")
@@ -0,0 +1,117 @@
+"""
+Checks for the per-assignment submission counters
+Run with: python test_submission_stats.py (or pytest)
+"""
+import io
+import json
+import os
+import tempfile
+
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+os.environ.setdefault("JWT_SECRET", "test")
+os.environ.setdefault("AWS_LAMBDA_FUNCTION", "test")
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from app.migrations import run_migrations
+from app.migrations.v004_submission_counters_backfill import upgrade as backfill_counters
+from app import models
+from app.services import submission_stats
+from app.services.assignment_import import import_assignments
+from app.services.submission_stats import assignment_stats, record_submission
+
+ASSIGNMENT = {"title": "t", "description": "d", "domain": "dev", "difficulty": "easy", "problem_type": "coding", "language": "python"}
+
+
+def _session():
+    engine = create_engine(f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'test.db')}")
+    run_migrations(engine)
+    db = sessionmaker(bind=engine)()
+    db.add_all([models.User(id=user_id, email=f"u{user_id}@x") for user_id in (1, 2, 3)])
+    db.commit()
+    return engine, db
+
+
+def _submit(db, assignment_id, user_id, status):
+    record_submission(db, models.Submission(assignment_id=assignment_id, user_id=user_id, status=status))
+    db.commit()
+
+
+def _counters(db, assignment_id):
+    row = db.get(models.SubmissionCounters, assignment_id)
+    db.refresh(row)
+    return (row.total, row.passed, row.failed, row.submitters)
+
+
+def test_imported_assignments_start_with_counters():
+    _, db = _session()
+    report = import_assignments(db, io.BytesIO(json.dumps(ASSIGNMENT).encode("utf-8")))
+    assignment_id = report["assignment_ids"][0]
+    assert _counters(db, assignment_id) == (0, 0, 0, 0)
+
+    for user_id, status in ((1, "fail"), (1, "pass"), (2, "pass"), (1, "fail")):
+        _submit(db, assignment_id, user_id, status)
+    assert _counters(db, assignment_id) == (4, 2, 2, 2)
+    assert assignment_stats(db, assignment_id) == {
+        "total_submissions": 4, "passed_submissions": 2, "failed_submissions": 2, "submitted": 2, "remaining": 1
+    }
+
+
+def test_missing_row_is_initialized_from_the_aggregate():
+    _, db = _session()
+    db.add(models.Assignment(id=1, **ASSIGNMENT))
+    db.add_all([models.Submission(assignment_id=1, user_id=1, status="fail"), models.Submission(assignment_id=1, user_id=2, status="pass")])
+    db.commit()
+    assert assignment_stats(db, 1)["total_submissions"] == 2  # aggregate fallback
+
+    _submit(db, 1, 3, "pass")
+    assert _counters(db, 1) == (3, 2, 1, 3)
+
+
+def test_losing_the_row_creation_race_still_counts_the_submission():
+    _, db = _session()
+    db.add(models.Assignment(id=1, **ASSIGNMENT))
+    db.add(models.Submission(assignment_id=1, user_id=1, status="fail"))
+    db.add(models.SubmissionCounters(assignment_id=1, total=1, passed=0, failed=1, submitters=1))
+    db.commit()
+
+    # The row appears between this submission's UPDATE and its INSERT
+    real_increment, calls = submission_stats._increment, []
+
+    def increment(db, submission):
+        calls.append(submission.id)
+        return real_increment(db, submission) if len(calls) > 1 else False
+
+    submission_stats._increment = increment
+    try:
+        _submit(db, 1, 2, "pass")
+    finally:
+        submission_stats._increment = real_increment
+    assert len(calls) == 2
+    assert _counters(db, 1) == (2, 1, 1, 2)
+
+
+def test_backfill_migration_creates_missing_rows():
+    engine, db = _session()
+    db.add_all([models.Assignment(id=1, **ASSIGNMENT), models.Assignment(id=2, **ASSIGNMENT)])
+    db.add_all([
+        models.Submission(assignment_id=1, user_id=1, status="pass"),
+        models.Submission(assignment_id=1, user_id=1, status="fail"),
+        models.Submission(assignment_id=1, user_id=2, status="fail"),
+    ])
+    db.commit()
+
+    with engine.begin() as conn:
+        backfill_counters(conn)
+        backfill_counters(conn)  # rows that exist are left alone
+    assert _counters(db, 1) == (3, 1, 2, 2)
+    assert _counters(db, 2) == (0, 0, 0, 0)
+
+
+if __name__ == "__main__":
+    test_imported_assignments_start_with_counters()
+    test_missing_row_is_initialized_from_the_aggregate()
+    test_losing_the_row_creation_race_still_counts_the_submission()
+    test_backfill_migration_creates_missing_rows()
+    print("All submission counter checks passed")
@@ -1,7 +1,7 @@
 import React, { useState, useEffect } from 'react';
 import Sidebar from "../components/Sidebar";
 import Navbar from "../components/Navbar";
-import { getAssignments, getAssignmentStats, getCompletionStats } from '../api/assignments';
+import { getAssignments, getCompletionStats } from '../api/assignments';
 import "../styles/dashboard.css";
 
 export default function SubmissionsPage() {
@@ -18,20 +18,14 @@ export default function SubmissionsPage() {
         const assignmentsResponse = await getAssignments();
 
         setAssignments(assignmentsResponse.data || []);
-        // Temporarily disable completion stats due to backend issue
-        setCompletionStats([]);
 
-        // Fetch stats for all assignments individually to handle errors
+        // One request returns the completion distribution and every assignment's stats
+        const completionResponse = await getCompletionStats();
+        setCompletionStats(completionResponse.data.completion_stats || []);
+
         const statsMap = {};
-        for (const assignment of assignmentsResponse.data || []) {
-          try {
-            const statResponse = await getAssignmentStats(assignment.id);
-            statsMap[assignment.id] = statResponse.data;
-          } catch (statError) {
-            console.error(`Error fetching stats for assignment ${assignment.id}:`, statError);
-            // Set default stats
-            statsMap[assignment.id] = { submitted: 0, remaining: 0, total_submissions: 0 };
-          }
+        for (const assignmentStats of completionResponse.data.assignments || []) {
+          statsMap[assignmentStats.assignment_id] = assignmentStats;
         }
         setStats(statsMap);
       } catch (error) {